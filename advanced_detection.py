@@ -5,46 +5,448 @@ Provides multiple face detection backends including MTCNN, RetinaFace,
 and MediaPipe for improved accuracy and performance.
 """
 
+import functools
+import os
+import queue
+import threading
+from enum import IntEnum
+from concurrent.futures import Future, ThreadPoolExecutor
 import cv2
 import numpy as np
 from typing import List, Tuple, Optional
 import logging
 
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
 logger = logging.getLogger(__name__)
 
+# Make sure OpenCV dispatches to its SIMD (SSE/AVX2/NEON) kernels
+cv2.setUseOptimized(True)
+
+# Default model location for the ONNX-based RetinaFace backends
+RETINAFACE_ONNX_PATH = os.path.join("models", "retinaface_mnet025.onnx")
+
+# TorchScript export (torch.jit.trace) of biubug6's mobilenet0.25_Final.pth
+RETINAFACE_JIT_PATH = os.path.join("models", "retinaface_mnet025.pt")
+
+# RetinaFace-MobileNet0.25 anchor configuration (biubug6/Pytorch_Retinaface)
+_RETINA_MIN_SIZES = ((16, 32), (64, 128), (256, 512))
+_RETINA_STEPS = (8, 16, 32)
+_RETINA_VARIANCE = (0.1, 0.2)
+_RETINA_MEAN = np.array([104, 117, 123], dtype=np.float32)  # BGR
+
+# INT8 YuNet model for the opencv backend (opencv_zoo), Haar cascade without it
+YUNET_ONNX_PATH = os.path.join("models", "face_detection_yunet_2023mar_int8.onnx")
+
+# Post-training INT8 quantized BlazeFace full-range model for the mediapipe backend
+BLAZEFACE_TFLITE_PATH = os.path.join("models", "face_detection_full_range_int8.tflite")
+
+# ResNet-10 SSD face detector (OpenCV samples) for the opencv_dnn backend
+SSD_PROTOTXT_PATH = os.path.join("models", "deploy.prototxt")
+SSD_CAFFEMODEL_PATH = os.path.join("models", "res10_300x300_ssd_iter_140000.caffemodel")
+_SSD_MEAN = (104.0, 177.0, 123.0)  # BGR
+
+# Face locations are passed around internally as (N, 4) int32 arrays
+_NO_FACES = np.empty((0, 4), dtype=np.int32)
+
+# Inference devices accepted by AdvancedFaceDetector
+DEVICES = ("auto", "cpu", "cuda", "tensorrt")
+
+# BlazeFace SSD anchor layout per input size: (stride, anchors per cell)
+_BLAZEFACE_ANCHORS = {
+    128: ((8, 2), (16, 6)),  # short range
+    192: ((4, 1),),          # full range
+}
+
+
+def _retinaface_priors(height: int, width: int) -> np.ndarray:
+    """
+    Generate RetinaFace prior boxes for an input size.
+    
+    Args:
+        height: Network input height
+        width: Network input width
+        
+    Returns:
+        (N, 4) array of normalized (cx, cy, w, h) priors
+    """
+    priors = []
+    for step, min_sizes in zip(_RETINA_STEPS, _RETINA_MIN_SIZES):
+        rows = int(np.ceil(height / step))
+        cols = int(np.ceil(width / step))
+        cy, cx = np.meshgrid(
+            (np.arange(rows, dtype=np.float32) + 0.5) * step / height,
+            (np.arange(cols, dtype=np.float32) + 0.5) * step / width,
+            indexing="ij"
+        )
+        anchors = np.empty((rows, cols, len(min_sizes), 4), dtype=np.float32)
+        anchors[..., 0] = cx[..., None]
+        anchors[..., 1] = cy[..., None]
+        anchors[..., 2] = np.array(min_sizes, dtype=np.float32) / width
+        anchors[..., 3] = np.array(min_sizes, dtype=np.float32) / height
+        priors.append(anchors.reshape(-1, 4))
+    return np.concatenate(priors, axis=0)
+
+
+def _blazeface_anchors(size: int) -> np.ndarray:
+    """
+    Generate BlazeFace anchor centers for a square input size.
+    
+    Args:
+        size: Network input width/height
+        
+    Returns:
+        (N, 2) array of normalized (cx, cy) anchor centers
+    """
+    anchors = []
+    for stride, per_cell in _BLAZEFACE_ANCHORS[size]:
+        cells = int(np.ceil(size / stride))
+        cy, cx = np.meshgrid(
+            (np.arange(cells, dtype=np.float32) + 0.5) / cells,
+            (np.arange(cells, dtype=np.float32) + 0.5) / cells,
+            indexing="ij"
+        )
+        centers = np.stack([cx, cy], axis=-1).reshape(-1, 1, 2)
+        anchors.append(np.repeat(centers, per_cell, axis=1).reshape(-1, 2))
+    return np.concatenate(anchors, axis=0)
+
+
+def _xywh_to_trbl(boxes) -> np.ndarray:
+    """Convert (x, y, w, h) boxes to an (N, 4) int32 array of (top, right, bottom, left)."""
+    boxes = np.asarray(boxes).reshape(-1, 4).astype(np.int32)
+    faces = np.empty_like(boxes)
+    faces[:, 0] = boxes[:, 1]
+    faces[:, 1] = boxes[:, 0] + boxes[:, 2]
+    faces[:, 2] = boxes[:, 1] + boxes[:, 3]
+    faces[:, 3] = boxes[:, 0]
+    return faces
+
+
+def _xyxy_to_trbl(boxes) -> np.ndarray:
+    """Convert (x1, y1, x2, y2) boxes to an (N, 4) int32 array of (top, right, bottom, left)."""
+    return np.asarray(boxes).reshape(-1, 4)[:, [1, 2, 3, 0]].astype(np.int32)
+
+
+def _to_tuples(faces: np.ndarray) -> List[Tuple[int, int, int, int]]:
+    """Convert an (N, 4) face array to the public list of tuples."""
+    return [tuple(face) for face in faces.tolist()]
+
+
+def _nms(boxes: np.ndarray, scores: np.ndarray, threshold: float) -> np.ndarray:
+    """Greedy non-maximum suppression over (x1, y1, x2, y2) boxes."""
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = (x2 - x1 + 1) * (y2 - y1 + 1)
+    order = scores.argsort()[::-1]
+    
+    keep = []
+    while order.size > 0:
+        i = order[0]
+        keep.append(i)
+        xx1 = np.maximum(x1[i], x1[order[1:]])
+        yy1 = np.maximum(y1[i], y1[order[1:]])
+        xx2 = np.minimum(x2[i], x2[order[1:]])
+        yy2 = np.minimum(y2[i], y2[order[1:]])
+        inter = np.maximum(0.0, xx2 - xx1 + 1) * np.maximum(0.0, yy2 - yy1 + 1)
+        iou = inter / (areas[i] + areas[order[1:]] - inter)
+        order = order[1:][iou <= threshold]
+    
+    return np.array(keep, dtype=np.int64)
+
+
+def _decode_retinaface(loc: np.ndarray, conf: np.ndarray, priors: np.ndarray,
+                       width: int, height: int, min_confidence: float,
+                       nms_threshold: float = 0.4) -> np.ndarray:
+    """
+    Decode raw RetinaFace outputs into pixel boxes.
+    
+    Args:
+        loc: (N, 4) box regressions
+        conf: (N, 2) background/face probabilities
+        priors: (N, 4) priors from _retinaface_priors
+        width: Width the boxes are scaled to
+        height: Height the boxes are scaled to
+        min_confidence: Minimum face score to keep
+        nms_threshold: IoU threshold for suppression
+        
+    Returns:
+        (K, 5) array of (x1, y1, x2, y2, score)
+    """
+    scores = conf[:, 1]
+    mask = scores >= min_confidence
+    if not mask.any():
+        return np.empty((0, 5), dtype=np.float32)
+    
+    loc, priors, scores = loc[mask], priors[mask], scores[mask]
+    centers = priors[:, :2] + loc[:, :2] * _RETINA_VARIANCE[0] * priors[:, 2:]
+    sizes = priors[:, 2:] * np.exp(loc[:, 2:] * _RETINA_VARIANCE[1])
+    
+    boxes = np.concatenate([centers - sizes / 2, centers + sizes / 2], axis=1)
+    boxes *= np.array([width, height, width, height], dtype=np.float32)
+    
+    keep = _nms(boxes, scores, nms_threshold)
+    return np.hstack([boxes[keep], scores[keep, None]]).astype(np.float32)
+
+
+@functools.lru_cache(maxsize=None)
+def openvino_available() -> bool:
+    """Whether OpenCV DNN can run on the OpenVINO (Inference Engine) backend."""
+    backend = getattr(cv2.dnn, 'DNN_BACKEND_INFERENCE_ENGINE', None)
+    if backend is None or not hasattr(cv2.dnn, 'getAvailableBackends'):
+        return False
+    return any(available[0] == backend for available in cv2.dnn.getAvailableBackends())
+
+
+def opencv_dnn_preferred() -> bool:
+    """Whether the opencv_dnn backend should be the default: OpenVINO and the SSD model are present."""
+    return (os.path.exists(SSD_PROTOTXT_PATH) and os.path.exists(SSD_CAFFEMODEL_PATH)
+            and openvino_available())
+
+
+@functools.lru_cache(maxsize=4)
+def _load_cascade(path: str) -> cv2.CascadeClassifier:
+    """Parse a Haar cascade XML once per process and share it between detectors."""
+    return cv2.CascadeClassifier(path)
+
+
+def _fused_quality_kernel(gray, patch):
+    """
+    Mean of a grayscale crop and 4-neighbour Laplacian variance of a patch of it.
+    
+    Matches cv2.Laplacian(patch, ksize=1) with its default reflect-101
+    border, so the variance is interchangeable with the OpenCV path.
+    The patch needs at least 2 rows and 2 columns.
+    """
+    h, w = gray.shape
+    total = 0.0
+    for y in prange(h):
+        for x in range(w):
+            total += np.float64(gray[y, x])
+    
+    ph, pw = patch.shape
+    lap_sum = 0.0
+    lap_sq = 0.0
+    for y in prange(ph):
+        up = y - 1 if y > 0 else 1
+        down = y + 1 if y < ph - 1 else ph - 2
+        for x in range(pw):
+            left = x - 1 if x > 0 else 1
+            right = x + 1 if x < pw - 1 else pw - 2
+            lap = (np.float64(patch[up, x]) + np.float64(patch[down, x]) +
+                   np.float64(patch[y, left]) + np.float64(patch[y, right]) -
+                   4.0 * np.float64(patch[y, x]))
+            lap_sum += lap
+            lap_sq += lap * lap
+    n = ph * pw
+    lap_mean = lap_sum / n
+    return total / (h * w), lap_sq / n - lap_mean * lap_mean
+
+
+def _fast_score_kernel(gray):
+    """
+    Mean, standard deviation and 4-neighbour Laplacian variance of a crop.
+    
+    All three come from one traversal; the Laplacian uses the same
+    reflect-101 border as cv2.Laplacian. The crop needs at least 2 rows
+    and 2 columns.
+    """
+    h, w = gray.shape
+    total = 0.0
+    total_sq = 0.0
+    lap_sum = 0.0
+    lap_sq = 0.0
+    for y in prange(h):
+        up = y - 1 if y > 0 else 1
+        down = y + 1 if y < h - 1 else h - 2
+        for x in range(w):
+            left = x - 1 if x > 0 else 1
+            right = x + 1 if x < w - 1 else w - 2
+            value = np.float64(gray[y, x])
+            lap = (np.float64(gray[up, x]) + np.float64(gray[down, x]) +
+                   np.float64(gray[y, left]) + np.float64(gray[y, right]) - 4.0 * value)
+            total += value
+            total_sq += value * value
+            lap_sum += lap
+            lap_sq += lap * lap
+    n = h * w
+    mean = total / n
+    lap_mean = lap_sum / n
+    return mean, np.sqrt(max(total_sq / n - mean * mean, 0.0)), lap_sq / n - lap_mean * lap_mean
+
+
+if njit is not None:
+    _fused_quality = njit(fastmath=True, cache=True, parallel=True)(_fused_quality_kernel)
+    _fast_score = njit(fastmath=True, cache=True, parallel=True)(_fast_score_kernel)
+else:
+    _fused_quality = None
+    _fast_score = None
+
+
+class PreprocessedFrame:
+    """
+    A BGR frame with lazily cached RGB and grayscale conversions.
+    
+    Each conversion runs at most once, so a single frame can feed
+    detection, landmarks and quality assessment without re-converting.
+    """
+    
+    __slots__ = ('bgr', '_rgb', '_gray', '_downscaled')
+    
+    def __init__(self, bgr: np.ndarray):
+        # OpenCV's SIMD kernels fall back to scalar code on strided views
+        self.bgr = bgr if bgr.flags['C_CONTIGUOUS'] else np.ascontiguousarray(bgr)
+        self._rgb = None
+        self._gray = None
+        self._downscaled = None
+    
+    @property
+    def rgb(self) -> np.ndarray:
+        """RGB version of the frame."""
+        if self._rgb is None:
+            self._rgb = cv2.cvtColor(self.bgr, cv2.COLOR_BGR2RGB)
+        return self._rgb
+    
+    @property
+    def gray(self) -> np.ndarray:
+        """Grayscale version of the frame."""
+        if self._gray is None:
+            if self.bgr.ndim == 2:
+                self._gray = self.bgr
+            else:
+                self._gray = cv2.cvtColor(self.bgr, cv2.COLOR_BGR2GRAY)
+        return self._gray
+    
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.bgr.shape
+    
+    def downscaled(self, max_width: int) -> Tuple['PreprocessedFrame', float]:
+        """
+        Shrink the frame to at most max_width pixels wide, once.
+        
+        Args:
+            max_width: Maximum width of the returned frame
+            
+        Returns:
+            Tuple of (frame, scale); the frame itself and 1.0 if it is
+            already narrow enough
+        """
+        width = self.bgr.shape[1]
+        if width <= max_width:
+            return self, 1.0
+        if self._downscaled is None or self._downscaled[0].shape[1] != max_width:
+            scale = max_width / width
+            small = cv2.resize(self.bgr, (max_width, round(self.bgr.shape[0] * scale)),
+                               interpolation=cv2.INTER_AREA)
+            self._downscaled = (PreprocessedFrame(small), scale)
+        return self._downscaled
+
+
+class Backend(IntEnum):
+    """Face detection backends; values index the per-backend method tables."""
+    MTCNN = 0
+    RETINAFACE = 1
+    RETINAFACE_TRT = 2
+    RETINAFACE_JIT = 3
+    RETINAFACE_DNN = 4
+    MEDIAPIPE = 5
+    OPENCV = 6
+    OPENCV_DNN = 7
+
 
 class AdvancedFaceDetector:
     """Advanced face detection with multiple backends."""
     
-    def __init__(self, backend: str = "mtcnn"):
+    def __init__(self, backend: str = "mtcnn", model_path: Optional[str] = None,
+                 use_int8: bool = True, static_threshold: int = 512,
+                 target_width: int = 640, device: str = "auto"):
         """
         Initialize advanced face detector.
         
         Args:
-            backend: Detection backend ('mtcnn', 'retinaface', 'mediapipe', 'opencv')
+            backend: Detection backend ('mtcnn', 'retinaface', 'retinaface_trt',
+                     'retinaface_jit', 'retinaface_dnn', 'mediapipe', 'opencv',
+                     'opencv_dnn')
+            model_path: Model file for ONNX/TFLite/TorchScript/Caffe-based backends (optional)
+            use_int8: Run MediaPipe detection on the INT8 TFLite model when
+                      it is available
+            static_threshold: Sum of absolute differences between 32x32
+                              grayscale thumbnails below which a frame is
+                              treated as unchanged and the previous result is
+                              reused (0 disables the check)
+            target_width: Wider frames are downscaled to this width before
+                          detection (0 disables downscaling)
+            device: Inference device for the ONNX/TorchScript/DNN backends
+                    ('auto', 'cpu', 'cuda', 'tensorrt'); 'auto' picks the
+                    fastest one available
         """
-        self.backend = backend.lower()
+        self.backend_id = Backend.__members__.get(backend.upper())
+        if self.backend_id is None:
+            logger.warning(f"Unknown backend '{backend}', using OpenCV")
+            self.backend_id = Backend.OPENCV
+        self.model_path = model_path
+        self.use_int8 = use_int8
+        self.device = device.lower()
+        if self.device not in DEVICES:
+            logger.warning(f"Unknown device '{device}', using auto")
+            self.device = "auto"
         self.detector = None
+        self._tflite = False
+        self._yunet = False
+        self._use_umat = False
+        
+        # Unchanged-frame gate (see detect_faces)
+        self.static_threshold = static_threshold
+        self._prev_thumb = None
+        self._prev_confidence = None
+        self._prev_faces = _NO_FACES
+        
+        self.target_width = target_width
+        
+        # Pipelined detection (see detect_faces_async)
+        self._preprocess_queue = None
+        self._inference_queue = None
+        self._pipeline_threads = []
+        
+        # Parallel detection (see detect_many)
+        self._pool = None
+        
         self._initialize_detector()
     
+    @property
+    def backend(self) -> str:
+        """Name of the active backend, e.g. 'mediapipe'."""
+        return self.backend_id.name.lower()
+    
+    def _cv_cuda_available(self) -> bool:
+        """Whether OpenCV DNN models may run on its CUDA backend."""
+        return (self.device != "cpu" and hasattr(cv2, 'cuda')
+                and cv2.cuda.getCudaEnabledDeviceCount() > 0)
+    
     def _initialize_detector(self):
         """Initialize the selected detection backend."""
+        init = (
+            self._init_mtcnn,
+            self._init_retinaface,
+            self._init_retinaface_trt,
+            self._init_retinaface_jit,
+            self._init_retinaface_dnn,
+            self._init_mediapipe,
+            self._init_opencv,
+            self._init_opencv_dnn,
+        )[self.backend_id]
         try:
-            if self.backend == "mtcnn":
-                self._init_mtcnn()
-            elif self.backend == "retinaface":
-                self._init_retinaface()
-            elif self.backend == "mediapipe":
-                self._init_mediapipe()
-            elif self.backend == "opencv":
-                self._init_opencv()
-            else:
-                logger.warning(f"Unknown backend '{self.backend}', using OpenCV")
-                self._init_opencv()
+            init()
         except Exception as e:
             logger.error(f"Failed to initialize {self.backend}: {e}")
-            logger.info("Falling back to OpenCV Haar Cascade")
+            self.backend_id = Backend.OPENCV
             self._init_opencv()
+            logger.info(f"Fell back to OpenCV {'YuNet' if self._yunet else 'Haar Cascade'}")
+        
+        self._bind_backend()
     
     def _init_mtcnn(self):
         """Initialize MTCNN detector."""
@@ -66,8 +468,117 @@ class AdvancedFaceDetector:
             logger.error("RetinaFace not installed. Install with: pip install retina-face")
             raise
     
+    def _init_retinaface_trt(self):
+        """Initialize RetinaFace-MobileNet0.25 on ONNX Runtime's TensorRT provider.
+        
+        The engine is built by TensorRT on first use and cached next to the
+        model. FP16 is always enabled; INT8 is enabled when a calibration
+        table (``<model>.calib``) has been generated for the model.
+        """
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            logger.error("ONNX Runtime not installed. Install with: pip install onnxruntime-gpu")
+            raise
+        
+        model_path = self.model_path or RETINAFACE_ONNX_PATH
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"RetinaFace ONNX model not found: {model_path}")
+        
+        model_dir = os.path.dirname(os.path.abspath(model_path))
+        calib_table = os.path.splitext(os.path.basename(model_path))[0] + ".calib"
+        use_int8 = os.path.exists(os.path.join(model_dir, calib_table))
+        
+        providers = ['CPUExecutionProvider']
+        if self.device != "cpu":
+            providers.insert(0, 'CUDAExecutionProvider')
+        if self.device in ("auto", "tensorrt"):
+            providers.insert(0, ('TensorrtExecutionProvider', {
+                'trt_fp16_enable': True,
+                'trt_int8_enable': use_int8,
+                'trt_int8_calibration_table_name': calib_table if use_int8 else '',
+                'trt_engine_cache_enable': True,
+                'trt_engine_cache_path': model_dir,
+            }))
+        self.detector = ort.InferenceSession(model_path, providers=providers)
+        self._ort_input = self.detector.get_inputs()[0]
+        
+        # Fixed-shape exports are resized to the network size, dynamic ones run natively
+        shape = self._ort_input.shape
+        self._input_size = (shape[3], shape[2]) if all(isinstance(d, int) for d in shape[2:]) else None
+        self._priors = {}
+        
+        logger.info(f"RetinaFace TensorRT detector initialized "
+                    f"({'INT8' if use_int8 else 'FP16'}, providers: {self.detector.get_providers()})")
+    
+    def _init_retinaface_jit(self):
+        """Initialize the TorchScript RetinaFace-MobileNet0.25 model.
+        
+        The scripted model is frozen and optimized for inference, and runs
+        in FP16 on CUDA (FP32 on CPU). Frames are staged through pinned host
+        buffers so the upload to the GPU is asynchronous.
+        """
+        try:
+            import torch
+        except ImportError:
+            logger.error("PyTorch not installed. Install with: pip install torch")
+            raise
+        
+        model_path = self.model_path or RETINAFACE_JIT_PATH
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"RetinaFace TorchScript model not found: {model_path}")
+        
+        self._torch = torch
+        use_cuda = self.device != "cpu" and torch.cuda.is_available()
+        self._torch_device = torch.device("cuda" if use_cuda else "cpu")
+        self._torch_dtype = torch.half if self._torch_device.type == "cuda" else torch.float
+        
+        net = torch.jit.load(model_path, map_location=self._torch_device).eval().to(self._torch_dtype)
+        self.detector = torch.jit.optimize_for_inference(torch.jit.freeze(net))
+        self._torch_mean = torch.as_tensor(
+            _RETINA_MEAN, device=self._torch_device, dtype=self._torch_dtype
+        ).view(3, 1, 1)
+        self._pinned = {}
+        self._input_size = None
+        self._priors = {}
+        
+        logger.info(f"RetinaFace TorchScript detector initialized "
+                    f"({self._torch_device.type}, {self._torch_dtype})")
+    
+    def _init_retinaface_dnn(self):
+        """Initialize RetinaFace-MobileNet0.25 on OpenCV's DNN module.
+        
+        Uses the CUDA backend in FP16 when OpenCV was built with CUDA, and
+        OpenCV's own CPU backend otherwise. Needs no engine build step.
+        """
+        model_path = self.model_path or RETINAFACE_ONNX_PATH
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"RetinaFace ONNX model not found: {model_path}")
+        
+        self.detector = cv2.dnn.readNetFromONNX(model_path)
+        use_cuda = self._cv_cuda_available()
+        if use_cuda:
+            self.detector.setPreferableBackend(cv2.dnn.DNN_BACKEND_CUDA)
+            self.detector.setPreferableTarget(cv2.dnn.DNN_TARGET_CUDA_FP16)
+        else:
+            self.detector.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+            self.detector.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+        self._dnn_outputs = self.detector.getUnconnectedOutLayersNames()
+        self._input_size = (640, 640)
+        self._priors = {}
+        
+        logger.info(f"RetinaFace OpenCV DNN detector initialized ({'CUDA FP16' if use_cuda else 'CPU'})")
+    
     def _init_mediapipe(self):
         """Initialize MediaPipe Face Detection."""
+        model_path = self.model_path or BLAZEFACE_TFLITE_PATH
+        if self.use_int8 and os.path.exists(model_path):
+            try:
+                self._init_blazeface_tflite(model_path)
+                return
+            except ImportError:
+                logger.warning("TFLite runtime not installed, using the MediaPipe solution")
+        
         try:
             import mediapipe as mp
             self.detector = mp.solutions.face_detection.FaceDetection(
@@ -79,123 +590,607 @@ class AdvancedFaceDetector:
             logger.error("MediaPipe not installed. Install with: pip install mediapipe")
             raise
     
+    def _init_blazeface_tflite(self, model_path: str):
+        """Initialize the INT8 BlazeFace model on the TFLite interpreter.
+        
+        TFLite applies its XNNPACK delegate to CPU models by default, so the
+        quantized graph runs on its SIMD int8 kernels without the MediaPipe
+        graph runner in between.
+        """
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            from tensorflow.lite import Interpreter
+        
+        self.detector = Interpreter(model_path=model_path, num_threads=os.cpu_count())
+        self.detector.allocate_tensors()
+        self._tflite_input = self.detector.get_input_details()[0]
+        
+        # Regressors (1, N, 16) and classificators (1, N, 1), in either order
+        outputs = sorted(self.detector.get_output_details(), key=lambda d: d['shape'][-1])
+        self._tflite_scores, self._tflite_boxes = outputs[0], outputs[-1]
+        
+        self._tflite_size = int(self._tflite_input['shape'][1])
+        self._tflite_anchors = _blazeface_anchors(self._tflite_size)
+        self._tflite = True
+        
+        logger.info(f"MediaPipe BlazeFace TFLite detector initialized "
+                    f"({self._tflite_input['dtype'].__name__} input)")
+    
     def _init_opencv(self):
-        """Initialize OpenCV Haar Cascade detector."""
+        """Initialize OpenCV YuNet, or the Haar Cascade when the model is missing."""
+        if os.path.exists(YUNET_ONNX_PATH) and hasattr(cv2, 'FaceDetectorYN'):
+            self.detector = cv2.FaceDetectorYN.create(
+                YUNET_ONNX_PATH, "", (320, 320),
+                score_threshold=0.6, nms_threshold=0.3, top_k=5000,
+                backend_id=cv2.dnn.DNN_BACKEND_OPENCV, target_id=cv2.dnn.DNN_TARGET_CPU
+            )
+            self._yunet = True
+            logger.info("OpenCV YuNet detector initialized")
+            return
+        
         cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-        self.detector = cv2.CascadeClassifier(cascade_path)
-        logger.info("OpenCV Haar Cascade detector initialized")
+        self.detector = _load_cascade(cascade_path)
+        
+        # Run the conversion and cascade through the T-API (OpenCL) when a device exists
+        self._use_umat = cv2.ocl.haveOpenCL()
+        if self._use_umat:
+            cv2.ocl.setUseOpenCL(True)
+        logger.info(f"OpenCV Haar Cascade detector initialized "
+                    f"(OpenCL {'on' if self._use_umat else 'off'})")
     
-    def detect_faces(self, image: np.ndarray, 
+    def _init_opencv_dnn(self):
+        """Initialize the ResNet-10 SSD face detector on OpenCV's DNN module.
+        
+        Runs on OpenVINO's Inference Engine when OpenCV was built with it,
+        on the CUDA backend when it was built with CUDA, and on OpenCV's own
+        CPU backend otherwise.
+        """
+        model_path = self.model_path or SSD_CAFFEMODEL_PATH
+        if not os.path.exists(SSD_PROTOTXT_PATH) or not os.path.exists(model_path):
+            raise FileNotFoundError(f"SSD face model not found: {SSD_PROTOTXT_PATH}, {model_path}")
+        
+        self.detector = cv2.dnn.readNetFromCaffe(SSD_PROTOTXT_PATH, model_path)
+        if openvino_available():
+            self.detector.setPreferableBackend(cv2.dnn.DNN_BACKEND_INFERENCE_ENGINE)
+            self.detector.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+            target = "OpenVINO"
+        elif self._cv_cuda_available():
+            self.detector.setPreferableBackend(cv2.dnn.DNN_BACKEND_CUDA)
+            self.detector.setPreferableTarget(cv2.dnn.DNN_TARGET_CUDA)
+            target = "CUDA"
+        else:
+            self.detector.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+            self.detector.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+            target = "CPU"
+        
+        logger.info(f"SSD OpenCV DNN detector initialized ({target})")
+    
+    @staticmethod
+    def _preprocess(image) -> PreprocessedFrame:
+        """
+        Wrap a BGR image so its color conversions are computed once.
+        
+        Args:
+            image: Input image (BGR format) or an existing PreprocessedFrame
+            
+        Returns:
+            PreprocessedFrame for the image
+        """
+        if isinstance(image, PreprocessedFrame):
+            return image
+        return PreprocessedFrame(image)
+    
+    def detect_faces(self, image, 
                      min_confidence: float = 0.5) -> List[Tuple[int, int, int, int]]:
         """
         Detect faces in an image.
         
         Args:
-            image: Input image (BGR format)
+            image: Input image (BGR format) or a PreprocessedFrame from
+                   _preprocess() to share conversions with other steps
             min_confidence: Minimum confidence threshold
             
         Returns:
             List of face locations as (top, right, bottom, left) tuples
         """
+        return _to_tuples(self.detect_faces_array(image, min_confidence))
+    
+    def detect_faces_array(self, image, min_confidence: float = 0.5) -> np.ndarray:
+        """
+        Detect faces in an image, returning them as a NumPy array.
+        
+        Same as detect_faces() without boxing every location into a tuple,
+        for callers that go on to process the boxes with NumPy.
+        
+        Args:
+            image: Input image (BGR format) or a PreprocessedFrame
+            min_confidence: Minimum confidence threshold
+            
+        Returns:
+            (N, 4) int32 array of (top, right, bottom, left) rows
+        """
         if self.detector is None:
-            return []
+            return _NO_FACES
+        
+        frame = self._preprocess(image)
+        
+        # Consecutive video frames are mostly identical; skip the detector for those
+        thumb = self._thumbnail(frame) if self.static_threshold > 0 else None
+        if thumb is not None and self._is_static(thumb, min_confidence):
+            return self._prev_faces.copy()
         
         try:
-            if self.backend == "mtcnn":
-                return self._detect_mtcnn(image, min_confidence)
-            elif self.backend == "retinaface":
-                return self._detect_retinaface(image, min_confidence)
-            elif self.backend == "mediapipe":
-                return self._detect_mediapipe(image, min_confidence)
-            elif self.backend == "opencv":
-                return self._detect_opencv(image)
-            return []
+            faces = self._detect_scaled(frame, min_confidence)
         except Exception as e:
             logger.error(f"Detection error: {e}")
-            return []
-    
-    def _detect_mtcnn(self, image: np.ndarray, 
-                      min_confidence: float) -> List[Tuple[int, int, int, int]]:
-        """Detect faces using MTCNN."""
-        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        detections = self.detector.detect_faces(rgb_image)
+            return _NO_FACES
         
-        faces = []
-        for detection in detections:
-            if detection['confidence'] >= min_confidence:
-                x, y, w, h = detection['box']
-                # Convert to (top, right, bottom, left)
-                top, right, bottom, left = y, x + w, y + h, x
-                faces.append((top, right, bottom, left))
+        if thumb is not None:
+            self._prev_thumb, self._prev_confidence = thumb, min_confidence
+            self._prev_faces = faces.copy()
+        return faces
+    
+    def _detect_scaled(self, frame: PreprocessedFrame, min_confidence: float) -> np.ndarray:
+        """Run the backend on a downscaled copy of the frame and map the boxes back."""
+        # Detectors scale with pixel count; run them on a VGA-sized copy
+        if self.target_width > 0:
+            small, scale = frame.downscaled(self.target_width)
+        else:
+            small, scale = frame, 1.0
         
+        faces = self._detect_impl(small, min_confidence)
+        if scale != 1.0 and len(faces):
+            faces = np.rint(faces / scale).astype(np.int32)
         return faces
     
-    def _detect_retinaface(self, image: np.ndarray, 
-                           min_confidence: float) -> List[Tuple[int, int, int, int]]:
+    def _bind_backend(self):
+        """Resolve the backend's detection method once instead of on every frame."""
+        if self.backend_id == Backend.MEDIAPIPE and self._tflite:
+            self._detect_impl = self._detect_blazeface_tflite
+        elif self.backend_id == Backend.OPENCV and self._yunet:
+            self._detect_impl = self._detect_yunet
+        else:
+            self._detect_impl = (
+                self._detect_mtcnn,
+                self._detect_retinaface,
+                self._detect_retinaface_trt,
+                self._detect_retinaface_jit,
+                self._detect_retinaface_dnn,
+                self._detect_mediapipe,
+                self._detect_opencv,
+                self._detect_opencv_dnn,
+            )[self.backend_id]
+    
+    @staticmethod
+    def _thumbnail(frame: PreprocessedFrame) -> np.ndarray:
+        """Downsample a frame to the 32x32 grayscale used by the static-frame gate."""
+        small = cv2.resize(frame.bgr, (32, 32), interpolation=cv2.INTER_AREA)
+        return small if small.ndim == 2 else cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    
+    def _is_static(self, thumb: np.ndarray, min_confidence: float) -> bool:
+        """Whether a thumbnail matches the last detected frame closely enough to reuse it."""
+        if self._prev_thumb is None or min_confidence != self._prev_confidence:
+            return False
+        return cv2.norm(thumb, self._prev_thumb, cv2.NORM_L1) < self.static_threshold
+    
+    # Color conversion each backend consumes, warmed by the preprocess stage
+    _PIPELINE_CONVERSIONS = {
+        Backend.MTCNN: "rgb",
+        Backend.MEDIAPIPE: "rgb",
+        Backend.OPENCV: "gray",
+    }
+    
+    def detect_faces_async(self, image, min_confidence: float = 0.5) -> Future:
+        """
+        Queue a frame for pipelined detection.
+        
+        Frames flow through two worker threads: one does color conversion on
+        the CPU, the other runs the detector. The native detectors release the
+        GIL, so frame N+1 is preprocessed while frame N is being inferred.
+        Both queues hold two frames, blocking the caller when the pipeline is
+        full rather than letting frames pile up.
+        
+        Args:
+            image: Input image (BGR format) or a PreprocessedFrame
+            min_confidence: Minimum confidence threshold
+            
+        Returns:
+            Future resolving to the list of (top, right, bottom, left) tuples
+        """
+        if not self._pipeline_threads:
+            self._start_pipeline()
+        
+        future = Future()
+        self._preprocess_queue.put((image, min_confidence, future))
+        return future
+    
+    def _start_pipeline(self):
+        """Start the preprocess and inference worker threads."""
+        self._preprocess_queue = queue.Queue(maxsize=2)
+        self._inference_queue = queue.Queue(maxsize=2)
+        self._pipeline_threads = [
+            threading.Thread(target=self._preprocess_worker, daemon=True),
+            threading.Thread(target=self._inference_worker, daemon=True),
+        ]
+        for thread in self._pipeline_threads:
+            thread.start()
+    
+    def stop_pipeline(self):
+        """Stop the workers started by detect_faces_async and detect_many."""
+        if self._pipeline_threads:
+            self._preprocess_queue.put(None)
+            for thread in self._pipeline_threads:
+                thread.join(timeout=1.0)
+            self._pipeline_threads = []
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+    
+    def _can_detect_concurrently(self) -> bool:
+        """Whether the backend tolerates calls from several threads at once.
+        
+        MediaPipe graphs, TFLite interpreters, YuNet (whose input size is set
+        per call) and the TorchScript backend's pinned staging buffers keep
+        per-call state, so they are only ever driven from one thread.
+        """
+        if self.backend_id == Backend.OPENCV:
+            return not self._yunet
+        return self.backend_id in (Backend.MTCNN, Backend.RETINAFACE, Backend.RETINAFACE_TRT)
+    
+    def detect_many(self, images: List[np.ndarray],
+                    min_confidence: float = 0.5) -> List[List[Tuple[int, int, int, int]]]:
+        """
+        Detect faces in independent images on a thread pool.
+        
+        The native detectors (OpenCV, TensorFlow, ONNX Runtime) release the
+        GIL while they run, so the images are processed in parallel across
+        CPU cores. Unlike detect_faces, the images are not treated as a video
+        stream: the unchanged-frame check is skipped. Backends that are not
+        safe to call concurrently process the images one after another.
+        
+        Args:
+            images: Input images (BGR format) or PreprocessedFrames
+            min_confidence: Minimum confidence threshold
+            
+        Returns:
+            One list of (top, right, bottom, left) tuples per input image
+        """
+        if self.detector is None or not images:
+            return [[] for _ in images]
+        
+        def detect(image):
+            try:
+                return _to_tuples(self._detect_scaled(self._preprocess(image), min_confidence))
+            except Exception as e:
+                logger.error(f"Detection error: {e}")
+                return []
+        
+        if not self._can_detect_concurrently() or len(images) == 1:
+            return [detect(image) for image in images]
+        
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+        return list(self._pool.map(detect, images))
+    
+    def _preprocess_worker(self):
+        """Pipeline stage 1: color conversion."""
+        while True:
+            item = self._preprocess_queue.get()
+            if item is None:
+                self._inference_queue.put(None)
+                return
+            
+            image, min_confidence, future = item
+            frame = self._preprocess(image)
+            try:
+                conversion = None if self._yunet else self._PIPELINE_CONVERSIONS.get(self.backend_id)
+                if conversion:
+                    # Warm the copy detect_faces will actually run the backend on
+                    small = frame.downscaled(self.target_width)[0] if self.target_width > 0 else frame
+                    getattr(small, conversion)
+            except Exception as e:
+                future.set_exception(e)
+                continue
+            self._inference_queue.put((frame, min_confidence, future))
+    
+    def _inference_worker(self):
+        """Pipeline stage 2: detection."""
+        while True:
+            item = self._inference_queue.get()
+            if item is None:
+                return
+            
+            frame, min_confidence, future = item
+            future.set_result(self.detect_faces(frame, min_confidence))
+    
+    def detect_faces_batch(self, images: List[np.ndarray],
+                           min_confidence: float = 0.5) -> List[List[Tuple[int, int, int, int]]]:
+        """
+        Detect faces in several images with one detector call where possible.
+        
+        MTCNN (mtcnn >= 1.0) and batch-enabled RetinaFace ONNX exports run
+        the whole batch through the network at once, amortizing the
+        per-call framework overhead. Other backends fall back to one
+        detect_faces() call per image.
+        
+        Args:
+            images: Input images (BGR format) or PreprocessedFrames
+            min_confidence: Minimum confidence threshold
+            
+        Returns:
+            One list of (top, right, bottom, left) tuples per input image
+        """
+        if self.detector is None or not images:
+            return [[] for _ in images]
+        
+        frames = [self._preprocess(image) for image in images]
+        
+        try:
+            if self.backend_id == Backend.MTCNN:
+                batch = self._detect_mtcnn_batch(frames, min_confidence)
+            elif self.backend_id == Backend.RETINAFACE_TRT and self._supports_batch():
+                batch = self._detect_retinaface_trt_batch(frames, min_confidence)
+            else:
+                batch = [self.detect_faces_array(frame, min_confidence) for frame in frames]
+        except Exception as e:
+            logger.error(f"Batch detection error: {e}")
+            return [[] for _ in frames]
+        
+        return [_to_tuples(faces) for faces in batch]
+    
+    def _detect_mtcnn_batch(self, frames: List[PreprocessedFrame],
+                            min_confidence: float) -> List[np.ndarray]:
+        """Detect faces in a batch of frames using MTCNN."""
+        if len(frames) == 1:
+            return [self._detect_mtcnn(frames[0], min_confidence)]
+        
+        try:
+            batch = self.detector.detect_faces([frame.rgb for frame in frames])
+        except (TypeError, ValueError, AttributeError):
+            # mtcnn < 1.0 only accepts a single image per call
+            return [self._detect_mtcnn(frame, min_confidence) for frame in frames]
+        
+        return [self._mtcnn_to_locations(detections, min_confidence) for detections in batch]
+    
+    def _detect_mtcnn(self, frame: PreprocessedFrame, 
+                      min_confidence: float) -> np.ndarray:
+        """Detect faces using MTCNN."""
+        detections = self.detector.detect_faces(frame.rgb)
+        return self._mtcnn_to_locations(detections, min_confidence)
+    
+    @staticmethod
+    def _mtcnn_to_locations(detections: List[dict], min_confidence: float) -> np.ndarray:
+        """Convert MTCNN detections to an array of (top, right, bottom, left) rows."""
+        if not detections:
+            return _NO_FACES
+        scores = np.array([detection['confidence'] for detection in detections])
+        boxes = np.array([detection['box'] for detection in detections])
+        return _xywh_to_trbl(boxes[scores >= min_confidence])
+    
+    def _detect_retinaface(self, frame: PreprocessedFrame, 
+                           min_confidence: float) -> np.ndarray:
         """Detect faces using RetinaFace."""
-        detections = self.detector.detect_faces(image)
+        detections = self.detector.detect_faces(frame.bgr)
+        if not isinstance(detections, dict):
+            return _NO_FACES
         
-        faces = []
-        for key in detections.keys():
-            detection = detections[key]
-            if detection.get('score', 0) >= min_confidence:
-                facial_area = detection['facial_area']
-                x1, y1, x2, y2 = facial_area
-                # Convert to (top, right, bottom, left)
-                top, right, bottom, left = y1, x2, y2, x1
-                faces.append((top, right, bottom, left))
+        return _xyxy_to_trbl([
+            detection['facial_area'] for detection in detections.values()
+            if detection.get('score', 0) >= min_confidence
+        ])
+    
+    def _get_priors(self, height: int, width: int) -> np.ndarray:
+        """Return cached RetinaFace priors for an input size."""
+        key = (height, width)
+        if key not in self._priors:
+            self._priors[key] = _retinaface_priors(height, width)
+        return self._priors[key]
+    
+    def _retinaface_blob(self, image: np.ndarray) -> np.ndarray:
+        """Build a (3, H, W) mean-subtracted RetinaFace input from a BGR image."""
+        net_image = cv2.resize(image, self._input_size) if self._input_size else image
+        return (net_image.astype(np.float32) - _RETINA_MEAN).transpose(2, 0, 1)
+    
+    def _supports_batch(self) -> bool:
+        """Whether the loaded ONNX model has a dynamic batch dimension."""
+        return not isinstance(self._ort_input.shape[0], int)
+    
+    def _detect_retinaface_trt(self, frame: PreprocessedFrame, 
+                               min_confidence: float) -> np.ndarray:
+        """Detect faces using the TensorRT RetinaFace engine."""
+        blob = self._retinaface_blob(frame.bgr)[None]
+        loc, conf = self.detector.run(None, {self._ort_input.name: blob})[:2]
+        return self._retinaface_to_locations(loc[0], conf[0], blob.shape, frame.shape, min_confidence)
+    
+    def _detect_retinaface_trt_batch(self, frames: List[PreprocessedFrame],
+                                     min_confidence: float) -> List[np.ndarray]:
+        """Detect faces in a batch of frames with one TensorRT engine call."""
+        if self._input_size is None and len({frame.shape for frame in frames}) > 1:
+            # Dynamic-size models need equally sized frames to stack
+            return [self._detect_retinaface_trt(frame, min_confidence) for frame in frames]
         
-        return faces
+        blob = np.ascontiguousarray(np.stack([self._retinaface_blob(frame.bgr) for frame in frames]))
+        loc, conf = self.detector.run(None, {self._ort_input.name: blob})[:2]
+        return [
+            self._retinaface_to_locations(loc[i], conf[i], blob.shape, frame.shape, min_confidence)
+            for i, frame in enumerate(frames)
+        ]
+    
+    def _detect_retinaface_jit(self, frame: PreprocessedFrame,
+                               min_confidence: float) -> np.ndarray:
+        """Detect faces using the TorchScript RetinaFace model."""
+        torch = self._torch
+        image = frame.bgr
+        
+        host = self._pinned.get(image.shape)
+        if host is None:
+            host = torch.empty(image.shape, dtype=torch.uint8,
+                               pin_memory=self._torch_device.type == "cuda")
+            self._pinned[image.shape] = host
+        host.numpy()[...] = image
+        
+        with torch.inference_mode():
+            blob = host.to(self._torch_device, non_blocking=True).permute(2, 0, 1)
+            blob = (blob.to(self._torch_dtype) - self._torch_mean)[None]
+            loc, conf = self.detector(blob)[:2]
+            loc = loc[0].float().cpu().numpy()
+            conf = conf[0].float().cpu().numpy()
+        
+        return self._retinaface_to_locations(loc, conf, tuple(blob.shape), frame.shape, min_confidence)
+    
+    def _detect_retinaface_dnn(self, frame: PreprocessedFrame,
+                               min_confidence: float) -> np.ndarray:
+        """Detect faces using RetinaFace on OpenCV's DNN module."""
+        # The model takes mean-subtracted BGR, so no channel swap
+        blob = cv2.dnn.blobFromImage(frame.bgr, 1.0, self._input_size,
+                                     tuple(_RETINA_MEAN.tolist()), swapRB=False, crop=False)
+        self.detector.setInput(blob)
+        outputs = self.detector.forward(self._dnn_outputs)
+        
+        # Box regressions end in 4 values per prior, class scores in 2
+        loc = next(out for out in outputs if out.shape[-1] == 4)
+        conf = next(out for out in outputs if out.shape[-1] == 2)
+        return self._retinaface_to_locations(loc[0], conf[0], blob.shape, frame.shape, min_confidence)
     
-    def _detect_mediapipe(self, image: np.ndarray, 
-                          min_confidence: float) -> List[Tuple[int, int, int, int]]:
+    def _retinaface_to_locations(self, loc: np.ndarray, conf: np.ndarray,
+                                 blob_shape: Tuple[int, ...], image_shape: Tuple[int, ...],
+                                 min_confidence: float) -> np.ndarray:
+        """Decode one image's RetinaFace outputs to (top, right, bottom, left) tuples."""
+        net_h, net_w = blob_shape[-2:]
+        h, w = image_shape[:2]
+        detections = _decode_retinaface(
+            loc, conf, self._get_priors(net_h, net_w), w, h, min_confidence
+        )
+        
+        return _xyxy_to_trbl(detections[:, :4])
+    
+    def _detect_mediapipe(self, frame: PreprocessedFrame, 
+                          min_confidence: float) -> np.ndarray:
         """Detect faces using MediaPipe."""
-        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        results = self.detector.process(rgb_image)
-        
-        faces = []
-        if results.detections:
-            h, w = image.shape[:2]
-            for detection in results.detections:
-                if detection.score[0] >= min_confidence:
-                    bbox = detection.location_data.relative_bounding_box
-                    # Convert relative coordinates to absolute
-                    left = int(bbox.xmin * w)
-                    top = int(bbox.ymin * h)
-                    right = int((bbox.xmin + bbox.width) * w)
-                    bottom = int((bbox.ymin + bbox.height) * h)
-                    faces.append((top, right, bottom, left))
+        if self._tflite:
+            return self._detect_blazeface_tflite(frame, min_confidence)
         
-        return faces
+        results = self.detector.process(frame.rgb)
+        if not results.detections:
+            return _NO_FACES
+        
+        detections = results.detections
+        scores = np.fromiter((detection.score[0] for detection in detections),
+                             dtype=np.float32, count=len(detections))
+        boxes = np.fromiter(
+            (value for detection in detections
+             for bbox in (detection.location_data.relative_bounding_box,)
+             for value in (bbox.xmin, bbox.ymin, bbox.width, bbox.height)),
+            dtype=np.float32, count=4 * len(detections)
+        ).reshape(-1, 4)[scores >= min_confidence]
+        
+        # Convert relative (x, y, w, h) to absolute (x1, y1, x2, y2)
+        h, w = frame.shape[:2]
+        boxes[:, 2:] += boxes[:, :2]
+        return _xyxy_to_trbl(boxes * np.array([w, h, w, h], dtype=np.float32))
+    
+    @staticmethod
+    def _tflite_dequantize(tensor: np.ndarray, details: dict) -> np.ndarray:
+        """Convert a quantized TFLite output tensor to float32."""
+        scale, zero_point = details['quantization']
+        if scale == 0:
+            return tensor.astype(np.float32)
+        return (tensor.astype(np.float32) - zero_point) * scale
+    
+    def _detect_blazeface_tflite(self, frame: PreprocessedFrame,
+                                 min_confidence: float) -> np.ndarray:
+        """Detect faces using the INT8 BlazeFace TFLite model."""
+        size = self._tflite_size
+        image = cv2.resize(frame.rgb, (size, size), interpolation=cv2.INTER_AREA)
+        
+        # The model expects RGB in [-1, 1]; quantized inputs take it in their own scale
+        blob = image.astype(np.float32) / 127.5 - 1.0
+        scale, zero_point = self._tflite_input['quantization']
+        if scale:
+            blob = np.round(blob / scale + zero_point)
+        blob = blob.astype(self._tflite_input['dtype'])[None]
+        
+        self.detector.set_tensor(self._tflite_input['index'], blob)
+        self.detector.invoke()
+        raw_boxes = self._tflite_dequantize(
+            self.detector.get_tensor(self._tflite_boxes['index'])[0], self._tflite_boxes)
+        raw_scores = self._tflite_dequantize(
+            self.detector.get_tensor(self._tflite_scores['index'])[0, :, 0], self._tflite_scores)
+        
+        scores = 1.0 / (1.0 + np.exp(-np.clip(raw_scores, -100.0, 100.0)))
+        mask = scores >= min_confidence
+        if not mask.any():
+            return _NO_FACES
+        
+        raw_boxes, scores = raw_boxes[mask, :4] / size, scores[mask]
+        centers = self._tflite_anchors[mask] + raw_boxes[:, :2]
+        sizes = raw_boxes[:, 2:]
+        
+        h, w = frame.shape[:2]
+        boxes = np.concatenate([centers - sizes / 2, centers + sizes / 2], axis=1)
+        boxes *= np.array([w, h, w, h], dtype=np.float32)
+        
+        return _xyxy_to_trbl(boxes[_nms(boxes, scores, 0.3)])
     
-    def _detect_opencv(self, image: np.ndarray) -> List[Tuple[int, int, int, int]]:
-        """Detect faces using OpenCV Haar Cascade."""
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    def _detect_opencv(self, frame: PreprocessedFrame,
+                       min_confidence: float = 0.5) -> np.ndarray:
+        """Detect faces using OpenCV YuNet or the Haar Cascade."""
+        if self._yunet:
+            return self._detect_yunet(frame, min_confidence)
+        
+        if self._use_umat:
+            if frame._gray is None and frame.bgr.ndim == 3:
+                gray = cv2.cvtColor(cv2.UMat(frame.bgr), cv2.COLOR_BGR2GRAY)
+            else:
+                gray = cv2.UMat(frame.gray)
+        else:
+            gray = frame.gray
+        
         detections = self.detector.detectMultiScale(
             gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30)
         )
         
-        faces = []
-        for (x, y, w, h) in detections:
-            # Convert to (top, right, bottom, left)
-            top, right, bottom, left = y, x + w, y + h, x
-            faces.append((top, right, bottom, left))
+        return _xywh_to_trbl(detections) if len(detections) else _NO_FACES
+    
+    def _detect_yunet(self, frame: PreprocessedFrame,
+                      min_confidence: float) -> np.ndarray:
+        """Detect faces using OpenCV YuNet."""
+        h, w = frame.shape[:2]
+        self.detector.setInputSize((w, h))
+        self.detector.setScoreThreshold(min_confidence)
+        _, detections = self.detector.detect(frame.bgr)
         
-        return faces
+        return _xywh_to_trbl(detections[:, :4]) if detections is not None else _NO_FACES
+    
+    def _detect_opencv_dnn(self, frame: PreprocessedFrame,
+                           min_confidence: float) -> np.ndarray:
+        """Detect faces using the ResNet-10 SSD on OpenCV's DNN module."""
+        blob = cv2.dnn.blobFromImage(frame.bgr, 1.0, (300, 300), _SSD_MEAN, swapRB=False, crop=False)
+        self.detector.setInput(blob)
+        
+        # (1, 1, N, 7) rows of [image_id, label, confidence, x1, y1, x2, y2], coordinates relative
+        detections = self.detector.forward()[0, 0]
+        detections = detections[detections[:, 2] >= min_confidence]
+        
+        h, w = frame.shape[:2]
+        boxes = np.clip(detections[:, 3:7], 0.0, 1.0) * np.array([w, h, w, h], dtype=np.float32)
+        return _xyxy_to_trbl(boxes)
     
-    def detect_with_landmarks(self, image: np.ndarray) -> List[dict]:
+    def detect_with_landmarks(self, image) -> List[dict]:
         """
         Detect faces with facial landmarks.
         
         Args:
-            image: Input image (BGR format)
+            image: Input image (BGR format) or a PreprocessedFrame
             
         Returns:
             List of dictionaries containing face location and landmarks
         """
-        if self.backend == "mtcnn":
-            rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-            detections = self.detector.detect_faces(rgb_image)
+        frame = self._preprocess(image)
+        
+        if self.backend_id == Backend.MTCNN:
+            detections = self.detector.detect_faces(frame.rgb)
             results = []
             for detection in detections:
                 x, y, w, h = detection['box']
@@ -205,8 +1200,8 @@ class AdvancedFaceDetector:
                     'landmarks': detection['keypoints']
                 })
             return results
-        elif self.backend == "retinaface":
-            detections = self.detector.detect_faces(image)
+        elif self.backend_id == Backend.RETINAFACE:
+            detections = self.detector.detect_faces(frame.bgr)
             results = []
             for key in detections.keys():
                 detection = detections[key]
@@ -220,7 +1215,7 @@ class AdvancedFaceDetector:
             return results
         else:
             # Fallback: basic detection without landmarks
-            faces = self.detect_faces(image)
+            faces = self.detect_faces(frame)
             return [{'location': loc, 'confidence': 1.0, 'landmarks': {}} for loc in faces]
 
 
@@ -228,13 +1223,16 @@ class FaceQualityAssessor:
     """Assess the quality of detected faces for registration."""
     
     @staticmethod
-    def assess_quality(image: np.ndarray, face_location: Tuple[int, int, int, int]) -> dict:
+    def assess_quality(image: np.ndarray, face_location: Tuple[int, int, int, int],
+                       gray: Optional[np.ndarray] = None) -> dict:
         """
         Assess the quality of a face for registration.
         
         Args:
             image: Full image
             face_location: (top, right, bottom, left) of face
+            gray: Grayscale version of the full image, if already computed
+                  (e.g. PreprocessedFrame.gray)
             
         Returns:
             Dictionary with quality metrics and overall score
@@ -245,15 +1243,130 @@ class FaceQualityAssessor:
         if face.size == 0:
             return {'overall_score': 0, 'message': 'Invalid face region'}
         
-        # Check brightness
-        brightness = FaceQualityAssessor._check_brightness(face)
+        # Convert once and share between the brightness and blur checks
+        if gray is not None:
+            face_gray = gray[top:bottom, left:right]
+        else:
+            face_gray = cv2.cvtColor(face, cv2.COLOR_BGR2GRAY) if len(face.shape) == 3 else face
         
-        # Check blur
-        blur_score = FaceQualityAssessor._check_blur(face)
+        if _fused_quality is not None and min(face_gray.shape[:2]) >= 2:
+            # Brightness and blur statistics from a single scan of the crop
+            mean_brightness, laplacian_var = _fused_quality(
+                face_gray, FaceQualityAssessor._blur_patch(face_gray)
+            )
+            brightness = FaceQualityAssessor._score_brightness(mean_brightness)
+            blur_score = FaceQualityAssessor._score_blur(laplacian_var)
+        else:
+            # Check brightness
+            brightness = FaceQualityAssessor._check_brightness(face_gray)
+            
+            # Check blur
+            blur_score = FaceQualityAssessor._check_blur(face_gray)
         
         # Check size
         size_score = FaceQualityAssessor._check_size(face)
         
+        return FaceQualityAssessor._combine_scores(brightness, blur_score, size_score)
+    
+    # Thresholds of the fast_score gate (see is_usable)
+    _MIN_CONTRAST = 10.0
+    _MIN_LAPLACIAN_VAR = 50.0
+    
+    @staticmethod
+    def fast_score(face_gray: np.ndarray) -> Tuple[float, float, float]:
+        """
+        Cheap quality statistics of a grayscale face crop.
+        
+        Computed over the centre patch used by the blur check, in a single
+        pass when Numba is available.
+        
+        Args:
+            face_gray: Grayscale face crop with at least 2 rows and 2 columns
+            
+        Returns:
+            (mean brightness, contrast as standard deviation, Laplacian variance)
+        """
+        patch = FaceQualityAssessor._blur_patch(face_gray)
+        if _fast_score is not None:
+            mean, std, laplacian_var = _fast_score(patch)
+            return float(mean), float(std), float(laplacian_var)
+        
+        mean, std = cv2.meanStdDev(patch)
+        _, lap_std = cv2.meanStdDev(cv2.Laplacian(patch, cv2.CV_16S))
+        return float(mean[0, 0]), float(std[0, 0]), float(lap_std[0, 0]) ** 2
+    
+    @staticmethod
+    def is_usable(face_gray: np.ndarray) -> bool:
+        """
+        Whether a face is good enough to spend emotion/liveness inference on.
+        
+        Rejects crops that are too small, badly exposed (the "poor lighting"
+        band of _check_brightness), flat, or blurry (the "too blurry" band
+        of _check_blur).
+        
+        Args:
+            face_gray: Grayscale face crop
+            
+        Returns:
+            True if the face passes the gate
+        """
+        if min(face_gray.shape[:2]) < 2:
+            return False
+        mean, std, laplacian_var = FaceQualityAssessor.fast_score(face_gray)
+        return bool(
+            (FaceQualityAssessor._BRIGHTNESS_LUT[int(mean)] != 2) &
+            (std >= FaceQualityAssessor._MIN_CONTRAST) &
+            (laplacian_var > FaceQualityAssessor._MIN_LAPLACIAN_VAR)
+        )
+    
+    @staticmethod
+    def assess_quality_gpu(image_gpu, face_location: Tuple[int, int, int, int]) -> dict:
+        """
+        Assess the quality of a face in an image that is already on the GPU.
+        
+        Only the mean and Laplacian variance are copied back to the host,
+        instead of the whole crop.
+        
+        Args:
+            image_gpu: Full BGR or grayscale image as a CuPy array, or any
+                       CUDA array CuPy can wrap (e.g. a torch tensor)
+            face_location: (top, right, bottom, left) of face
+            
+        Returns:
+            Dictionary with quality metrics and overall score
+        """
+        try:
+            import cupy as cp
+            from cupyx.scipy import ndimage
+        except ImportError:
+            logger.error("CuPy not installed. Install with: pip install cupy-cuda12x")
+            raise
+        
+        top, right, bottom, left = face_location
+        face = cp.asarray(image_gpu)[top:bottom, left:right]
+        
+        if face.size == 0:
+            return {'overall_score': 0, 'message': 'Invalid face region'}
+        
+        if face.ndim == 3:
+            face_gray = cp.einsum('hwc,c->hw', face.astype(cp.float32),
+                                  cp.asarray([0.114, 0.587, 0.299], dtype=cp.float32))
+        else:
+            face_gray = face.astype(cp.float32)
+        
+        # 'mirror' is OpenCV's default reflect-101 border
+        lap = ndimage.laplace(FaceQualityAssessor._blur_patch(face_gray), mode='mirror')
+        mean_brightness, laplacian_var = cp.stack([face_gray.mean(), lap.var()]).get()
+        
+        brightness = FaceQualityAssessor._score_brightness(mean_brightness)
+        blur_score = FaceQualityAssessor._score_blur(laplacian_var)
+        size_score = FaceQualityAssessor._check_size(face)
+        
+        return FaceQualityAssessor._combine_scores(brightness, blur_score, size_score)
+    
+    @staticmethod
+    def _combine_scores(brightness: dict, blur_score: dict, size_score: dict) -> dict:
+        """Combine the individual checks into the assess_quality result."""
         # Calculate overall score
         overall = (brightness['score'] + blur_score['score'] + size_score['score']) / 3
         
@@ -272,30 +1385,79 @@ class FaceQualityAssessor:
             'acceptable': overall >= 0.5
         }
     
+    # Brightness bands indexed by mean gray level: 0 = good, 1 = fair, 2 = poor
+    _BRIGHTNESS_BANDS = ((1.0, "Good lighting"),
+                         (0.6, "Lighting could be better"),
+                         (0.3, "Poor lighting (too dark or too bright)"))
+    _BRIGHTNESS_LUT = np.full(256, 2, dtype=np.uint8)
+    _BRIGHTNESS_LUT[50:80] = 1
+    _BRIGHTNESS_LUT[80:181] = 0  # Ideal brightness is around 100-150
+    _BRIGHTNESS_LUT[181:201] = 1
+    _BRIGHTNESS_SCORES = np.array([band[0] for band in _BRIGHTNESS_BANDS], dtype=np.float32)
+    
     @staticmethod
     def _check_brightness(face: np.ndarray) -> dict:
         """Check if face is well-lit."""
         gray = cv2.cvtColor(face, cv2.COLOR_BGR2GRAY) if len(face.shape) == 3 else face
-        mean_brightness = np.mean(gray)
-        
-        # Ideal brightness is around 100-150
-        if 80 <= mean_brightness <= 180:
-            score = 1.0
-            message = "Good lighting"
-        elif 50 <= mean_brightness < 80 or 180 < mean_brightness <= 200:
-            score = 0.6
-            message = "Lighting could be better"
-        else:
-            score = 0.3
-            message = "Poor lighting (too dark or too bright)"
+        return FaceQualityAssessor._score_brightness(cv2.mean(gray)[0])
+    
+    @staticmethod
+    def _score_brightness(mean_brightness: float) -> dict:
+        """Score a mean gray level."""
+        band = FaceQualityAssessor._BRIGHTNESS_LUT[int(mean_brightness)]
+        score, message = FaceQualityAssessor._BRIGHTNESS_BANDS[band]
         
         return {'score': score, 'value': mean_brightness, 'message': message}
     
+    @staticmethod
+    def check_brightness_batch(faces: np.ndarray) -> np.ndarray:
+        """
+        Score the brightness of several equally sized grayscale faces at once.
+        
+        Args:
+            faces: (N, H, W) stack of grayscale face crops
+            
+        Returns:
+            (N,) array of brightness scores, as in _check_brightness
+        """
+        faces = np.asarray(faces)
+        if faces.shape[0] == 0:
+            return np.empty(0, dtype=np.float32)
+        means = faces.reshape(faces.shape[0], -1).mean(axis=1).astype(np.uint8)
+        return FaceQualityAssessor._BRIGHTNESS_SCORES[FaceQualityAssessor._BRIGHTNESS_LUT[means]]
+    
+    # Side of the centre patch the blur check samples
+    _BLUR_PATCH = 128
+    
+    @staticmethod
+    def _blur_patch(gray: np.ndarray) -> np.ndarray:
+        """
+        Centre patch of a face used to estimate its sharpness.
+        
+        The Laplacian variance is a statistic over the whole face, so a
+        128x128 sample estimates it as well as the full crop. The patch is not
+        resized, which would change the variance scale the thresholds assume.
+        """
+        h, w = gray.shape[:2]
+        half = FaceQualityAssessor._BLUR_PATCH // 2
+        cy, cx = h // 2, w // 2
+        return gray[max(0, cy - half):cy + half, max(0, cx - half):cx + half]
+    
     @staticmethod
     def _check_blur(face: np.ndarray) -> dict:
         """Check if face is in focus."""
         gray = cv2.cvtColor(face, cv2.COLOR_BGR2GRAY) if len(face.shape) == 3 else face
-        laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
+        gray = FaceQualityAssessor._blur_patch(gray)
+        # 16-bit output holds the full Laplacian range of uint8 input at a
+        # quarter of the memory traffic of CV_64F
+        lap = cv2.Laplacian(gray, cv2.CV_16S)
+        _, stddev = cv2.meanStdDev(lap)
+        return FaceQualityAssessor._score_blur(float(stddev[0, 0]) ** 2)
+    
+    @staticmethod
+    def _score_blur(laplacian_var: float) -> dict:
+        """Score a Laplacian variance."""
+        laplacian_var = float(laplacian_var)
         
         # Higher variance = sharper image
         if laplacian_var > 100:
@@ -12,33 +12,384 @@ A state-of-the-art graphical user interface with advanced features:
 """
 
 import os
+import sys
 import csv
+import functools
+import logging
+import shutil
 import threading
 import queue
 import time
+from collections import Counter, deque
 from datetime import datetime
 from pathlib import Path
-from tkinter import filedialog, messagebox
-from typing import Optional
+from tkinter import TclError, filedialog, messagebox
+from typing import List, Optional
 import customtkinter as ctk
 from PIL import Image, ImageTk
 import cv2
 import numpy as np
 
-from face_recognition_system import FaceRecognitionSystem
-from attendance_system import AttendanceSystem
-from advanced_detection import AdvancedFaceDetector, FaceQualityAssessor
-from liveness_detection import LivenessDetector
-from emotion_recognition import EmotionRecognizer, EmotionTracker
-from analytics import AnalyticsDashboard
-from database_manager import DatabaseManager
+from database_manager import DatabaseManager, read_names_sidecar
 from notifications import NotificationManager
+import fast_ops
+
+logger = logging.getLogger(__name__)
 
 # Set appearance mode and color theme
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
 
+class lazy_subsystem:
+    """
+    Like functools.cached_property, but builds the value only once even when
+    the UI thread and the warm-up thread ask for it at the same time.
+    """
+    
+    def __init__(self, factory):
+        self.factory = factory
+        self.name = factory.__name__
+        self.__doc__ = factory.__doc__
+        self._lock = threading.Lock()
+    
+    def __set_name__(self, owner, name):
+        self.name = name
+    
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        with self._lock:
+            if self.name not in obj.__dict__:
+                obj.__dict__[self.name] = self.factory(obj)
+        return obj.__dict__[self.name]
+
+
+class LatestFrameBuffer:
+    """
+    Thread-safe buffer that always hands out the most recent frame.
+    
+    Producers never block: a new frame replaces whatever the consumer has
+    not picked up yet, so a slow consumer skips stale frames instead of
+    working through a backlog.
+    """
+    
+    def __init__(self, maxlen: int = 2):
+        self._frames = deque(maxlen=maxlen)
+        self._cond = threading.Condition()
+    
+    def put(self, frame):
+        """Add a frame, dropping the oldest one if the buffer is full."""
+        with self._cond:
+            self._frames.append(frame)
+            self._cond.notify()
+    
+    def swap(self, frame):
+        """Replace the buffered frame(s) with frame; return the newest one replaced, or None."""
+        with self._cond:
+            old = self._frames.pop() if self._frames else None
+            self._frames.clear()
+            self._frames.append(frame)
+            self._cond.notify()
+            return old
+    
+    def get(self, timeout: Optional[float] = None):
+        """Wait for a frame and return the newest, discarding older ones (None on timeout)."""
+        with self._cond:
+            if not self._frames and not self._cond.wait_for(lambda: self._frames, timeout):
+                return None
+            frame = self._frames.pop()
+            self._frames.clear()
+            return frame
+    
+    def get_nowait(self):
+        """Return the newest frame, discarding older ones, or None if there is none."""
+        with self._cond:
+            if not self._frames:
+                return None
+            frame = self._frames.pop()
+            self._frames.clear()
+            return frame
+    
+    def clear(self):
+        """Drop all buffered frames."""
+        with self._cond:
+            self._frames.clear()
+
+
+class FrameRing:
+    """
+    Preallocated frame buffers shared by one producer and one consumer.
+    
+    The producer decodes straight into a free slot and publishes it; the
+    consumer borrows the newest published slot and reads it in place, so
+    frames are neither allocated nor copied on the way. Unread frames are
+    overwritten rather than queued. Three slots are enough: one being
+    written, one published, one being read.
+    """
+    
+    def __init__(self, slots: int = 3):
+        self._buffers = [None] * slots
+        self._cond = threading.Condition()
+        self._latest = None  # Slot of the newest unread frame
+        self._held = None  # Slot the consumer is reading
+    
+    def writable_slot(self):
+        """Return (slot, buffer) the producer may overwrite; buffer is None before first use."""
+        with self._cond:
+            slot = next(i for i in range(len(self._buffers))
+                        if i != self._latest and i != self._held)
+            return slot, self._buffers[slot]
+    
+    def publish(self, slot: int, frame: np.ndarray):
+        """Make the frame written into a slot the newest one."""
+        with self._cond:
+            self._buffers[slot] = frame
+            self._latest = slot
+            self._cond.notify()
+    
+    def has_unread(self) -> bool:
+        """Whether the newest published frame is still waiting for the consumer."""
+        with self._cond:
+            return self._latest is not None
+    
+    def acquire(self, timeout: Optional[float] = None):
+        """Borrow the newest unread frame (None on timeout); call release() when done with it."""
+        with self._cond:
+            if self._latest is None and not self._cond.wait_for(
+                lambda: self._latest is not None, timeout
+            ):
+                return None
+            self._held, self._latest = self._latest, None
+            return self._buffers[self._held]
+    
+    def release(self):
+        """Give the borrowed frame back to the producer."""
+        with self._cond:
+            self._held = None
+    
+    def clear(self):
+        """Drop the unread frame, if any."""
+        with self._cond:
+            self._latest = None
+
+
+class TrackState:
+    """Last known position and per-face results of one tracked face."""
+    
+    __slots__ = ('cx', 'cy', 'last_seen', 'emotion', 'emotion_frame')
+    
+    def __init__(self, cx: float, cy: float, frame_index: int):
+        self.cx = cx
+        self.cy = cy
+        self.last_seen = frame_index
+        self.emotion = None
+        self.emotion_frame = -1
+
+
+class CentroidTracker:
+    """
+    Follow faces across processed frames by the distance between box centres.
+    
+    Lets per-face results such as the last emotion be reused on the frames
+    where the model is not run for that face.
+    """
+    
+    def __init__(self, max_distance: float = 50.0, max_missing: int = 10):
+        self.tracks = {}
+        self.max_distance = max_distance
+        self.max_missing = max_missing
+        self._next_id = 0
+    
+    def update(self, boxes, frame_index: int) -> List[int]:
+        """
+        Match face boxes to tracks, starting new tracks for unmatched faces.
+        
+        Args:
+            boxes: (top, right, bottom, left) of each face
+            frame_index: Index of the processed frame
+            
+        Returns:
+            Track id of each box
+        """
+        centres = [((left + right) / 2, (top + bottom) / 2) for top, right, bottom, left in boxes]
+        
+        # Closest (track, face) pairs claim each other first
+        track_ids = list(self.tracks)
+        matches = fast_ops.match_centroids(
+            [(cy, cx) for cx, cy in centres],
+            [(self.tracks[t].cy, self.tracks[t].cx) for t in track_ids],
+            self.max_distance
+        )
+        ids = [track_ids[j] if j >= 0 else None for j in matches.tolist()]
+        
+        for i, (cx, cy) in enumerate(centres):
+            if ids[i] is None:
+                ids[i] = self._next_id
+                self.tracks[self._next_id] = TrackState(cx, cy, frame_index)
+                self._next_id += 1
+            track = self.tracks[ids[i]]
+            track.cx, track.cy, track.last_seen = cx, cy, frame_index
+        
+        # Forget faces that have been gone for a while
+        for track_id in [track_id for track_id, track in self.tracks.items()
+                         if frame_index - track.last_seen > self.max_missing]:
+            del self.tracks[track_id]
+        return ids
+
+
+class MatPool:
+    """
+    Pool of reusable ndarrays keyed by shape and dtype.
+    
+    Per-frame intermediates (resized copies, frame snapshots) are taken from
+    the pool and given back when the frame is done, so steady-state frames
+    allocate nothing. Arrays may be returned from a different thread than
+    the one that took them.
+    """
+    
+    def __init__(self, per_key: int = 4):
+        self._free = {}
+        self._lock = threading.Lock()
+        self.per_key = per_key
+    
+    def get(self, shape: tuple, dtype=np.uint8) -> np.ndarray:
+        """Take an array of the given shape and dtype (contents undefined)."""
+        key = (tuple(shape), np.dtype(dtype))
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                return free.pop()
+        return np.empty(shape, dtype=dtype)
+    
+    def put(self, array: Optional[np.ndarray]):
+        """Give an array back; the caller must not use it afterwards."""
+        if array is None:
+            return
+        key = (array.shape, array.dtype)
+        with self._lock:
+            free = self._free.setdefault(key, [])
+            if len(free) < self.per_key:
+                free.append(array)
+
+
+class InferenceCache:
+    """
+    Reuse model results for faces that look the same as a recent one.
+    
+    Keeps the last few results keyed by the perceptual hash of the face
+    crop; a crop within max_distance bits of a cached hash and younger
+    than max_age seconds reuses that entry instead of running the model.
+    """
+    
+    def __init__(self, size: int = 16, max_distance: int = 5, max_age: float = 1.0):
+        self._entries = deque(maxlen=size)  # [hash, emotion, liveness, timestamp]
+        self.max_distance = max_distance
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+    
+    def lookup(self, face_hash: int, kind: str):
+        """
+        Find a cached result for a face.
+        
+        Args:
+            face_hash: fast_ops.perceptual_hash of the face crop
+            kind: 'emotion' or 'liveness'
+            
+        Returns:
+            The cached result, or None on a miss
+        """
+        index = 1 if kind == 'emotion' else 2
+        now = time.time()
+        for entry in reversed(self._entries):
+            if now - entry[3] > self.max_age:
+                break
+            if entry[index] is not None and \
+                    fast_ops.hamming_distance(face_hash, entry[0]) <= self.max_distance:
+                self.hits += 1
+                return entry[index]
+        self.misses += 1
+        return None
+    
+    def store(self, face_hash: int, kind: str, result):
+        """Cache a model result for a face."""
+        entry = [face_hash, None, None, time.time()]
+        entry[1 if kind == 'emotion' else 2] = result
+        self._entries.append(entry)
+    
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class Frame:
+    """
+    A camera frame travelling through the detection and recognition threads.
+    
+    Face locations are in full-frame coordinates. Each stage fills in its
+    fields and hands the frame on; the newest finished frame is what the
+    preview draws.
+    """
+    
+    __slots__ = ('timestamp', 'bgr', 'rgb_small', 'detected', 'boxes', 'identities', 'emotions')
+    
+    def __init__(self, bgr: np.ndarray):
+        self.timestamp = time.time()
+        self.bgr = bgr
+        self.rgb_small = None  # Quarter-size RGB copy the face models run on
+        self.detected = False
+        self.boxes = []
+        self.identities = []
+        self.emotions = []
+
+
+EMOTION_EMOJI = {
+    "Happy": "😊", "Sad": "😢", "Angry": "😠",
+    "Surprise": "😮", "Fear": "😨", "Disgust": "🤢",
+    "Neutral": "😐"
+}
+
+# Label suffix per emotion, built once rather than per face per frame
+EMOTION_LABEL = {emotion: f" {emoji} {emotion}" for emotion, emoji in EMOTION_EMOJI.items()}
+
+# Box colors (BGR) for recognized and unknown faces
+KNOWN_COLOR = (0, 255, 0)
+UNKNOWN_COLOR = (0, 0, 255)
+
+
+@functools.lru_cache(maxsize=256)
+def _text_mask(text: str, scale: float, thickness: int):
+    """
+    Rasterize a Hershey label once; cv2.putText redraws every stroke per call.
+    
+    Returns:
+        (mask, ascent, pad): boolean mask of the text pixels, the distance
+        from the mask's top to the baseline and the left padding
+    """
+    (width, height), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)
+    pad = thickness
+    canvas = np.zeros((height + baseline + 2 * pad, width + 2 * pad), dtype=np.uint8)
+    cv2.putText(canvas, text, (pad, height + pad), cv2.FONT_HERSHEY_SIMPLEX, scale, 255, thickness)
+    return canvas.astype(bool), height + pad, pad
+
+
+def draw_text(image: np.ndarray, text: str, org, scale: float, thickness: int, color):
+    """Draw text like cv2.putText (org is the baseline start) from the mask cache."""
+    mask, ascent, pad = _text_mask(text, scale, thickness)
+    top, left = org[1] - ascent, org[0] - pad
+    
+    # Clip the mask to the image
+    y0, x0 = max(top, 0), max(left, 0)
+    y1 = min(top + mask.shape[0], image.shape[0])
+    x1 = min(left + mask.shape[1], image.shape[1])
+    if y1 <= y0 or x1 <= x0:
+        return
+    image[y0:y1, x0:x1][mask[y0 - top:y1 - top, x0 - left:x1 - left]] = color
+
+
 class AdvancedFaceRecognitionApp(ctk.CTk):
     """Advanced Face Recognition Application with cutting-edge features."""
     
@@ -50,24 +401,23 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
         self.geometry("1600x1000")
         self.minsize(1400, 800)
         
-        # Initialize systems
-        self.face_system = FaceRecognitionSystem()
-        self.attendance_system = AttendanceSystem()
-        self.advanced_detector = AdvancedFaceDetector(backend="mediapipe")  # Default to MediaPipe
-        self.liveness_detector = LivenessDetector()
-        self.emotion_recognizer = EmotionRecognizer(model_type="fer")
-        self.emotion_tracker = EmotionTracker()
-        self.analytics = AnalyticsDashboard()
+        # Inference device for detection and emotion models ('auto', 'cpu', 'cuda', 'tensorrt')
+        self.detection_device = "auto"
+        
+        # Initialize light systems; the model-backed ones load on first use (see below)
         self.db_manager = DatabaseManager()
         self.notification_manager = NotificationManager()
         
+        # Compile the per-pixel frame kernels before the camera starts
+        fast_ops.warmup()
+        
         # Settings
         self.camera_index = 0
         self.use_advanced_detection = False
         self.use_liveness_check = False
         self.use_emotion_recognition = True
         self.use_quality_check = True
-        self.detection_backend = "mediapipe"
+        self.detection_backend = "auto"  # opencv_dnn on OpenVINO when available, else MediaPipe
         self.performance_mode = True  # Enable performance optimizations
         
         # Video capture variables
@@ -76,13 +426,98 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
         self.current_mode = None
         self.register_name = ""
         
-        # Frame queue for thread-safe communication
-        self.frame_queue = queue.Queue(maxsize=2)
+        # Single-slot handoff of annotated frames to the Tk thread (see _camera_loop)
+        self.frame_queue = LatestFrameBuffer(maxlen=1)
+        
+        # Raw camera frames, decoded in place, from the capture thread to the preview thread
+        self.capture_ring = FrameRing()
+        
+        # Frames waiting for the detection and recognition threads, and the
+        # newest fully processed one (drawn on every preview frame)
+        self.detection_inbox = LatestFrameBuffer(maxlen=1)
+        self.recognition_inbox = LatestFrameBuffer(maxlen=1)
+        self.latest_result: Optional[Frame] = None
+        
+        # Face crops waiting for the emotion thread, as (crops, tracks, names);
+        # a newer batch replaces one the thread has not started on
+        self.emotion_inbox = LatestFrameBuffer(maxlen=1)
+        
+        # Reused buffers for per-frame copies and resizes (see MatPool)
+        self._matpool = MatPool()
+        
+        # Events for _handle_result; when full the oldest is dropped (see _post_result)
         self.result_queue = queue.Queue(maxsize=10)
         
+        # (results, stats) of finished batch registrations, merged on the Tk
+        # thread by _update_ui; kept apart so they are never dropped
+        self._batch_results = deque()
+        
+        # Set while a quality_skipped event is queued, so a burst of skips queues one
+        self._skip_event_pending = threading.Event()
+        
+        # Set while an _update_ui call is queued on the Tk thread (see _request_ui_update)
+        self._ui_update_pending = threading.Event()
+        self._last_ui_update = 0.0
+        
+        # Stop event of the current camera run, set by _stop_camera; camera
+        # threads wait on it instead of sleeping. Each run gets a new one
+        self._stop_evt = threading.Event()
+        self._camera_threads: List[threading.Thread] = []
+        
+        # Skips emotion/liveness inference for faces that have not changed
+        self.inference_cache = InferenceCache()
+        
+        # Faces whose emotion inference was skipped by the quality gate
+        self._quality_skips = 0
+        
+        # Caps how many model calls run at once (see _reset_model_slots)
+        self._reset_model_slots()
+        
         # Current preview label reference
         self.current_preview_label = None
         
+        # Today's date for file names and the attendance log, refreshed every minute
+        self._tick_clock()
+        
+        # Pages are built once and then hidden/shown (see _show_page)
+        self._pages = {}
+        self._current_page = None
+        
+        # How much of attendance.csv the attendance log has shown (see _refresh_attendance_log)
+        self._attendance_log_date = None
+        self._attendance_log_offset = 0
+        self._attendance_log_rows = 0
+        
+        # Preview pixels are written into one buffer and pasted into one PhotoImage
+        self._preview_buf = None
+        self._preview_photo = None
+        self._preview_target = None
+        
+        # Every font the UI uses, created once and shared by all widgets
+        self.fonts = {
+            (size, weight): ctk.CTkFont(size=size, weight=weight)
+            for size, weight in (
+                (11, "normal"),
+                (12, "normal"),
+                (13, "bold"),
+                (13, "normal"),
+                (14, "bold"),
+                (14, "normal"),
+                (15, "bold"),
+                (16, "bold"),
+                (20, "bold"),
+                (24, "bold"),
+                (28, "bold"),
+                (30, "bold"),
+                (30, "normal"),
+                (36, "bold"),
+                (48, "bold"),
+            )
+        }
+        
+        # Registered face counts for the status bar (see _refresh_face_counts)
+        self._refresh_face_counts()
+        
         # Setup notification callback
         self.notification_manager.set_toast_callback(self._show_ui_toast)
         
@@ -94,8 +529,9 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
         # Show home page by default
         self._show_home()
         
-        # Start UI update loop
-        self._schedule_ui_update()
+        # Load what every camera page needs while the user looks at the home page;
+        # the models are loaded when a page that uses them is opened
+        self._warm_up_subsystems("face_system", "attendance_system")
         
         # Auto-backup on startup
         self.db_manager.auto_backup(max_backups=10)
@@ -103,6 +539,78 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
         # Bind close event
         self.protocol("WM_DELETE_WINDOW", self._on_closing)
     
+    # ==================== LAZY SUBSYSTEMS ====================
+    @lazy_subsystem
+    def face_system(self):
+        from face_recognition_system import FaceRecognitionSystem
+        return FaceRecognitionSystem(encodings_file=str(self.db_manager.encodings_file), half_precision=True)
+    
+    @lazy_subsystem
+    def attendance_system(self):
+        from attendance_system import AttendanceSystem
+        return AttendanceSystem(encodings_file=str(self.db_manager.encodings_file))
+    
+    @lazy_subsystem
+    def advanced_detector(self):
+        from advanced_detection import AdvancedFaceDetector, opencv_dnn_preferred
+        backend = self.detection_backend
+        if backend == "auto":
+            backend = "opencv_dnn" if opencv_dnn_preferred() else "mediapipe"
+        return AdvancedFaceDetector(backend=backend, device=self.detection_device)
+    
+    @lazy_subsystem
+    def liveness_detector(self):
+        from liveness_detection import LivenessDetector
+        return LivenessDetector()
+    
+    @lazy_subsystem
+    def emotion_recognizer(self):
+        from emotion_recognition import EmotionRecognizer
+        return EmotionRecognizer(model_type="fer", device=self.detection_device)
+    
+    @lazy_subsystem
+    def emotion_tracker(self):
+        from emotion_recognition import EmotionTracker
+        return EmotionTracker()
+    
+    @lazy_subsystem
+    def analytics(self):
+        from analytics import AnalyticsDashboard
+        return AnalyticsDashboard()
+    
+    def _warm_up_subsystems(self, *names: str):
+        """Build lazy subsystems on a background thread so the page using them opens fast."""
+        def load():
+            for name in names:
+                try:
+                    getattr(self, name)
+                except Exception as e:
+                    print(f"Failed to load {name}: {e}")
+        
+        threading.Thread(target=load, daemon=True).start()
+    
+    def _warm_up_emotion(self):
+        """Start loading the emotion model if the camera pages will use it."""
+        if self.use_emotion_recognition and 'emotion_recognizer' not in self.__dict__:
+            self._warm_up_subsystems("emotion_recognizer", "emotion_tracker")
+    
+    def _refresh_face_counts(self):
+        """Recount registered faces; call after anything that changes the database."""
+        known_names = self._known_face_names()
+        self._name_counts = Counter(known_names)
+        self._total_faces_count = len(known_names)
+        self._unique_persons_count = len(self._name_counts)
+    
+    def _known_face_names(self) -> list:
+        """Registered names, from the encodings sidecar until face_system has loaded."""
+        if "face_system" in self.__dict__:
+            return self.face_system.known_face_names
+        names = read_names_sidecar(self.db_manager.encodings_file)
+        if names is None:
+            # Missing or written for another version of the database
+            return self.face_system.known_face_names
+        return names
+    
     def _create_sidebar(self):
         """Create enhanced sidebar with navigation."""
         self.sidebar = ctk.CTkFrame(self, width=240, corner_radius=0, fg_color="#1a1a2e")
@@ -113,7 +621,7 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
         self.logo_label = ctk.CTkLabel(
             self.sidebar,
             text="🚀 Face AI\nv2.0",
-            font=ctk.CTkFont(size=30, weight="bold"),
+            font=self.fonts[30, "bold"],
             text_color="#00d4ff"
         )
         self.logo_label.pack(pady=(30, 40))
@@ -135,7 +643,7 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
             btn = ctk.CTkButton(
                 self.sidebar,
                 text=text,
-                font=ctk.CTkFont(size=15, weight="bold"),
+                font=self.fonts[15, "bold"],
                 height=45,
                 corner_radius=10,
                 fg_color="#16213e",
@@ -162,7 +670,7 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
         self.status_label = ctk.CTkLabel(
             self.status_bar,
             text="🟢 Ready",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=self.fonts[13, "bold"],
             text_color="#00d4ff"
         )
         self.status_label.pack(side="left", padx=20)
@@ -170,29 +678,60 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
         # System info
         self.info_label = ctk.CTkLabel(
             self.status_bar,
-            text=f"👤 {len(self.face_system.known_face_names)} faces | "
-                 f"📊 {len(set(self.face_system.known_face_names))} persons | "
+            text=f"👤 {self._total_faces_count} faces | "
+                 f"📊 {self._unique_persons_count} persons | "
                  f"🔔 Notifications: ON",
-            font=ctk.CTkFont(size=12),
+            font=self.fonts[12, "normal"],
             text_color="#a0a0a0"
         )
         self.info_label.pack(side="right", padx=20)
     
-    def _clear_main_frame(self):
-        """Clear main content area."""
+    def _hide_current_page(self):
+        """Stop the camera and hide the page currently shown."""
         self._stop_camera()
         self.current_preview_label = None
-        for widget in self.main_frame.winfo_children():
-            if widget != self.status_bar:
-                widget.destroy()
+        if self._current_page is not None:
+            self._pages[self._current_page][0].pack_forget()
+            self._current_page = None
+    
+    def _show_page(self, name: str, build, refresh=None):
+        """
+        Show a page, building its widgets only on the first visit.
+        
+        Args:
+            name: Page key in self._pages
+            build: Creates the page and returns (root frame, pack options)
+            refresh: Updates the page's dynamic content (optional)
+        """
+        self._hide_current_page()
+        if name not in self._pages:
+            self._pages[name] = build()
+        frame, pack_options = self._pages[name]
+        frame.pack(fill="both", expand=True, **pack_options)
+        self._current_page = name
+        if refresh is not None:
+            refresh()
+    
+    @staticmethod
+    def _set_label_text(label, text: str):
+        """Set a label's text, skipping the Tk round trip when it is unchanged."""
+        if label.cget("text") != text:
+            label.configure(text=text)
     
     def _update_status(self, message: str, icon: str = "🟢"):
         """Update status bar with icon."""
-        self.status_label.configure(text=f"{icon} {message}")
-        self.info_label.configure(
-            text=f"👤 {len(self.face_system.known_face_names)} faces | "
-                 f"📊 {len(set(self.face_system.known_face_names))} persons | "
-                 f"🔔 Notifications: {'ON' if self.notification_manager.toast_enabled else 'OFF'}"
+        self._set_label_text(self.status_label, f"{icon} {message}")
+        self._update_info_label()
+    
+    def _update_info_label(self):
+        """Refresh the system info on the right of the status bar."""
+        self._set_label_text(
+            self.info_label,
+            f"👤 {self._total_faces_count} faces | "
+            f"📊 {self._unique_persons_count} persons | "
+            f"🔔 Notifications: {'ON' if self.notification_manager.toast_enabled else 'OFF'} | "
+            f"⚡ Cache hits: {self.inference_cache.hit_rate:.0%} | "
+            f"⏭️ Low-quality skips: {self._quality_skips}"
         )
     
     def _show_ui_toast(self, title: str, message: str, notification_type: str):
@@ -206,11 +745,12 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
     # ==================== ENHANCED HOME PAGE ====================
     def _show_home(self):
         """Show enhanced home page with system overview."""
-        self._clear_main_frame()
+        self._show_page("home", self._build_home_page, self._refresh_home_page)
         self._update_status("Home Dashboard")
-        
+    
+    def _build_home_page(self):
+        """Create the home page widgets."""
         content = ctk.CTkScrollableFrame(self.main_frame, fg_color="transparent")
-        content.pack(fill="both", expand=True, padx=30, pady=30)
         
         # Welcome header
         header = ctk.CTkFrame(content, fg_color="#1a1a2e", corner_radius=15)
@@ -219,14 +759,14 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
         ctk.CTkLabel(
             header,
             text="🚀 Advanced Face Recognition System",
-            font=ctk.CTkFont(size=36, weight="bold"),
+            font=self.fonts[36, "bold"],
             text_color="#00d4ff"
         ).pack(pady=20)
         
         ctk.CTkLabel(
             header,
             text="Powered by AI • Multi-Model Detection • Liveness Check • Emotion Recognition",
-            font=ctk.CTkFont(size=14),
+            font=self.fonts[14, "normal"],
             text_color="#a0a0a0"
         ).pack(pady=(0, 20))
         
@@ -234,32 +774,32 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
         stats_frame = ctk.CTkFrame(content, fg_color="transparent")
         stats_frame.pack(fill="x", pady=20)
         
-        daily_stats = self.analytics.get_daily_statistics()
-        weekly_stats = self.analytics.get_weekly_statistics()
-        
         stats = [
-            ("👤 Registered Faces", len(self.face_system.known_face_names), "#4CAF50"),
-            ("👥 Unique Persons", len(set(self.face_system.known_face_names)), "#2196F3"),
-            ("✅ Today's Attendance", daily_stats['unique_people'], "#FF9800"),
-            ("📅 Weekly Total", weekly_stats['unique_people'], "#9C27B0"),
+            ("👤 Registered Faces", "#4CAF50"),
+            ("👥 Unique Persons", "#2196F3"),
+            ("✅ Today's Attendance", "#FF9800"),
+            ("📅 Weekly Total", "#9C27B0"),
         ]
         
-        for i, (label, value, color) in enumerate(stats):
+        self.home_stat_labels = []
+        for i, (label, color) in enumerate(stats):
             card = ctk.CTkFrame(stats_frame, fg_color="#16213e", corner_radius=12)
             card.grid(row=0, column=i, padx=10, pady=10, sticky="nsew")
             stats_frame.grid_columnconfigure(i, weight=1)
             
-            ctk.CTkLabel(
+            value_label = ctk.CTkLabel(
                 card,
-                text=str(value),
-                font=ctk.CTkFont(size=48, weight="bold"),
+                text="",
+                font=self.fonts[48, "bold"],
                 text_color=color
-            ).pack(pady=(25, 5))
+            )
+            value_label.pack(pady=(25, 5))
+            self.home_stat_labels.append(value_label)
             
             ctk.CTkLabel(
                 card,
                 text=label,
-                font=ctk.CTkFont(size=13),
+                font=self.fonts[13, "normal"],
                 text_color="#a0a0a0"
             ).pack(pady=(0, 25))
         
@@ -270,7 +810,7 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
         ctk.CTkLabel(
             features_frame,
             text="✨ Advanced Features",
-            font=ctk.CTkFont(size=20, weight="bold"),
+            font=self.fonts[20, "bold"],
             text_color="#00d4ff"
         ).pack(pady=(20, 10))
         
@@ -294,28 +834,41 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
             card.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
             features_grid.grid_columnconfigure(col, weight=1)
             
-            ctk.CTkLabel(card, text=icon, font=ctk.CTkFont(size=30)).pack(pady=(15, 5))
-            ctk.CTkLabel(card, text=title, font=ctk.CTkFont(size=14, weight="bold")).pack()
+            ctk.CTkLabel(card, text=icon, font=self.fonts[30, "normal"]).pack(pady=(15, 5))
+            ctk.CTkLabel(card, text=title, font=self.fonts[14, "bold"]).pack()
             ctk.CTkLabel(
                 card,
                 text=desc,
-                font=ctk.CTkFont(size=11),
+                font=self.fonts[11, "normal"],
                 text_color="#808080"
             ).pack(pady=(5, 15))
+        
+        return content, {"padx": 30, "pady": 30}
+    
+    def _refresh_home_page(self):
+        """Update the statistics cards."""
+        daily_stats = self.analytics.get_daily_statistics()
+        weekly_stats = self.analytics.get_weekly_statistics()
+        
+        values = (self._total_faces_count, self._unique_persons_count,
+                  daily_stats['unique_people'], weekly_stats['unique_people'])
+        for value_label, value in zip(self.home_stat_labels, values):
+            value_label.configure(text=str(value))
     
     # ==================== ANALYTICS PAGE ====================
     def _show_analytics(self):
         """Show advanced analytics dashboard."""
-        self._clear_main_frame()
+        self._show_page("analytics", self._build_analytics_page, self._refresh_analytics_page)
         self._update_status("Analytics Dashboard", "📊")
-        
+    
+    def _build_analytics_page(self):
+        """Create the analytics page widgets."""
         content = ctk.CTkScrollableFrame(self.main_frame, fg_color="transparent")
-        content.pack(fill="both", expand=True, padx=30, pady=30)
         
         ctk.CTkLabel(
             content,
             text="📊 Analytics & Insights",
-            font=ctk.CTkFont(size=28, weight="bold"),
+            font=self.fonts[28, "bold"],
             text_color="#00d4ff"
         ).pack(pady=(0, 20))
         
@@ -323,17 +876,13 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
         stats_frame = ctk.CTkFrame(content, fg_color="#1a1a2e", corner_radius=12)
         stats_frame.pack(fill="x", pady=10)
         
-        daily = self.analytics.get_daily_statistics()
-        weekly = self.analytics.get_weekly_statistics()
-        
-        ctk.CTkLabel(
+        self.analytics_stats_label = ctk.CTkLabel(
             stats_frame,
-            text=f"Today: {daily['unique_people']} people | "
-                 f"This Week: {weekly['unique_people']} people | "
-                 f"Peak Hour: {daily.get('peak_hour', 'N/A')}:00",
-            font=ctk.CTkFont(size=14),
+            text="",
+            font=self.fonts[14, "normal"],
             text_color="#a0a0a0"
-        ).pack(pady=15)
+        )
+        self.analytics_stats_label.pack(pady=15)
         
         # Visualization buttons
         viz_frame = ctk.CTkFrame(content, fg_color="#16213e", corner_radius=12)
@@ -342,7 +891,7 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
         ctk.CTkLabel(
             viz_frame,
             text="Generate Visualizations",
-            font=ctk.CTkFont(size=16, weight="bold")
+            font=self.fonts[16, "bold"]
         ).pack(pady=15)
         
         btn_frame = ctk.CTkFrame(viz_frame, fg_color="transparent")
@@ -360,7 +909,7 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
                 btn_frame,
                 text=text,
                 command=cmd,
-                font=ctk.CTkFont(size=14),
+                font=self.fonts[14, "normal"],
                 height=40,
                 fg_color="#00d4ff",
                 text_color="#000000",
@@ -375,29 +924,41 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
         ctk.CTkLabel(
             details_frame,
             text="Weekly Breakdown",
-            font=ctk.CTkFont(size=16, weight="bold")
+            font=self.fonts[16, "bold"]
         ).pack(pady=15)
         
-        self.analytics_text = ctk.CTkTextbox(details_frame, height=300, font=ctk.CTkFont(size=12))
+        self.analytics_text = ctk.CTkTextbox(details_frame, height=300, font=self.fonts[12, "normal"])
         self.analytics_text.pack(padx=20, pady=(0, 20), fill="both", expand=True)
         
+        return content, {"padx": 30, "pady": 30}
+    
+    def _refresh_analytics_page(self):
+        """Update the quick stats and the weekly breakdown."""
+        daily = self.analytics.get_daily_statistics()
+        weekly = self.analytics.get_weekly_statistics()
+        
+        self.analytics_stats_label.configure(
+            text=f"Today: {daily['unique_people']} people | "
+                 f"This Week: {weekly['unique_people']} people | "
+                 f"Peak Hour: {daily.get('peak_hour', 'N/A')}:00"
+        )
+        
+        self.analytics_text.delete("1.0", "end")
+        
         # Display weekly breakdown
         breakdown = weekly.get('daily_breakdown', {})
-        for date, stats in sorted(breakdown.items(), reverse=True):
-            self.analytics_text.insert(
-                "end",
-                f"📅 {date}: {stats['unique_people']} people, {stats['total_records']} records\n"
-            )
-        
-        if not breakdown:
-            self.analytics_text.insert("end", "No data available for the past week.")
+        lines = [
+            f"📅 {date}: {stats['unique_people']} people, {stats['total_records']} records\n"
+            for date, stats in sorted(breakdown.items(), reverse=True)
+        ]
+        self.analytics_text.insert("end", "".join(lines) or "No data available for the past week.")
     
     def _generate_plot(self, plot_type: str):
         """Generate and save analytics plots."""
         save_path = filedialog.asksaveasfilename(
             defaultextension=".png",
             filetypes=[("PNG files", "*.png")],
-            initialfile=f"analytics_{plot_type}_{datetime.now().strftime('%Y%m%d')}.png"
+            initialfile=f"analytics_{plot_type}_{self._today_str}.png"
         )
         
         if save_path:
@@ -422,7 +983,7 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
         save_path = filedialog.asksaveasfilename(
             defaultextension=".json",
             filetypes=[("JSON files", "*.json")],
-            initialfile=f"report_{datetime.now().strftime('%Y%m%d')}.json"
+            initialfile=f"report_{self._today_str}.json"
         )
         
         if save_path:
@@ -432,32 +993,31 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
     # ==================== BACKUP PAGE ====================
     def _show_backup(self):
         """Show database backup and management page."""
-        self._clear_main_frame()
+        self._show_page("backup", self._build_backup_page, self._refresh_backup_page)
         self._update_status("Database Management", "💾")
-        
+    
+    def _build_backup_page(self):
+        """Create the backup page widgets."""
         content = ctk.CTkScrollableFrame(self.main_frame, fg_color="transparent")
-        content.pack(fill="both", expand=True, padx=30, pady=30)
         
         ctk.CTkLabel(
             content,
             text="💾 Database Management",
-            font=ctk.CTkFont(size=28, weight="bold"),
+            font=self.fonts[28, "bold"],
             text_color="#00d4ff"
         ).pack(pady=(0, 20))
         
         # Database stats
-        stats = self.db_manager.get_database_stats()
         stats_frame = ctk.CTkFrame(content, fg_color="#1a1a2e", corner_radius=12)
         stats_frame.pack(fill="x", pady=10)
         
-        ctk.CTkLabel(
+        self.backup_stats_label = ctk.CTkLabel(
             stats_frame,
-            text=f"Database: {stats.get('size_mb', 0):.2f} MB | "
-                 f"{stats.get('total_faces', 0)} faces | "
-                 f"Last Modified: {stats.get('last_modified', 'N/A')[:19]}",
-            font=ctk.CTkFont(size=13),
+            text="",
+            font=self.fonts[13, "normal"],
             text_color="#a0a0a0"
-        ).pack(pady=15)
+        )
+        self.backup_stats_label.pack(pady=15)
         
         # Backup controls
         backup_frame = ctk.CTkFrame(content, fg_color="#16213e", corner_radius=12)
@@ -466,7 +1026,7 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
         ctk.CTkLabel(
             backup_frame,
             text="Backup Operations",
-            font=ctk.CTkFont(size=16, weight="bold")
+            font=self.fonts[16, "bold"]
         ).pack(pady=15)
         
         btn_grid = ctk.CTkFrame(backup_frame, fg_color="transparent")
@@ -486,7 +1046,7 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
                 text=text,
                 command=cmd,
                 height=40,
-                font=ctk.CTkFont(size=14),
+                font=self.fonts[14, "normal"],
                 fg_color="#00d4ff",
                 text_color="#000000",
                 hover_color="#00b4d8"
@@ -500,42 +1060,70 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
         ctk.CTkLabel(
             list_frame,
             text="Available Backups",
-            font=ctk.CTkFont(size=16, weight="bold")
+            font=self.fonts[16, "bold"]
         ).pack(pady=15)
         
-        self.backup_list = ctk.CTkTextbox(list_frame, height=250, font=ctk.CTkFont(size=12))
+        self.backup_list = ctk.CTkTextbox(list_frame, height=250, font=self.fonts[12, "normal"])
         self.backup_list.pack(padx=20, pady=(0, 20), fill="both", expand=True)
         
-        self._refresh_backup_list()
+        return content, {"padx": 30, "pady": 30}
+    
+    def _refresh_backup_page(self):
+        """Update the database stats and the backup list."""
+        stats = self.db_manager.get_database_stats()
+        self.backup_stats_label.configure(
+            text=f"Database: {stats.get('size_mb', 0):.2f} MB | "
+                 f"{stats.get('total_faces', 0)} faces | "
+                 f"Last Modified: {stats.get('last_modified', 'N/A')[:19]}"
+        )
+        # Creating or deleting a backup bumps the folder's mtime; skip the rescan otherwise
+        if self.db_manager.backup_dir_stamp() != getattr(self, '_backup_dir_stamp', None):
+            self._refresh_backup_list()
+    
+    @staticmethod
+    def _backup_line(backup: dict) -> str:
+        """One line of the backup list."""
+        return f"📦 {backup['filename']} - {backup['size_mb']:.2f} MB - {backup['created'][:19]}\n"
     
     def _refresh_backup_list(self):
-        """Refresh the backup list display."""
+        """Rescan the backup folder and redraw the whole backup list."""
         if hasattr(self, 'backup_list'):
+            self._backup_dir_stamp = self.db_manager.backup_dir_stamp()
+            self._backup_entries = self.db_manager.list_backups()
             self.backup_list.delete("1.0", "end")
-            backups = self.db_manager.list_backups()
-            
-            for backup in backups:
-                self.backup_list.insert(
-                    "end",
-                    f"📦 {backup['filename']} - {backup['size_mb']:.2f} MB - {backup['created'][:19]}\n"
-                )
-            
-            if not backups:
-                self.backup_list.insert("end", "No backups found.")
+            self.backup_list.insert(
+                "end",
+                "".join(map(self._backup_line, self._backup_entries)) or "No backups found."
+            )
+    
+    def _add_new_backups(self):
+        """Put backups created since the last scan at the top of the list."""
+        if not getattr(self, '_backup_entries', None):
+            self._refresh_backup_list()
+            return
+        
+        new_entries = self.db_manager.list_backups(after=self._backup_entries[0]['filename'])
+        if new_entries:
+            self._backup_entries[:0] = new_entries
+            self.backup_list.insert("1.0", "".join(map(self._backup_line, new_entries)))
     
     def _create_backup(self):
         """Create a new backup."""
+        # create_backup hands back the latest backup when nothing changed since
+        previous = self.db_manager.latest_backup()
         backup_path = self.db_manager.create_backup()
-        if backup_path:
+        if backup_path and previous is not None and backup_path == str(previous):
+            self.notification_manager.show_toast("Info", "Database unchanged, latest backup kept", "info")
+        elif backup_path:
             self.notification_manager.show_toast("Success", "Backup created", "success")
-            self._refresh_backup_list()
+            self._add_new_backups()
     
     def _export_to_json(self):
         """Export database to JSON."""
         save_path = filedialog.asksaveasfilename(
             defaultextension=".json",
             filetypes=[("JSON files", "*.json")],
-            initialfile=f"face_db_{datetime.now().strftime('%Y%m%d')}.json"
+            initialfile=f"face_db_{self._today_str}.json"
         )
         
         if save_path:
@@ -547,12 +1135,17 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
         save_path = filedialog.asksaveasfilename(
             defaultextension=".db",
             filetypes=[("SQLite files", "*.db")],
-            initialfile=f"face_db_{datetime.now().strftime('%Y%m%d')}.db"
+            initialfile=f"face_db_{self._today_str}.db"
         )
         
         if save_path:
-            if self.db_manager.export_to_sqlite(save_path):
-                self.notification_manager.show_toast("Success", "Exported to SQLite", "success")
+            self._update_status("Exporting to SQLite...", "⏳")
+            threading.Thread(
+                target=lambda: self._post_result(
+                    "export_sqlite_done", self.db_manager.export_to_sqlite(save_path)
+                ),
+                daemon=True
+            ).start()
     
     def _import_from_json(self):
         """Import database from JSON."""
@@ -563,10 +1156,13 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
         
         if file_path:
             merge = messagebox.askyesno("Import Mode", "Merge with existing data?\n(No = Replace)")
-            if self.db_manager.import_from_json(file_path, merge=merge):
-                self.face_system.load_encodings()  # Reload
-                self.notification_manager.show_toast("Success", "Import complete", "success")
-                self._update_status("Database imported", "✅")
+            self._update_status("Importing database...", "⏳")
+            threading.Thread(
+                target=lambda: self._post_result(
+                    "import_done", self.db_manager.import_from_json(file_path, merge=merge)
+                ),
+                daemon=True
+            ).start()
     
     def _restore_backup(self):
         """Restore from a backup file."""
@@ -579,18 +1175,20 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
             if messagebox.askyesno("Confirm", "Restore from this backup?"):
                 if self.db_manager.restore_backup(file_path):
                     self.face_system.load_encodings()  # Reload
+                    self._refresh_face_counts()
                     self.notification_manager.show_toast("Success", "Restore complete", "success")
     
     # ==================== ENHANCED PAGES ====================
     def _show_register(self):
         """Enhanced registration page with quality check."""
-        self._clear_main_frame()
+        self._show_page("register", self._build_register_page)
         self._update_status("Face Registration", "📝")
-        
+    
+    def _build_register_page(self):
+        """Create the registration page widgets."""
         content = ctk.CTkFrame(self.main_frame, fg_color="transparent")
-        content.pack(fill="both", expand=True, padx=20, pady=20)
         
-        ctk.CTkLabel(content, text="Register New Face", font=ctk.CTkFont(size=24, weight="bold"), text_color="#00d4ff").pack(pady=(10, 20))
+        ctk.CTkLabel(content, text="Register New Face", font=self.fonts[24, "bold"], text_color="#00d4ff").pack(pady=(10, 20))
         
         # Two-column layout
         columns = ctk.CTkFrame(content, fg_color="transparent")
@@ -602,7 +1200,7 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
         preview_frame = ctk.CTkFrame(columns, fg_color="#1a1a2e")
         preview_frame.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
         
-        ctk.CTkLabel(preview_frame, text="Preview", font=ctk.CTkFont(size=16, weight="bold")).pack(pady=10)
+        ctk.CTkLabel(preview_frame, text="Preview", font=self.fonts[16, "bold"]).pack(pady=10)
         
         self.register_preview = ctk.CTkLabel(preview_frame, text="Click 'Start Camera' to begin", width=600, height=450)
         self.register_preview.pack(padx=20, pady=10)
@@ -620,17 +1218,19 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
         form_frame = ctk.CTkFrame(columns, fg_color="#1a1a2e")
         form_frame.grid(row=0, column=1, padx=10, pady=10, sticky="nsew")
         
-        ctk.CTkLabel(form_frame, text="Registration Details", font=ctk.CTkFont(size=16, weight="bold")).pack(pady=10)
+        ctk.CTkLabel(form_frame, text="Registration Details", font=self.fonts[16, "bold"]).pack(pady=10)
         
         ctk.CTkLabel(form_frame, text="Person's Name:").pack(pady=(20, 5))
         self.name_entry = ctk.CTkEntry(form_frame, width=250, placeholder_text="Enter name")
         self.name_entry.pack(pady=5)
         
-        ctk.CTkLabel(form_frame, text="Registration Method:", font=ctk.CTkFont(size=14)).pack(pady=(30, 10))
+        ctk.CTkLabel(form_frame, text="Registration Method:", font=self.fonts[14, "normal"]).pack(pady=(30, 10))
         
         ctk.CTkButton(form_frame, text="📸 Capture from Camera", width=250, command=self._capture_face, fg_color="#00d4ff", text_color="#000000").pack(pady=10)
         ctk.CTkButton(form_frame, text="📁 Upload Image", width=250, command=self._upload_image_for_registration, fg_color="#00d4ff", text_color="#000000").pack(pady=10)
         ctk.CTkButton(form_frame, text="📂 Batch Register", width=250, command=self._batch_register, fg_color="#00d4ff", text_color="#000000").pack(pady=10)
+        
+        return content, {"padx": 20, "pady": 20}
     
     def _capture_face(self):
         """Capture face from camera for registration."""
@@ -658,6 +1258,7 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
         
         if file_path:
             if self.face_system.register_face_from_image(file_path, name):
+                self._refresh_face_counts()
                 messagebox.showinfo("Success", f"Successfully registered {name}!")
                 self.notification_manager.show_toast("Success", f"Registered {name}", "success")
                 self._update_status(f"Registered: {name}", "✅")
@@ -669,22 +1270,52 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
         folder_path = filedialog.askdirectory(title="Select Folder with Person Subfolders")
         
         if folder_path:
-            from register_faces_from_folder import register_faces_from_folder
-            stats = register_faces_from_folder(folder_path, self.face_system)
+            from register_faces_from_folder import encode_faces_from_folder
+            
+            def progress(done, total, name):
+                self._post_result("batch_register_progress", f"Batch registering... {done}/{total} ({name})")
             
-            if stats:
-                messagebox.showinfo("Complete", f"Processed: {stats['total_images']}\nSuccessful: {stats['successful']}\nFailed: {stats['failed']}")
-                self._update_status(f"Batch registered {stats['successful']} faces", "✅")
+            def run():
+                # Only encodes; the results are added to the database on the Tk thread
+                try:
+                    result = encode_faces_from_folder(folder_path, self.face_system, progress=progress)
+                except Exception as e:
+                    print(f"Batch registration error: {e}")
+                    result = ([], None)
+                self._batch_results.append(result)
+                self._request_ui_update()
+            
+            # Encoding runs in worker processes; this thread only waits for them
+            self._update_status("Batch registering...", "⏳")
+            threading.Thread(target=run, daemon=True).start()
+    
+    def _finish_batch_register(self, results, stats):
+        """Add a finished batch registration to the database (Tk thread)."""
+        from register_faces_from_folder import add_encoded_faces
+        
+        try:
+            add_encoded_faces(self.face_system, results)
+        except Exception as e:
+            print(f"Batch registration save error: {e}")
+            stats = None
+        self._refresh_face_counts()
+        if stats:
+            messagebox.showinfo("Complete", f"Processed: {stats['total_images']}\nSuccessful: {stats['successful']}\nFailed: {stats['failed']}")
+            self._update_status(f"Batch registered {stats['successful']} faces", "✅")
+        else:
+            self._update_status("Batch registration failed", "❌")
     
     def _show_recognize(self):
         """Enhanced recognition page with emotion detection."""
-        self._clear_main_frame()
+        self._show_page("recognize", self._build_recognize_page)
         self._update_status("Face Recognition", "🔍")
-        
+        self._warm_up_emotion()
+    
+    def _build_recognize_page(self):
+        """Create the recognition page widgets."""
         content = ctk.CTkFrame(self.main_frame, fg_color="transparent")
-        content.pack(fill="both", expand=True, padx=20, pady=20)
         
-        ctk.CTkLabel(content, text="Face Recognition", font=ctk.CTkFont(size=24, weight="bold"), text_color="#00d4ff").pack(pady=(10, 20))
+        ctk.CTkLabel(content, text="Face Recognition", font=self.fonts[24, "bold"], text_color="#00d4ff").pack(pady=(10, 20))
         
         self.recognize_preview = ctk.CTkLabel(content, text="Click 'Start Recognition' to begin", width=800, height=600, fg_color="#1a1a2e")
         self.recognize_preview.pack(pady=10)
@@ -699,6 +1330,8 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
         self.btn_stop_recognize.pack(side="left", padx=10)
         
         ctk.CTkButton(controls, text="📁 From Image", command=self._recognize_from_image).pack(side="left", padx=10)
+        
+        return content, {"padx": 20, "pady": 20}
     
     def _recognize_from_image(self):
         """Recognize faces from an uploaded image."""
@@ -716,9 +1349,9 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
                 
                 image = cv2.imread(file_path)
                 for name, (top, right, bottom, left) in results:
-                    color = (0, 255, 0) if name != "Unknown" else (0, 0, 255)
+                    color = KNOWN_COLOR if name != "Unknown" else UNKNOWN_COLOR
                     cv2.rectangle(image, (left, top), (right, bottom), color, 2)
-                    cv2.putText(image, name, (left, top - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.8, color, 2)
+                    draw_text(image, name, (left, top - 10), 0.8, 2, color)
                 
                 if hasattr(self, 'recognize_preview'):
                     self._display_image(image, self.recognize_preview)
@@ -727,13 +1360,15 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
     
     def _show_attendance(self):
         """Enhanced attendance tracking page."""
-        self._clear_main_frame()
+        self._show_page("attendance", self._build_attendance_page, self._refresh_attendance_log)
         self._update_status("Attendance System", "📋")
-        
+        self._warm_up_emotion()
+    
+    def _build_attendance_page(self):
+        """Create the attendance page widgets."""
         content = ctk.CTkFrame(self.main_frame, fg_color="transparent")
-        content.pack(fill="both", expand=True, padx=20, pady=20)
         
-        ctk.CTkLabel(content, text="Attendance Tracking", font=ctk.CTkFont(size=24, weight="bold"), text_color="#00d4ff").pack(pady=(10, 20))
+        ctk.CTkLabel(content, text="Attendance Tracking", font=self.fonts[24, "bold"], text_color="#00d4ff").pack(pady=(10, 20))
         
         columns = ctk.CTkFrame(content, fg_color="transparent")
         columns.pack(fill="both", expand=True)
@@ -760,38 +1395,60 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
         log_frame = ctk.CTkFrame(columns, fg_color="#1a1a2e")
         log_frame.grid(row=0, column=1, padx=10, pady=10, sticky="nsew")
         
-        ctk.CTkLabel(log_frame, text="Today's Attendance", font=ctk.CTkFont(size=16, weight="bold")).pack(pady=10)
+        ctk.CTkLabel(log_frame, text="Today's Attendance", font=self.fonts[16, "bold"]).pack(pady=10)
         
         self.attendance_log = ctk.CTkTextbox(log_frame, width=350, height=300)
         self.attendance_log.pack(padx=20, pady=10)
-        self._refresh_attendance_log()
         
         btn_frame = ctk.CTkFrame(log_frame, fg_color="transparent")
         btn_frame.pack(pady=10)
         
         ctk.CTkButton(btn_frame, text="🔄 Refresh", command=self._refresh_attendance_log).pack(side="left", padx=5)
         ctk.CTkButton(btn_frame, text="📁 Export", command=self._export_attendance).pack(side="left", padx=5)
+        
+        return content, {"padx": 20, "pady": 20}
     
     def _refresh_attendance_log(self):
-        """Refresh the attendance log display."""
+        """Refresh the attendance log display.
+        
+        attendance.csv is append-only, so only the bytes added since the
+        last refresh are parsed and today's new rows are appended to the
+        log in one insert. The log is rebuilt on a new day or when the file
+        shrinks (replaced or truncated).
+        """
         try:
             if not hasattr(self, 'attendance_log'):
                 return
             
-            self.attendance_log.delete("1.0", "end")
-            today = datetime.now().strftime("%Y-%m-%d")
+            today = self._today_iso
             attendance_file = Path("attendance.csv")
+            size = attendance_file.stat().st_size if attendance_file.exists() else 0
+            
+            if today != self._attendance_log_date or size < self._attendance_log_offset:
+                self._attendance_log_date = today
+                self._attendance_log_offset = 0
+                self._attendance_log_rows = 0
             
-            if attendance_file.exists():
-                with open(attendance_file, 'r', newline='', encoding='utf-8') as f:
-                    reader = csv.reader(f)
-                    next(reader, None)
-                    for row in reader:
-                        if len(row) >= 4 and row[1] == today:
-                            self.attendance_log.insert("end", f"{row[2]} - {row[0]} ({row[3]})\n")
+            lines = []
+            if size > self._attendance_log_offset:
+                with open(attendance_file, 'rb') as f:
+                    f.seek(self._attendance_log_offset)
+                    data = f.read()
+                # A row still being written is left for the next refresh
+                data = data[:data.rfind(b'\n') + 1]
+                self._attendance_log_offset += len(data)
+                lines = [
+                    f"{row[2]} - {row[0]} ({row[3]})\n"
+                    for row in csv.reader(data.decode('utf-8').splitlines())
+                    if len(row) >= 4 and row[1] == today
+                ]
             
-            if self.attendance_log.get("1.0", "end").strip() == "":
-                self.attendance_log.insert("end", "No attendance records for today")
+            if self._attendance_log_rows == 0:
+                self.attendance_log.delete("1.0", "end")
+                self.attendance_log.insert("end", "".join(lines) or "No attendance records for today")
+            elif lines:
+                self.attendance_log.insert("end", "".join(lines))
+            self._attendance_log_rows += len(lines)
         except Exception as e:
             print(f"Error: {e}")
     
@@ -800,66 +1457,98 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
         file_path = filedialog.asksaveasfilename(
             defaultextension=".csv",
             filetypes=[("CSV files", "*.csv")],
-            initialfile=f"attendance_{datetime.now().strftime('%Y%m%d')}.csv"
+            initialfile=f"attendance_{self._today_str}.csv"
         )
         if file_path and Path("attendance.csv").exists():
-            import shutil
-            shutil.copy("attendance.csv", file_path)
+            # Contents only; copyfile uses the kernel's zero-copy path (sendfile/fcopyfile)
+            shutil.copyfile("attendance.csv", file_path)
             messagebox.showinfo("Export Complete", f"Exported to:\n{file_path}")
     
     def _show_database(self):
         """Enhanced database management page."""
-        self._clear_main_frame()
+        self._show_page("database", self._build_database_page, self._refresh_database_page)
         self._update_status("Database Management", "👥")
-        
+    
+    def _build_database_page(self):
+        """Create the database page widgets."""
         content = ctk.CTkFrame(self.main_frame, fg_color="transparent")
-        content.pack(fill="both", expand=True, padx=20, pady=20)
         
-        ctk.CTkLabel(content, text="Registered Faces Database", font=ctk.CTkFont(size=24, weight="bold"), text_color="#00d4ff").pack(pady=(10, 20))
+        ctk.CTkLabel(content, text="Registered Faces Database", font=self.fonts[24, "bold"], text_color="#00d4ff").pack(pady=(10, 20))
         
         # Stats
-        unique_names = list(set(self.face_system.known_face_names))
-        ctk.CTkLabel(
-            content,
-            text=f"Total: {len(self.face_system.known_face_names)} encodings | {len(unique_names)} unique persons",
-            font=ctk.CTkFont(size=14)
-        ).pack(pady=10)
+        self.database_stats_label = ctk.CTkLabel(content, text="", font=self.fonts[14, "normal"])
+        self.database_stats_label.pack(pady=10)
         
         # List of persons
-        scroll_frame = ctk.CTkScrollableFrame(content, width=600, height=400, fg_color="#1a1a2e")
-        scroll_frame.pack(padx=20, pady=10)
+        self.database_list = ctk.CTkScrollableFrame(content, width=600, height=400, fg_color="#1a1a2e")
+        self.database_list.pack(padx=20, pady=10)
         
-        from collections import Counter
-        name_counts = Counter(self.face_system.known_face_names)
-        
-        for name, count in sorted(name_counts.items()):
-            person_frame = ctk.CTkFrame(scroll_frame, fg_color="#16213e")
-            person_frame.pack(fill="x", pady=2, padx=5)
-            
-            ctk.CTkLabel(person_frame, text=f"👤 {name} ({count})", font=ctk.CTkFont(size=14)).pack(side="left", padx=10, pady=5)
-            ctk.CTkButton(person_frame, text="🗑", width=30, fg_color="red", hover_color="darkred",
-                         command=lambda n=name: self._delete_person(n)).pack(side="right", padx=10, pady=5)
-        
-        if not name_counts:
-            ctk.CTkLabel(scroll_frame, text="No faces registered yet", font=ctk.CTkFont(size=14)).pack(pady=20)
+        # One (frame, label, button) row per person, reused across refreshes
+        self._database_rows = []
+        self._database_empty_label = ctk.CTkLabel(self.database_list, text="No faces registered yet",
+                                                  font=self.fonts[14, "normal"])
         
         # Buttons
         btn_frame = ctk.CTkFrame(content, fg_color="transparent")
         btn_frame.pack(pady=20)
+        self._database_buttons = btn_frame
         
         ctk.CTkButton(btn_frame, text="🗑 Clear All", fg_color="red", hover_color="darkred", command=self._clear_database).pack(side="left", padx=10)
-        ctk.CTkButton(btn_frame, text="🔄 Refresh", command=self._show_database, fg_color="#00d4ff", text_color="#000000").pack(side="left", padx=10)
+        ctk.CTkButton(btn_frame, text="🔄 Refresh", command=self._refresh_database_page, fg_color="#00d4ff", text_color="#000000").pack(side="left", padx=10)
+        
+        return content, {"padx": 20, "pady": 20}
+    
+    def _refresh_database_page(self):
+        """Rebuild the list of registered persons if it changed since it was last built."""
+        self.database_stats_label.configure(
+            text=f"Total: {self._total_faces_count} encodings | {self._unique_persons_count} unique persons"
+        )
+        
+        # Counts are kept current by _refresh_face_counts; the widgets are the slow part
+        name_counts = self._name_counts
+        if name_counts == getattr(self, '_database_list_counts', None):
+            return
+        self._database_list_counts = name_counts.copy()
+        
+        # Unmapped while rows change, so the layout is computed once at the end
+        self.database_list.pack_forget()
+        
+        entries = sorted(name_counts.items())
+        rows = self._database_rows
+        for i, (name, count) in enumerate(entries):
+            if i < len(rows):
+                # Reconfiguring an existing row is far cheaper than building one
+                person_frame, label, button = rows[i]
+                label.configure(text=f"👤 {name} ({count})")
+                button.configure(command=lambda n=name: self._delete_person(n))
+            else:
+                person_frame = ctk.CTkFrame(self.database_list, fg_color="#16213e")
+                label = ctk.CTkLabel(person_frame, text=f"👤 {name} ({count})", font=self.fonts[14, "normal"])
+                label.pack(side="left", padx=10, pady=5)
+                button = ctk.CTkButton(person_frame, text="🗑", width=30, fg_color="red", hover_color="darkred",
+                                       command=lambda n=name: self._delete_person(n))
+                button.pack(side="right", padx=10, pady=5)
+                rows.append((person_frame, label, button))
+            person_frame.pack(fill="x", pady=2, padx=5)
+        
+        # Rows beyond the current persons are hidden, kept for later
+        for person_frame, _, _ in rows[len(entries):]:
+            person_frame.pack_forget()
+        
+        if entries:
+            self._database_empty_label.pack_forget()
+        else:
+            self._database_empty_label.pack(pady=20)
+        
+        self.database_list.pack(padx=20, pady=10, before=self._database_buttons)
     
     def _delete_person(self, name: str):
         """Delete a person from the database."""
         if messagebox.askyesno("Confirm", f"Delete all encodings for '{name}'?"):
-            indices = [i for i, n in enumerate(self.face_system.known_face_names) if n == name]
-            for i in sorted(indices, reverse=True):
-                del self.face_system.known_face_encodings[i]
-                del self.face_system.known_face_names[i]
-            self.face_system.save_encodings()
+            self.face_system.remove_face(name)
+            self._refresh_face_counts()
             self.notification_manager.show_toast("Success", f"Deleted {name}", "success")
-            self._show_database()
+            self._refresh_database_page()
     
     def _clear_database(self):
         """Clear all face encodings."""
@@ -867,33 +1556,34 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
             self.face_system.known_face_encodings = []
             self.face_system.known_face_names = []
             self.face_system.save_encodings()
-            self._show_database()
+            self._refresh_face_counts()
+            self._refresh_database_page()
     
     def _show_settings(self):
         """Enhanced settings page."""
-        self._clear_main_frame()
+        self._show_page("settings", self._build_settings_page, self._refresh_settings_page)
         self._update_status("Settings", "⚙️")
-        
+    
+    def _build_settings_page(self):
+        """Create the settings page widgets."""
         content = ctk.CTkScrollableFrame(self.main_frame, fg_color="transparent")
-        content.pack(fill="both", expand=True, padx=40, pady=40)
         
-        ctk.CTkLabel(content, text="Settings", font=ctk.CTkFont(size=24, weight="bold"), text_color="#00d4ff").pack(pady=(10, 30))
+        ctk.CTkLabel(content, text="Settings", font=self.fonts[24, "bold"], text_color="#00d4ff").pack(pady=(10, 30))
         
         # Camera settings
         cam_frame = ctk.CTkFrame(content, fg_color="#1a1a2e")
         cam_frame.pack(fill="x", padx=50, pady=10)
         
-        ctk.CTkLabel(cam_frame, text="Camera Settings", font=ctk.CTkFont(size=16, weight="bold")).pack(pady=15)
-        ctk.CTkLabel(cam_frame, text="Camera Index:", font=ctk.CTkFont(size=14)).pack(pady=(10, 5))
+        ctk.CTkLabel(cam_frame, text="Camera Settings", font=self.fonts[16, "bold"]).pack(pady=15)
+        ctk.CTkLabel(cam_frame, text="Camera Index:", font=self.fonts[14, "normal"]).pack(pady=(10, 5))
         self.camera_entry = ctk.CTkEntry(cam_frame, width=100)
-        self.camera_entry.insert(0, str(self.camera_index))
         self.camera_entry.pack(pady=(5, 20))
         
         # Feature toggles
         features_frame = ctk.CTkFrame(content, fg_color="#1a1a2e")
         features_frame.pack(fill="x", padx=50, pady=10)
         
-        ctk.CTkLabel(features_frame, text="Advanced Features", font=ctk.CTkFont(size=16, weight="bold")).pack(pady=15)
+        ctk.CTkLabel(features_frame, text="Advanced Features", font=self.fonts[16, "bold"]).pack(pady=15)
         
         self.use_emotion_var = ctk.BooleanVar(value=self.use_emotion_recognition)
         ctk.CTkCheckBox(features_frame, text="Enable Emotion Recognition", variable=self.use_emotion_var).pack(pady=5)
@@ -913,9 +1603,20 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
         about_frame = ctk.CTkFrame(content, fg_color="#1a1a2e")
         about_frame.pack(fill="x", padx=50, pady=20)
         
-        ctk.CTkLabel(about_frame, text="About", font=ctk.CTkFont(size=16, weight="bold")).pack(pady=10)
+        ctk.CTkLabel(about_frame, text="About", font=self.fonts[16, "bold"]).pack(pady=10)
         ctk.CTkLabel(about_frame, text="Advanced Face Recognition System v2.0\nWith Emotion Recognition & Advanced Analytics\nBuilt with Python, OpenCV & AI",
-                    font=ctk.CTkFont(size=12), justify="center").pack(pady=(0, 20))
+                    font=self.fonts[12, "normal"], justify="center").pack(pady=(0, 20))
+        
+        return content, {"padx": 40, "pady": 40}
+    
+    def _refresh_settings_page(self):
+        """Discard unsaved edits by showing the current settings."""
+        self.camera_entry.delete(0, "end")
+        self.camera_entry.insert(0, str(self.camera_index))
+        self.use_emotion_var.set(self.use_emotion_recognition)
+        self.use_quality_var.set(self.use_quality_check)
+        self.performance_mode_var.set(self.performance_mode)
+        self.notifications_var.set(self.notification_manager.toast_enabled)
     
     def _save_settings(self):
         """Save settings."""
@@ -924,31 +1625,96 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
             self.use_emotion_recognition = self.use_emotion_var.get()
             self.use_quality_check = self.use_quality_var.get()
             self.performance_mode = self.performance_mode_var.get()
+            self._reset_model_slots()
             self.notification_manager.toast_enabled = self.notifications_var.get()
             messagebox.showinfo("Settings", "Settings saved successfully!")
             self._update_status("Settings saved", "✅")
         except ValueError:
             messagebox.showerror("Error", "Invalid camera index")
     
-    def _schedule_ui_update(self):
-        """Schedule UI update loop at 30 FPS."""
-        self._update_ui()
-        self.after(33, self._schedule_ui_update)  # ~30 FPS
+    def _tick_clock(self):
+        """Refresh the cached date strings once a minute."""
+        now = datetime.now()
+        self._today_str = now.strftime('%Y%m%d')
+        self._today_iso = now.strftime('%Y-%m-%d')
+        self.after(60000, self._tick_clock)
+    
+    def _reset_model_slots(self):
+        """
+        Size the semaphore that bounds concurrent model calls.
+        
+        One call at a time on a GPU, which serializes kernels anyway; on the
+        CPU a few can overlap before they start thrashing each other's caches.
+        """
+        if self.detection_device in ('cuda', 'tensorrt'):
+            slots = 1
+        else:
+            slots = min(os.cpu_count() or 1, 3 if self.performance_mode else 2)
+        self._model_slots = threading.BoundedSemaphore(slots)
+    
+    def _request_ui_update(self):
+        """Wake the Tk thread to run _update_ui once.
+        
+        Called by worker threads after they queue a frame or a result. At
+        most one call is pending at a time, and nothing runs while there is
+        nothing new to show. Redraws are spaced at least 40 ms apart (25 FPS)
+        however fast frames arrive; whatever arrives in between is picked up
+        by the next redraw.
+        """
+        UI_FRAME_INTERVAL = 0.040
+        
+        if self._ui_update_pending.is_set():
+            return
+        self._ui_update_pending.set()
+        try:
+            wait = UI_FRAME_INTERVAL - (time.monotonic() - self._last_ui_update)
+            if wait > 0:
+                self.after(max(1, int(wait * 1000)), self._update_ui)
+            else:
+                self.after_idle(self._update_ui)
+        except (RuntimeError, TclError):
+            # Main loop is not running, or the window is already destroyed
+            self._ui_update_pending.clear()
+    
+    def _post_result(self, action: str, data):
+        """Queue a result for _handle_result from a worker thread.
+        
+        Never blocks: if the UI has fallen behind and the queue is full, the
+        oldest queued result is dropped to make room for this one.
+        """
+        while True:
+            try:
+                self.result_queue.put_nowait((action, data))
+                break
+            except queue.Full:
+                try:
+                    dropped, _ = self.result_queue.get_nowait()
+                    if dropped == "quality_skipped":
+                        self._skip_event_pending.clear()
+                except queue.Empty:
+                    pass
+        self._request_ui_update()
     
     def _update_ui(self):
         """Update UI with camera frames."""
+        # Cleared first so anything queued from here on schedules another pass
+        self._ui_update_pending.clear()
+        self._last_ui_update = time.monotonic()
+        while self._batch_results:
+            self._finish_batch_register(*self._batch_results.popleft())
         try:
-            while not self.frame_queue.empty():
+            # Only the newest frame is worth drawing
+            frame = self.frame_queue.get_nowait()
+            # Pages are hidden, never destroyed, and every page switch clears
+            # current_preview_label, so a set label is always safe to draw into
+            if (frame is not None and self.current_mode is not None and
+                    self.current_preview_label is not None):
                 try:
-                    frame = self.frame_queue.get_nowait()
-                    if frame is not None and self.current_preview_label is not None:
-                        try:
-                            if self.current_preview_label.winfo_exists():
-                                self._display_image(frame, self.current_preview_label)
-                        except Exception:
-                            pass
-                except queue.Empty:
-                    break
+                    self._display_image(frame, self.current_preview_label)
+                except Exception:
+                    pass
+            # Drawn into the preview buffer; the camera thread can reuse it
+            self._matpool.put(frame)
             
             while not self.result_queue.empty():
                 try:
@@ -965,6 +1731,7 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
         """Handle results from camera thread."""
         try:
             if action == "register_success":
+                self._refresh_face_counts()
                 self._update_status(f"✅ Registered: {data}", "✅")
                 self.notification_manager.show_toast("Success", f"Registered {data}", "success")
                 messagebox.showinfo("Success", f"Successfully registered {data}!")
@@ -972,6 +1739,26 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
                 self._update_status("❌ No face detected", "⚠️")
             elif action == "register_multiple_faces":
                 self._update_status("❌ Multiple faces - show only one", "⚠️")
+            elif action == "register_blurry":
+                self._update_status("❌ Face too blurry - hold still", "⚠️")
+            elif action == "export_sqlite_done":
+                if data:
+                    self.notification_manager.show_toast("Success", "Exported to SQLite", "success")
+                else:
+                    self._update_status("SQLite export failed", "❌")
+            elif action == "import_done":
+                if data:
+                    self.face_system.load_encodings()  # Reload
+                    self._refresh_face_counts()
+                    self.notification_manager.show_toast("Success", "Import complete", "success")
+                    self._update_status("Database imported", "✅")
+                else:
+                    self._update_status("Database import failed", "❌")
+            elif action == "batch_register_progress":
+                self._update_status(data, "⏳")
+            elif action == "quality_skipped":
+                self._skip_event_pending.clear()
+                self._update_info_label()
             elif action == "attendance_marked":
                 self._update_status(f"✅ Attendance marked: {data}", "✅")
                 self.notification_manager.show_toast("Attendance", f"{data} checked in", "success")
@@ -982,16 +1769,25 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
     def _display_image(self, frame, label):
         """Display an OpenCV image on a CTk label."""
         try:
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w = frame_rgb.shape[:2]
+            h, w = frame.shape[:2]
             max_w, max_h = 800, 600
             scale = min(max_w / w, max_h / h)
             new_w, new_h = int(w * scale), int(h * scale)
-            frame_resized = cv2.resize(frame_rgb, (new_w, new_h))
-            pil_image = Image.fromarray(frame_resized)
-            ctk_image = ctk.CTkImage(pil_image, size=(new_w, new_h))
-            label.configure(image=ctk_image, text="")
-            label.image = ctk_image
+            
+            # Reallocate only when the preview size or target label changes
+            if self._preview_buf is None or self._preview_buf.shape[:2] != (new_h, new_w):
+                self._preview_buf = np.empty((new_h, new_w, 3), dtype=np.uint8)
+                self._preview_photo = ImageTk.PhotoImage("RGB", (new_w, new_h))
+                self._preview_target = None
+            
+            # Resize and convert in one pass; no per-frame image allocations
+            fast_ops.resize_to_rgb(frame, self._preview_buf)
+            self._preview_photo.paste(Image.fromarray(self._preview_buf))
+            
+            if self._preview_target is not label:
+                label.configure(image=self._preview_photo, text="")
+                label.image = self._preview_photo
+                self._preview_target = label
         except:
             pass
     
@@ -1000,17 +1796,24 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
         if self.is_camera_running:
             return
         
-        self.cap = cv2.VideoCapture(self.camera_index)
+        if sys.platform.startswith('linux'):
+            # V4L2 avoids the GStreamer pipeline's extra copies
+            self.cap = cv2.VideoCapture(self.camera_index, cv2.CAP_V4L2)
+        else:
+            self.cap = cv2.VideoCapture(self.camera_index)
         
         if not self.cap.isOpened():
             messagebox.showerror("Error", "Could not open camera")
             return
         
+        # MJPG at 640x480 is far cheaper to decode than YUYV/H.264 streams
+        self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
         self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
         self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
         self.cap.set(cv2.CAP_PROP_FPS, 30)  # Set to 30 FPS
         self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Reduce buffer for lower latency
         
+        stop = self._stop_evt = threading.Event()
         self.is_camera_running = True
         self.current_mode = mode
         
@@ -1029,195 +1832,419 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
             self.btn_stop_attendance.configure(state="normal")
         
         # Clear queues
-        while not self.frame_queue.empty():
-            try:
-                self.frame_queue.get_nowait()
-            except queue.Empty:
-                break
-        
-        # Start camera thread
-        threading.Thread(target=self._camera_loop, daemon=True).start()
+        self.frame_queue.clear()
+        
+        self.capture_ring.clear()
+        self.detection_inbox.clear()
+        self.recognition_inbox.clear()
+        self.emotion_inbox.clear()
+        self.latest_result = None
+        
+        # Capture, preview, detection, recognition and emotions each get a
+        # thread so a slow model never holds up the preview. The threads watch
+        # this run's own stop event, so one still inside a model call when the
+        # camera stops exits afterwards instead of carrying on into the next run
+        self._camera_threads = [
+            threading.Thread(target=loop, args=(stop,), daemon=True)
+            for loop in (self._capture_loop, self._camera_loop, self._detection_loop,
+                         self._recognition_loop, self._emotion_loop)
+        ]
+        for thread in self._camera_threads:
+            thread.start()
     
-    def _camera_loop(self):
-        """Main camera loop with optimized performance."""
-        import face_recognition
+    def _capture_loop(self, stop: threading.Event):
+        """Read frames from the camera so USB I/O and decoding never stall processing."""
+        # Frames grabbed per decoded frame when performance mode is on
+        DECODE_EVERY_N_FRAMES = 2
         
+        while not stop.is_set() and self.cap and self.cap.isOpened():
+            try:
+                # grab() only dequeues the buffer; decode just the frame we keep
+                skip = DECODE_EVERY_N_FRAMES - 1 if self.performance_mode else 0
+                for _ in range(skip):
+                    self.cap.grab()
+                ret = self.cap.grab()
+                if ret and self.capture_ring.has_unread():
+                    # The consumer has not caught up; drop this one undecoded
+                    continue
+                if ret:
+                    # Decodes into the slot's buffer when it has the frame's size
+                    slot, buffer = self.capture_ring.writable_slot()
+                    ret, frame = self.cap.retrieve(buffer)
+                if not ret:
+                    # Successful reads block until the camera delivers a frame,
+                    # so only failures wait, and a stop ends the wait at once
+                    stop.wait(0.01)
+                    continue
+                self.capture_ring.publish(slot, frame)
+            except Exception as e:
+                print(f"Capture error: {e}")
+                stop.wait(0.1)
+    
+    def _camera_loop(self, stop: threading.Event):
+        """Preview loop: annotate each camera frame with the newest results."""
         frame_count = 0
-        process_count = 0
-        face_locations = []
-        face_names = []
-        face_emotions = []  # Track emotions
         
-        # Performance optimization: process every Nth frame
+        # Performance optimization: send every Nth frame to the face models
         PROCESS_EVERY_N_FRAMES = 3  # Process every 3rd frame (faster)
         
-        while self.is_camera_running and self.cap and self.cap.isOpened():
+        while not stop.is_set():
             try:
-                ret, frame = self.cap.read()
-                if not ret:
-                    time.sleep(0.01)
+                frame = self.capture_ring.acquire(timeout=0.1)
+                if frame is None:
                     continue
                 
-                display_frame = frame.copy()
-                frame_count += 1
-                
-                if self.current_mode in ['recognize', 'attendance']:
-                    # Only process every Nth frame for performance
+                # The ring slot is reused once released, so take what we keep
+                try:
+                    frame_count += 1
                     if frame_count % PROCESS_EVERY_N_FRAMES == 0:
-                        process_count += 1
-                        
-                        # Resize once and reuse
-                        small_frame = cv2.resize(frame, (0, 0), fx=0.25, fy=0.25)
-                        rgb_small = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
-                        
-                        # Face detection with HOG (faster)
-                        face_locations = face_recognition.face_locations(rgb_small, model="hog")
-                        
-                        if face_locations:
-                            face_encodings = face_recognition.face_encodings(rgb_small, face_locations)
-                            face_names = []
-                            face_emotions = []
-                            
-                            for i, encoding in enumerate(face_encodings):
-                                name = self.face_system._match_face(encoding, 0.6)
-                                face_names.append(name)
-                                
-                                # EMOTION RECOGNITION - Now working!
-                                if self.use_emotion_recognition and process_count % 2 == 0:  # Every 6th frame
-                                    try:
-                                        top, right, bottom, left = face_locations[i]
-                                        # Scale back to original size
-                                        face_roi = frame[top*4:bottom*4, left*4:right*4]
-                                        if face_roi.size > 0:
-                                            emotion = self.emotion_recognizer.predict_emotion(face_roi)
-                                            if emotion:
-                                                face_emotions.append(emotion)
-                                                # Track emotion for this person
-                                                if name != "Unknown":
-                                                    self.emotion_tracker.add_emotion(name, emotion)
-                                            else:
-                                                face_emotions.append("Neutral")
-                                        else:
-                                            face_emotions.append("Neutral")
-                                    except Exception as e:
-                                        face_emotions.append("Neutral")
-                                else:
-                                    face_emotions.append("")
-                                
-                                # Mark attendance
-                                if self.current_mode == 'attendance' and name != "Unknown":
-                                    if self.attendance_system.mark_attendance(name):
-                                        try:
-                                            self.result_queue.put_nowait(("attendance_marked", name))
-                                        except queue.Full:
-                                            pass
-                        else:
-                            face_names = []
-                            face_emotions = []
+                        # Never blocks; a busy detector just skips to a newer frame
+                        snapshot = self._matpool.get(frame.shape)
+                        np.copyto(snapshot, frame)
+                        self.detection_inbox.put(Frame(snapshot))
                     
-                    # Draw boxes with emotions
-                    for idx, ((top, right, bottom, left), name) in enumerate(zip(face_locations, face_names)):
-                        top, right, bottom, left = top*4, right*4, bottom*4, left*4
-                        color = (0, 255, 0) if name != "Unknown" else (0, 0, 255)
-                        
-                        # Draw face box
-                        cv2.rectangle(display_frame, (left, top), (right, bottom), color, 2)
-                        
-                        # Emotion text (if available)
-                        emotion_text = ""
-                        if idx < len(face_emotions) and face_emotions[idx]:
-                            emotion = face_emotions[idx]
-                            # Emoji mapping
-                            emoji_map = {
-                                "Happy": "😊", "Sad": "😢", "Angry": "😠",
-                                "Surprise": "😮", "Fear": "😨", "Disgust": "🤢",
-                                "Neutral": "😐"
-                            }
-                            emoji = emoji_map.get(emotion, "")
-                            emotion_text = f" {emoji} {emotion}"
-                        
-                        # Draw name and emotion label background
-                        label_height = 35 if not emotion_text else 60
-                        cv2.rectangle(display_frame, (left, bottom - label_height), (right, bottom), color, cv2.FILLED)
-                        
-                        # Draw name
-                        cv2.putText(display_frame, name, (left + 6, bottom - 36 if emotion_text else bottom - 6),
-                                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-                        
-                        # Draw emotion
-                        if emotion_text:
-                            cv2.putText(display_frame, emotion_text, (left + 6, bottom - 8),
-                                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+                    # Pooled, so the copy allocates nothing; the slot itself cannot be
+                    # drawn on because the capture thread decodes into it again
+                    display_frame = self._matpool.get(frame.shape)
+                    np.copyto(display_frame, frame)
+                finally:
+                    self.capture_ring.release()
+                result = self.latest_result
                 
+                if self.current_mode in ['recognize', 'attendance'] and result is not None:
+                    self._draw_recognition(display_frame, result)
                 elif self.current_mode == 'register':
-                    # Process less frequently in register mode
-                    if frame_count % PROCESS_EVERY_N_FRAMES == 0:
-                        small = cv2.resize(frame, (0, 0), fx=0.5, fy=0.5)
-                        rgb_small = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
-                        face_locs = face_recognition.face_locations(rgb_small, model="hog")
-                        face_locations = [(t*2, r*2, b*2, l*2) for t, r, b, l in face_locs]
+                    if result is not None:
+                        for (top, right, bottom, left) in result.boxes:
+                            cv2.rectangle(display_frame, (left, top), (right, bottom), (0, 255, 0), 2)
                     
-                    for (top, right, bottom, left) in face_locations:
-                        cv2.rectangle(display_frame, (left, top), (right, bottom), (0, 255, 0), 2)
+                    draw_text(display_frame, "Enter name & click Capture", (10, 30), 0.7, 2, (0, 255, 0))
+                
+                # Hand the frame to the UI (never blocks); a frame the UI never
+                # picked up goes straight back to the pool
+                self._matpool.put(self.frame_queue.swap(display_frame))
+                self._request_ui_update()
+                
+            except Exception as e:
+                print(f"Camera error: {e}")
+                stop.wait(0.1)
+    
+    def _detection_loop(self, stop: threading.Event):
+        """Find faces in the frames picked by the preview loop."""
+        import face_recognition
+        from register_faces_from_folder import dlib_uses_cuda
+        
+        # With a CUDA GPU the downscale runs on OpenCV's CUDA module and dlib's
+        # CNN detector replaces HOG
+        use_gpu = self.detection_device != "cpu"
+        resize_to_rgb = (fast_ops.GpuResizer().resize_to_rgb if use_gpu and fast_ops.CUDA_AVAILABLE
+                         else fast_ops.resize_to_rgb)
+        detector_model = "cnn" if use_gpu and dlib_uses_cuda() else "hog"
+        
+        # Sum of absolute differences between 32x32 grayscale thumbnails below
+        # which a frame counts as unchanged since the last detection
+        STATIC_THRESHOLD = 512
+        prev_thumb = None
+        
+        while not stop.is_set():
+            try:
+                frame = self.detection_inbox.get(timeout=0.1)
+                if frame is None:
+                    continue
+                
+                h, w = frame.bgr.shape[:2]
+                if self.current_mode in ['recognize', 'attendance']:
+                    # Downscale and convert to RGB in one pass
+                    frame.rgb_small = self._matpool.get((h // 4, w // 4, 3))
+                    resize_to_rgb(frame.bgr, frame.rgb_small)
                     
-                    cv2.putText(display_frame, "Enter name & click Capture", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+                    # Nothing moved since the last detection: reuse the newest result
+                    thumb = cv2.cvtColor(
+                        cv2.resize(frame.rgb_small, (32, 32), interpolation=cv2.INTER_AREA),
+                        cv2.COLOR_RGB2GRAY
+                    )
+                    previous = self.latest_result
+                    if (prev_thumb is not None and previous is not None and previous.detected
+                            and cv2.norm(thumb, prev_thumb, cv2.NORM_L1) < STATIC_THRESHOLD):
+                        frame.boxes = previous.boxes
+                        frame.identities = previous.identities
+                        frame.emotions = previous.emotions
+                        frame.detected = True
+                        self._publish_result(frame)
+                        continue
+                    prev_thumb = thumb
+                    
+                    # Face detection with HOG on the CPU (which only needs
+                    # luminance), the CNN on a GPU
+                    if detector_model == "hog":
+                        detect_image = self._matpool.get((h // 4, w // 4), np.uint8)
+                        cv2.cvtColor(frame.rgb_small, cv2.COLOR_RGB2GRAY, dst=detect_image)
+                    else:
+                        detect_image = frame.rgb_small
+                    with self._model_slots:
+                        face_locs = face_recognition.face_locations(detect_image, model=detector_model)
+                    if detect_image is not frame.rgb_small:
+                        self._matpool.put(detect_image)
+                    frame.boxes = [(t*4, r*4, b*4, l*4) for t, r, b, l in face_locs]
+                    frame.detected = True
+                    
+                    if frame.boxes:
+                        self.recognition_inbox.put(frame)
+                    else:
+                        self._publish_result(frame)
+                
+                elif self.current_mode == 'register':
+                    # Half resolution is enough for the preview boxes
+                    rgb_half = self._matpool.get((h // 2, w // 2, 3))
+                    resize_to_rgb(frame.bgr, rgb_half)
+                    with self._model_slots:
+                        face_locs = face_recognition.face_locations(rgb_half, model=detector_model)
+                    self._matpool.put(rgb_half)
+                    frame.boxes = [(t*2, r*2, b*2, l*2) for t, r, b, l in face_locs]
+                    frame.detected = True
                     
                     if self.register_name:
                         name = self.register_name
                         self.register_name = ""
+                        self._register_from_frame(frame.bgr, frame.boxes, name)
+                    self._publish_result(frame)
+                
+            except Exception as e:
+                print(f"Detection error: {e}")
+                stop.wait(0.1)
+    
+    def _recognition_loop(self, stop: threading.Event):
+        """Identify detected faces, queue their crops for emotions and mark attendance."""
+        import face_recognition
+        from advanced_detection import FaceQualityAssessor
+        from emotion_recognition import pad_face_box
+        
+        process_count = 0
+        
+        # Face crops for the emotion model, one slot per face
+        MAX_EMOTION_FACES = 16
+        
+        # Emotions change slowly: rerun the model for a face every Nth processed
+        # frame and carry its last result over in between
+        EMOTION_EVERY_N_FRAMES = 5
+        tracker = CentroidTracker()
+        
+        while not stop.is_set():
+            try:
+                frame = self.recognition_inbox.get(timeout=0.1)
+                if frame is None:
+                    continue
+                process_count += 1
+                
+                face_locations = [(t//4, r//4, b//4, l//4) for t, r, b, l in frame.boxes]
+                with self._model_slots:
+                    face_encodings = face_recognition.face_encodings(frame.rgb_small, face_locations)
+                face_names = self.face_system.match_faces(face_encodings, 0.6)
+                tracks = [tracker.tracks[track_id] for track_id in tracker.update(frame.boxes, process_count)]
+                face_emotions = [""] * len(face_names)
+                
+                # EMOTION RECOGNITION - the emotion thread labels the faces whose
+                # emotion is due; until it does, each face keeps its last one
+                if self.use_emotion_recognition:
+                    face_emotions = [track.emotion or "" for track in tracks]
+                    emotion_rois = self._matpool.get((MAX_EMOTION_FACES, 96, 96, 3))
+                    try:
+                        # Crop each face into its slot
+                        slots = []
+                        skipped = 0
+                        for i, (top, right, bottom, left) in enumerate(frame.boxes):
+                            if len(slots) == MAX_EMOTION_FACES:
+                                break
+                            track = tracks[i]
+                            if process_count - track.emotion_frame < EMOTION_EVERY_N_FRAMES:
+                                continue
+                            # Blurry, badly lit or flat faces are not worth the model call
+                            if self.use_quality_check:
+                                face = frame.bgr[max(0, top):bottom, max(0, left):right]
+                                if face.size == 0 or not FaceQualityAssessor.is_usable(
+                                    cv2.cvtColor(face, cv2.COLOR_BGR2GRAY)
+                                ):
+                                    skipped += 1
+                                    continue
+                            # Padded like the single-face path, so both feed the
+                            # classifier the same crop of a face
+                            if fast_ops.crop_and_resize(
+                                frame.bgr, pad_face_box((top, right, bottom, left), frame.bgr.shape),
+                                emotion_rois[len(slots)]
+                            ) is not None:
+                                slots.append(i)
                         
-                        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                        locs = face_recognition.face_locations(rgb_frame, model="hog")
+                        if skipped:
+                            self._quality_skips += skipped
+                            if not self._skip_event_pending.is_set():
+                                self._skip_event_pending.set()
+                                self._post_result("quality_skipped", None)
                         
-                        if len(locs) == 1:
-                            encodings = face_recognition.face_encodings(rgb_frame, locs)
-                            if encodings:
-                                self.face_system.known_face_encodings.append(encodings[0])
-                                self.face_system.known_face_names.append(name)
-                                self.face_system.save_encodings()
-                                try:
-                                    self.result_queue.put_nowait(("register_success", name))
-                                except queue.Full:
-                                    pass
-                        elif len(locs) == 0:
-                            try:
-                                self.result_queue.put_nowait(("register_no_face", None))
-                            except queue.Full:
-                                pass
-                        else:
-                            try:
-                                self.result_queue.put_nowait(("register_multiple_faces", None))
-                            except queue.Full:
-                                pass
+                        if slots:
+                            # Not due again for a while, whether or not this batch gets run
+                            for i in slots:
+                                tracks[i].emotion_frame = process_count
+                            self.emotion_inbox.put((
+                                emotion_rois, [tracks[i] for i in slots], [face_names[i] for i in slots]
+                            ))
+                            emotion_rois = None
+                    except Exception:
+                        logger.exception("Could not queue faces for emotion analysis")
+                    self._matpool.put(emotion_rois)
                 
-                # Put frame in queue (non-blocking)
-                try:
-                    # Clear old frames if queue is full
-                    if self.frame_queue.full():
-                        try:
-                            self.frame_queue.get_nowait()
-                        except queue.Empty:
-                            pass
-                    self.frame_queue.put_nowait(display_frame)
-                except queue.Full:
-                    pass  # Skip frame if queue is full
+                frame.identities = face_names
+                frame.emotions = face_emotions
+                self._publish_result(frame)
                 
-                # Reduced sleep for smoother video (30 FPS target)
-                time.sleep(0.033)
+                # Mark attendance for the whole frame with one write
+                if self.current_mode == 'attendance':
+                    for name in self.attendance_system.mark_attendance_many(face_names):
+                        self._post_result("attendance_marked", name)
                 
             except Exception as e:
-                print(f"Camera error: {e}")
-                time.sleep(0.1)
+                print(f"Recognition error: {e}")
+                stop.wait(0.1)
+    
+    def _emotion_loop(self, stop: threading.Event):
+        """Run the emotion model on the face crops queued by the recognition thread."""
+        while not stop.is_set():
+            try:
+                job = self.emotion_inbox.get(timeout=0.1)
+                if job is None:
+                    continue
+                
+                emotion_rois, tracks, names = job
+                try:
+                    results = self._recognize_emotions_cached(emotion_rois[:len(tracks)])
+                finally:
+                    self._matpool.put(emotion_rois)
+                
+                for track, name, result in zip(tracks, names, results):
+                    emotion = result['dominant'].capitalize() if result['detected'] else "Neutral"
+                    # Picked up by the next frame the recognition thread publishes
+                    track.emotion = emotion
+                    # Track emotion for this person
+                    if result['detected'] and name != "Unknown":
+                        self.emotion_tracker.add_emotion(
+                            name, emotion, result['confidence'], time.time()
+                        )
+            except Exception as e:
+                print(f"Emotion error: {e}")
+                stop.wait(0.1)
+    
+    def _publish_result(self, frame: Frame):
+        """Make a processed frame the one the preview draws, recycling its pixels."""
+        self._matpool.put(frame.bgr)
+        self._matpool.put(frame.rgb_small)
+        frame.bgr = frame.rgb_small = None
+        self.latest_result = frame
+    
+    def _register_from_frame(self, frame: np.ndarray, locs: list, name: str):
+        """
+        Register the single face in a full-resolution frame under a name.
+        
+        Args:
+            frame: Full-resolution BGR frame
+            locs: Face locations the detection thread found in the frame
+            name: Name to register the face under
+        """
+        import face_recognition
+        
+        if len(locs) == 1 and self.use_quality_check and self._is_blurry(frame, locs[0]):
+            result = ("register_blurry", None)
+        elif len(locs) == 1:
+            # Only the face and a margin for the landmark model need converting to RGB
+            top, right, bottom, left = locs[0]
+            margin = (bottom - top) // 2
+            y0, x0 = max(0, top - margin), max(0, left - margin)
+            y1, x1 = min(frame.shape[0], bottom + margin), min(frame.shape[1], right + margin)
+            rgb_face = np.ascontiguousarray(frame[y0:y1, x0:x1, ::-1])
+            with self._model_slots:
+                encodings = face_recognition.face_encodings(
+                    rgb_face, [(top - y0, right - x0, bottom - y0, left - x0)]
+                )
+            if encodings:
+                self.face_system.known_face_encodings.append(encodings[0])
+                self.face_system.known_face_names.append(name)
+                self.face_system.save_encodings()
+                result = ("register_success", name)
+            else:
+                # Detected, but the landmark model could not encode it
+                result = ("register_no_face", None)
+        elif len(locs) == 0:
+            result = ("register_no_face", None)
+        else:
+            result = ("register_multiple_faces", None)
+        
+        self._post_result(*result)
+    
+    @staticmethod
+    def _draw_recognition(display_frame: np.ndarray, result: Frame):
+        """Draw the boxes, names and emotions of a processed frame."""
+        for idx, ((top, right, bottom, left), name) in enumerate(zip(result.boxes, result.identities)):
+            color = KNOWN_COLOR if name != "Unknown" else UNKNOWN_COLOR
+            
+            # Draw face box
+            cv2.rectangle(display_frame, (left, top), (right, bottom), color, 2)
+            
+            # Name and emotion (if available) share one line, so one mask per face
+            label = name
+            if idx < len(result.emotions) and result.emotions[idx]:
+                emotion = result.emotions[idx]
+                label = name + (EMOTION_LABEL.get(emotion) or f"  {emotion}")
+            
+            # Draw label background, sized from the cached mask of this label
+            mask_height = _text_mask(label, 0.6, 2)[0].shape[0]
+            cv2.rectangle(display_frame, (left, bottom - mask_height - 12), (right, bottom), color, cv2.FILLED)
+            
+            # Labels repeat frame after frame, so they come from the mask cache
+            draw_text(display_frame, label, (left + 6, bottom - 10), 0.6, 2, (255, 255, 255))
+    
+    def _recognize_emotions_cached(self, face_rois: np.ndarray) -> list:
+        """Recognize the emotions of face crops, reusing results for unchanged faces.
+        
+        Faces missing from the cache go to the emotion model in one batch.
+        """
+        hashes = [fast_ops.perceptual_hash(face_roi) for face_roi in face_rois]
+        results = [self.inference_cache.lookup(face_hash, 'emotion') for face_hash in hashes]
+        
+        misses = [i for i, result in enumerate(results) if result is None]
+        if misses:
+            with self._model_slots:
+                batch = self.emotion_recognizer.recognize_emotions_batch([face_rois[i] for i in misses])
+            for i, result in zip(misses, batch):
+                self.inference_cache.store(hashes[i], 'emotion', result)
+                results[i] = result
+        return results
+    
+    @staticmethod
+    def _is_blurry(frame: np.ndarray, face_location) -> bool:
+        """Whether a face is too blurry to register (same threshold as FaceQualityAssessor)."""
+        top, right, bottom, left = face_location
+        face = frame[top:bottom, left:right]
+        if min(face.shape[:2]) < 2:
+            return True
+        gray = cv2.cvtColor(face, cv2.COLOR_BGR2GRAY)
+        return fast_ops.quality_laplacian_var(gray) <= 50
     
     def _stop_camera(self):
         """Stop the camera."""
         self.is_camera_running = False
+        self._stop_evt.set()
+        
+        # The capture thread must be out of grab() before the camera is
+        # released; threads stuck in a long model call are not waited for,
+        # they exit on their own stop event when the call returns
+        deadline = time.monotonic() + 1.0
+        for thread in self._camera_threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        self._camera_threads = []
         
         if self.cap:
-            time.sleep(0.2)
             self.cap.release()
             self.cap = None
         
+        self.current_mode = None
         self.current_preview_label = None
         
         # Re-enable buttons
@@ -1233,6 +2260,7 @@ class AdvancedFaceRecognitionApp(ctk.CTk):
     
     def _on_closing(self):
         """Handle window close event."""
+        # Camera threads are stopped (and joined) before the window goes away
         self._stop_camera()
         self.db_manager.auto_backup()  # Final backup
         self.destroy()
@@ -4,21 +4,59 @@ Analytics and Reporting Module
 Generates comprehensive analytics and visualizations for attendance and recognition data.
 """
 
+import calendar
 import csv
+import hashlib
 import json
-from datetime import datetime, timedelta
+import shutil
+from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 import logging
 
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from collections import defaultdict, Counter
+from collections import Counter
 
 logger = logging.getLogger(__name__)
 
 
+def _parse_dates(values: List[str]) -> np.ndarray:
+    """Parse YYYY-MM-DD strings to datetime64[D]; unparseable entries become NaT."""
+    try:
+        return np.array(values, dtype='datetime64[D]')
+    except ValueError:
+        dates = np.full(len(values), np.datetime64('NaT'), dtype='datetime64[D]')
+        for i, value in enumerate(values):
+            try:
+                dates[i] = np.datetime64(value, 'D')
+            except ValueError:
+                pass
+        return dates
+
+
+def _parse_minutes(time_str: Optional[str]) -> int:
+    """Minutes since midnight of an HH:MM[:SS] string, or -1 if it cannot be parsed."""
+    parts = (time_str or '').split(':')
+    if len(parts) < 2:
+        return -1
+    try:
+        return int(parts[0]) * 60 + int(parts[1])
+    except ValueError:
+        return -1
+
+
+def _count_hours(hours: np.ndarray) -> Dict[str, int]:
+    """Count records per hour ("HH" keys, in hour order), ignoring missing (-1) hours."""
+    counts = np.bincount(hours[hours >= 0], minlength=24)
+    return {f"{hour:02d}": int(count) for hour, count in enumerate(counts) if count}
+
+
+def _count_values(values: np.ndarray) -> Dict[str, int]:
+    """Count occurrences of each distinct string in an array."""
+    keys, counts = np.unique(values, return_counts=True)
+    return dict(zip(keys.tolist(), counts.tolist()))
+
+
 class AnalyticsDashboard:
     """Generate analytics and visualizations for the face recognition system."""
     
@@ -32,6 +70,12 @@ class AnalyticsDashboard:
         self.attendance_file = Path(attendance_file)
         self.attendance_data = []
         self.emotion_data = {}
+        self._stamp = None  # (mtime_ns, size) of the file when last read
+        self._offset = 0  # Bytes of the file parsed so far
+        self._fieldnames = None
+        self._stats_cache = {}
+        self._figure = None  # Reused for saved plots (see _new_plot)
+        self._build_columns()
         self._load_data()
     
     def _load_data(self):
@@ -41,13 +85,90 @@ class AnalyticsDashboard:
             return
         
         try:
-            with open(self.attendance_file, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                self.attendance_data = list(reader)
+            self.attendance_data = []
+            self._offset = 0
+            self._fieldnames = None
+            self._build_columns()
+            self._read_new_rows()
             logger.info(f"Loaded {len(self.attendance_data)} attendance records")
         except Exception as e:
             logger.error(f"Error loading attendance data: {e}")
     
+    def _read_new_rows(self):
+        """Parse the rows appended to the file since it was last read."""
+        stat = self.attendance_file.stat()
+        with open(self.attendance_file, 'rb') as f:
+            f.seek(self._offset)
+            data = f.read()
+        # A row still being written is left for the next read
+        data = data[:data.rfind(b'\n') + 1]
+        self._offset += len(data)
+        self._stamp = (stat.st_mtime_ns, stat.st_size)
+        
+        lines = data.decode('utf-8').splitlines()
+        if self._fieldnames is None:
+            if not lines:
+                return
+            self._fieldnames = next(csv.reader(lines[:1]))
+            lines = lines[1:]
+        records = list(csv.DictReader(lines, fieldnames=self._fieldnames))
+        if records:
+            self.attendance_data.extend(records)
+            self._append_columns(records)
+    
+    def _build_columns(self):
+        """Start empty NumPy columns; _append_columns adds records to them."""
+        self._names = np.array([], dtype=str)
+        self._dates = np.array([], dtype='datetime64[D]')
+        self._statuses = np.array([], dtype=str)
+        self._minutes = np.array([], dtype=np.int16)
+        self._hours = np.array([], dtype=np.int8)
+        self._name_keys, self._name_codes = np.unique(self._names, return_inverse=True)
+        self._stats_cache.clear()
+    
+    def _append_columns(self, records: List[Dict]):
+        """Extend the NumPy columns used for vectorized aggregation with new records."""
+        names = np.array([r.get('Name', '') for r in records], dtype=str)
+        dates = _parse_dates([r.get('Date') or 'NaT' for r in records])
+        statuses = np.array([r.get('Status') or 'Present' for r in records], dtype=str)
+        
+        # Time of day as minutes and hour since midnight; -1 where Time is missing
+        minutes = np.array([_parse_minutes(r.get('Time')) for r in records], dtype=np.int16)
+        hours = np.where(minutes >= 0, minutes // 60, -1).astype(np.int8)
+        
+        self._names = np.concatenate([self._names, names])
+        self._dates = np.concatenate([self._dates, dates])
+        self._statuses = np.concatenate([self._statuses, statuses])
+        self._minutes = np.concatenate([self._minutes, minutes])
+        self._hours = np.concatenate([self._hours, hours])
+        
+        # Integer code per distinct name, for counting unique (date, name) pairs
+        self._name_keys, self._name_codes = np.unique(self._names, return_inverse=True)
+        
+        # Aggregates are only valid for the records they were computed from
+        self._stats_cache.clear()
+    
+    def _refresh(self):
+        """Bring the data up to date with the attendance file.
+        
+        The file is append-only, so normally only the rows added since the
+        last read are parsed. It is reloaded in full when it shrinks
+        (replaced or truncated).
+        """
+        try:
+            stat = self.attendance_file.stat()
+        except OSError:
+            return
+        if (stat.st_mtime_ns, stat.st_size) == self._stamp and stat.st_size == self._offset:
+            return
+        if stat.st_size < self._offset:
+            self._load_data()
+            return
+        try:
+            self._read_new_rows()
+        except Exception as e:
+            logger.error(f"Error loading attendance data: {e}")
+    
     def get_daily_statistics(self, date: Optional[str] = None) -> Dict:
         """
         Get attendance statistics for a specific date.
@@ -61,28 +182,31 @@ class AnalyticsDashboard:
         if date is None:
             date = datetime.now().strftime("%Y-%m-%d")
         
-        daily_records = [r for r in self.attendance_data if r.get('Date') == date]
+        self._refresh()
+        key = ('daily', date)
+        if key not in self._stats_cache:
+            self._stats_cache[key] = self._compute_daily_statistics(date)
+        return self._stats_cache[key]
+    
+    def _compute_daily_statistics(self, date: str) -> Dict:
+        """Aggregate the loaded records for one date (see get_daily_statistics)."""
+        mask = self._dates == _parse_dates([date])[0]
         
-        unique_people = set(r['Name'] for r in daily_records)
+        unique_people = np.unique(self._names[mask])
         
         # Time distribution
-        time_counts = defaultdict(int)
-        for record in daily_records:
-            time_str = record.get('Time', '')
-            if time_str:
-                hour = time_str.split(':')[0]
-                time_counts[hour] += 1
+        time_counts = _count_hours(self._hours[mask])
         
         # Status distribution
-        status_counts = Counter(r.get('Status', 'Present') for r in daily_records)
+        status_counts = _count_values(self._statuses[mask])
         
         return {
             'date': date,
-            'total_records': len(daily_records),
+            'total_records': int(mask.sum()),
             'unique_people': len(unique_people),
-            'people_list': list(unique_people),
-            'time_distribution': dict(time_counts),
-            'status_distribution': dict(status_counts),
+            'people_list': unique_people.tolist(),
+            'time_distribution': time_counts,
+            'status_distribution': status_counts,
             'peak_hour': max(time_counts, key=time_counts.get) if time_counts else None
         }
     
@@ -93,36 +217,40 @@ class AnalyticsDashboard:
         Returns:
             Dictionary with weekly statistics
         """
-        today = datetime.now()
-        week_ago = today - timedelta(days=7)
-        
-        weekly_records = []
-        for record in self.attendance_data:
-            record_date = datetime.strptime(record.get('Date', ''), "%Y-%m-%d")
-            if week_ago <= record_date <= today:
-                weekly_records.append(record)
-        
-        # Daily breakdown
-        daily_breakdown = defaultdict(lambda: {'count': 0, 'people': set()})
-        for record in weekly_records:
-            date = record.get('Date')
-            daily_breakdown[date]['count'] += 1
-            daily_breakdown[date]['people'].add(record['Name'])
-        
-        # Convert sets to counts
+        self._refresh()
+        # The 7-day window moves at midnight, so today's date is part of the key
+        key = ('weekly', datetime.now().date())
+        if key not in self._stats_cache:
+            self._stats_cache[key] = self._compute_weekly_statistics(key[1])
+        return self._stats_cache[key]
+    
+    def _compute_weekly_statistics(self, today_date) -> Dict:
+        """Aggregate the loaded records for the 7 days up to today_date (see get_weekly_statistics)."""
+        today = np.datetime64(today_date, 'D')
+        mask = (self._dates > today - 7) & (self._dates <= today)
+        
+        # Daily breakdown: records per date, and distinct (date, name) pairs per date
+        dates, date_index, date_counts = np.unique(
+            self._dates[mask], return_inverse=True, return_counts=True
+        )
+        name_codes = self._name_codes[mask]
+        pairs = np.unique(date_index * len(self._name_keys) + name_codes)
+        people_per_date = np.bincount(pairs // max(len(self._name_keys), 1), minlength=len(dates))
+        
         daily_stats = {
-            date: {
-                'total_records': stats['count'],
-                'unique_people': len(stats['people'])
+            str(date): {
+                'total_records': int(count),
+                'unique_people': int(people)
             }
-            for date, stats in daily_breakdown.items()
+            for date, count, people in zip(dates, date_counts, people_per_date)
         }
         
+        total_records = int(mask.sum())
         return {
-            'total_records': len(weekly_records),
-            'unique_people': len(set(r['Name'] for r in weekly_records)),
+            'total_records': total_records,
+            'unique_people': len(np.unique(name_codes)),
             'daily_breakdown': daily_stats,
-            'average_daily': len(weekly_records) / 7
+            'average_daily': total_records / 7
         }
     
     def get_person_statistics(self, person_name: str) -> Dict:
@@ -135,9 +263,10 @@ class AnalyticsDashboard:
         Returns:
             Dictionary with person-specific statistics
         """
-        person_records = [r for r in self.attendance_data if r['Name'] == person_name]
+        self._refresh()
+        indices = np.flatnonzero(self._names == person_name)
         
-        if not person_records:
+        if not len(indices):
             return {
                 'name': person_name,
                 'total_attendance': 0,
@@ -145,83 +274,178 @@ class AnalyticsDashboard:
                 'average_time': None
             }
         
-        dates = [r.get('Date') for r in person_records]
-        times = [r.get('Time') for r in person_records]
+        dates = [self.attendance_data[i].get('Date') for i in indices]
         
         # Calculate average attendance time
-        time_minutes = []
-        for time_str in times:
-            if time_str:
-                parts = time_str.split(':')
-                if len(parts) >= 2:
-                    hours, minutes = int(parts[0]), int(parts[1])
-                    time_minutes.append(hours * 60 + minutes)
-        
-        avg_minutes = int(np.mean(time_minutes)) if time_minutes else 0
+        minutes = self._minutes[indices]
+        minutes = minutes[minutes >= 0]
+        avg_minutes = int(minutes.mean()) if len(minutes) else 0
         avg_time = f"{avg_minutes // 60:02d}:{avg_minutes % 60:02d}"
         
-        # Attendance pattern (day of week)
-        day_counts = defaultdict(int)
-        for date_str in dates:
-            date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-            day_name = date_obj.strftime("%A")
-            day_counts[day_name] += 1
+        # Attendance pattern (day of week); 1970-01-01 was a Thursday (weekday 3)
+        day_numbers = self._dates[indices]
+        day_numbers = (day_numbers[~np.isnat(day_numbers)].astype(np.int64) + 3) % 7
+        day_counts = np.bincount(day_numbers, minlength=7)
         
         return {
             'name': person_name,
-            'total_attendance': len(person_records),
+            'total_attendance': len(indices),
             'dates': dates,
             'average_time': avg_time,
-            'day_distribution': dict(day_counts),
+            'day_distribution': {calendar.day_name[day]: int(count)
+                                 for day, count in enumerate(day_counts) if count},
             'first_attendance': min(dates) if dates else None,
             'last_attendance': max(dates) if dates else None
         }
     
-    def plot_daily_attendance(self, days: int = 30, save_path: Optional[str] = None):
+    @property
+    def plot_cache_dir(self) -> Path:
+        """Directory of rendered plots, next to the attendance file."""
+        return self.attendance_file.parent / '.plot_cache'
+    
+    def _plot_cache_path(self, save_path: Optional[str], *params) -> Optional[Path]:
         """
-        Plot daily attendance trend.
+        Cache file for a plot of the current attendance file.
         
         Args:
-            days: Number of days to include
-            save_path: Path to save the plot (optional)
+            save_path: Where the plot is being saved; nothing is cached when None
+            params: Everything besides the data the plot depends on
+            
+        Returns:
+            Path of the cached image (which may not exist yet), or None
         """
-        today = datetime.now()
-        start_date = today - timedelta(days=days)
-        
-        # Collect daily counts
-        daily_counts = defaultdict(int)
-        for record in self.attendance_data:
-            record_date = datetime.strptime(record.get('Date', ''), "%Y-%m-%d")
-            if start_date <= record_date <= today:
-                daily_counts[record['Date']] += 1
-        
-        # Prepare data for plotting
-        dates = sorted(daily_counts.keys())
-        counts = [daily_counts[date] for date in dates]
-        date_objects = [datetime.strptime(d, "%Y-%m-%d") for d in dates]
-        
-        # Create plot
-        plt.figure(figsize=(12, 6))
-        plt.plot(date_objects, counts, marker='o', linewidth=2, markersize=6)
-        plt.xlabel('Date', fontsize=12)
-        plt.ylabel('Attendance Count', fontsize=12)
-        plt.title(f'Daily Attendance Trend (Last {days} Days)', fontsize=14, fontweight='bold')
-        plt.grid(True, alpha=0.3)
+        if not save_path:
+            return None
+        try:
+            stat = self.attendance_file.stat()
+        except OSError:
+            return None
+        suffix = Path(save_path).suffix or '.png'
+        digest = hashlib.blake2b(repr((params, suffix)).encode(), digest_size=8).hexdigest()
+        # The file's stamp leads the name so stale entries are easy to find
+        return self.plot_cache_dir / f"{stat.st_mtime_ns}-{stat.st_size}-{digest}{suffix}"
+    
+    def _copy_cached_plot(self, cache_path: Optional[Path], save_path: Optional[str]) -> bool:
+        """Copy a cached plot to save_path; False if there is none."""
+        if cache_path is None or not cache_path.exists():
+            return False
+        try:
+            shutil.copyfile(cache_path, save_path)
+        except OSError as e:
+            logger.warning(f"Could not use cached plot: {e}")
+            return False
+        logger.info(f"Plot saved to {save_path} (cached)")
+        return True
+    
+    def _store_cached_plot(self, cache_path: Optional[Path], save_path: str):
+        """Keep a copy of a saved plot, dropping plots of older attendance data."""
+        if cache_path is None:
+            return
+        try:
+            cache_path.parent.mkdir(exist_ok=True)
+            stamp = cache_path.name.rsplit('-', 1)[0]
+            for old in cache_path.parent.iterdir():
+                if not old.name.startswith(stamp + '-'):
+                    old.unlink()
+            shutil.copyfile(save_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not cache plot: {e}")
+    
+    def _new_plot(self, figsize: Tuple[float, float], save_path: Optional[str]):
+        """
+        Start a plot on a fresh single-axes figure.
         
-        # Format x-axis
-        plt.gca().xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
-        plt.gca().xaxis.set_major_locator(mdates.DayLocator(interval=max(1, days // 10)))
-        plt.xticks(rotation=45)
+        Saved plots are drawn on one Agg figure that is cleared and reused
+        across calls, without going through pyplot or the interactive backend.
+        Shown plots get a pyplot figure.
         
-        plt.tight_layout()
+        Args:
+            figsize: Figure size in inches
+            save_path: Where the plot will be saved, or None to show it
+            
+        Returns:
+            (figure, axes)
+        """
+        if save_path:
+            if self._figure is None:
+                from matplotlib.figure import Figure
+                from matplotlib.backends.backend_agg import FigureCanvasAgg
+                self._figure = Figure()
+                FigureCanvasAgg(self._figure)
+            fig = self._figure
+            fig.clear()
+            fig.set_size_inches(figsize)
+        else:
+            import matplotlib.pyplot as plt
+            fig = plt.figure(figsize=figsize)
+        return fig, fig.add_subplot()
+    
+    def _finish_plot(self, fig, save_path: Optional[str], cache_path: Optional[Path]):
+        """Save (and cache) or show a plot started with _new_plot."""
+        fig.tight_layout()
         
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            fig.savefig(save_path, dpi=300, bbox_inches='tight')
+            self._store_cached_plot(cache_path, save_path)
             logger.info(f"Plot saved to {save_path}")
         else:
+            import matplotlib.pyplot as plt
             plt.show()
+            plt.close(fig)
+    
+    def plot_daily_attendance(self, days: int = 30, save_path: Optional[str] = None):
+        """
+        Plot daily attendance trend.
+        
+        Args:
+            days: Number of days to include
+            save_path: Path to save the plot (optional)
+        """
+        # Beyond these many points, markers are dropped / days are summed into weeks
+        MAX_MARKED_POINTS = 200
+        MAX_DAILY_POINTS = 1000
+        
+        today = np.datetime64(datetime.now().date(), 'D')
+        cache_path = self._plot_cache_path(save_path, 'daily', days, str(today))
+        if self._copy_cached_plot(cache_path, save_path):
+            return
         
-        plt.close()
+        import matplotlib
+        import matplotlib.dates as mdates
+        
+        self._refresh()
+        
+        # Collect daily counts from the parsed date column
+        mask = (self._dates > today - days) & (self._dates <= today)
+        dates, counts = np.unique(self._dates[mask], return_counts=True)
+        
+        if len(dates) > MAX_DAILY_POINTS:
+            # Sum into weeks starting on Monday (1970-01-01 was a Thursday)
+            week_starts = dates - (dates.astype(np.int64) + 3) % 7
+            dates, starts = np.unique(week_starts, return_index=True)
+            counts = np.add.reduceat(counts, starts)
+        
+        # Plain day numbers, so matplotlib converts no date objects per point
+        x = mdates.date2num(dates)
+        
+        # Create plot; path simplification merges segments too short to see
+        with matplotlib.rc_context({'path.simplify': True, 'path.simplify_threshold': 1.0}):
+            fig, ax = self._new_plot((12, 6), save_path)
+            if len(dates) > MAX_MARKED_POINTS:
+                ax.plot(x, counts, linewidth=1)
+            else:
+                ax.plot(x, counts, marker='o', linewidth=2, markersize=6)
+            ax.set_xlabel('Date', fontsize=12)
+            ax.set_ylabel('Attendance Count', fontsize=12)
+            ax.set_title(f'Daily Attendance Trend (Last {days} Days)', fontsize=14, fontweight='bold')
+            ax.grid(True, alpha=0.3)
+            
+            # Format x-axis
+            ax.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
+            ax.xaxis.set_major_locator(mdates.DayLocator(interval=max(1, days // 10)))
+            ax.tick_params(axis='x', labelrotation=45)
+            
+            self._finish_plot(fig, save_path, cache_path)
     
     def plot_hourly_distribution(self, date: Optional[str] = None, save_path: Optional[str] = None):
         """
@@ -231,43 +455,36 @@ class AnalyticsDashboard:
             date: Specific date (YYYY-MM-DD). If None, uses all data.
             save_path: Path to save the plot (optional)
         """
+        cache_path = self._plot_cache_path(save_path, 'hourly', date)
+        if self._copy_cached_plot(cache_path, save_path):
+            return
+        
+        self._refresh()
+        record_hours = self._hours
         if date:
-            records = [r for r in self.attendance_data if r.get('Date') == date]
+            record_hours = record_hours[self._dates == _parse_dates([date])[0]]
             title = f'Hourly Attendance Distribution - {date}'
         else:
-            records = self.attendance_data
             title = 'Overall Hourly Attendance Distribution'
         
         # Count by hour
-        hour_counts = defaultdict(int)
-        for record in records:
-            time_str = record.get('Time', '')
-            if time_str:
-                hour = int(time_str.split(':')[0])
-                hour_counts[hour] += 1
+        hour_counts = np.bincount(record_hours[record_hours >= 0], minlength=24)
         
         # Prepare data
         hours = list(range(24))
-        counts = [hour_counts.get(h, 0) for h in hours]
+        counts = hour_counts[:24].tolist()
         
         # Create plot
-        plt.figure(figsize=(14, 6))
-        plt.bar(hours, counts, color='skyblue', edgecolor='navy', alpha=0.7)
-        plt.xlabel('Hour of Day', fontsize=12)
-        plt.ylabel('Attendance Count', fontsize=12)
-        plt.title(title, fontsize=14, fontweight='bold')
-        plt.xticks(hours, [f'{h:02d}:00' for h in hours], rotation=45)
-        plt.grid(True, axis='y', alpha=0.3)
-        
-        plt.tight_layout()
-        
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            logger.info(f"Plot saved to {save_path}")
-        else:
-            plt.show()
-        
-        plt.close()
+        fig, ax = self._new_plot((14, 6), save_path)
+        ax.bar(hours, counts, color='skyblue', edgecolor='navy', alpha=0.7)
+        ax.set_xlabel('Hour of Day', fontsize=12)
+        ax.set_ylabel('Attendance Count', fontsize=12)
+        ax.set_title(title, fontsize=14, fontweight='bold')
+        ax.set_xticks(hours)
+        ax.set_xticklabels([f'{h:02d}:00' for h in hours], rotation=45)
+        ax.grid(True, axis='y', alpha=0.3)
+        
+        self._finish_plot(fig, save_path, cache_path)
     
     def plot_top_attendees(self, top_n: int = 10, save_path: Optional[str] = None):
         """
@@ -277,6 +494,12 @@ class AnalyticsDashboard:
             top_n: Number of top attendees to show
             save_path: Path to save the plot (optional)
         """
+        cache_path = self._plot_cache_path(save_path, 'top', top_n)
+        if self._copy_cached_plot(cache_path, save_path):
+            return
+        
+        self._refresh()
+        
         # Count attendance per person
         person_counts = Counter(r['Name'] for r in self.attendance_data)
         
@@ -286,22 +509,14 @@ class AnalyticsDashboard:
         counts = [count for _, count in top_people]
         
         # Create plot
-        plt.figure(figsize=(12, 8))
-        plt.barh(names, counts, color='coral', edgecolor='darkred', alpha=0.7)
-        plt.xlabel('Attendance Count', fontsize=12)
-        plt.ylabel('Person', fontsize=12)
-        plt.title(f'Top {top_n} Attendees', fontsize=14, fontweight='bold')
-        plt.grid(True, axis='x', alpha=0.3)
-        
-        plt.tight_layout()
-        
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            logger.info(f"Plot saved to {save_path}")
-        else:
-            plt.show()
-        
-        plt.close()
+        fig, ax = self._new_plot((12, 8), save_path)
+        ax.barh(names, counts, color='coral', edgecolor='darkred', alpha=0.7)
+        ax.set_xlabel('Attendance Count', fontsize=12)
+        ax.set_ylabel('Person', fontsize=12)
+        ax.set_title(f'Top {top_n} Attendees', fontsize=14, fontweight='bold')
+        ax.grid(True, axis='x', alpha=0.3)
+        
+        self._finish_plot(fig, save_path, cache_path)
     
     def export_report(self, output_file: str = "attendance_report.json"):
         """
@@ -310,10 +525,11 @@ class AnalyticsDashboard:
         Args:
             output_file: Path to output JSON file
         """
+        self._refresh()
         report = {
             'generated_at': datetime.now().isoformat(),
             'total_records': len(self.attendance_data),
-            'unique_people': len(set(r['Name'] for r in self.attendance_data)),
+            'unique_people': len(self._name_keys),
             'daily_stats': self.get_daily_statistics(),
             'weekly_stats': self.get_weekly_statistics(),
             'date_range': {
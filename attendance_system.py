@@ -8,6 +8,8 @@ Records are saved to a CSV file with timestamps.
 import os
 import csv
 import logging
+import time
+import weakref
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, List, Dict, Set, Any
@@ -15,7 +17,9 @@ from typing import Optional, List, Dict, Set, Any
 import cv2
 import face_recognition
 import numpy as np
-from face_recognition_system import FaceRecognitionSystem
+
+import fast_ops
+from face_recognition_system import FaceRecognitionSystem, LatestFrameReader
 
 logger = logging.getLogger(__name__)
 
@@ -43,24 +47,41 @@ class AttendanceSystem(FaceRecognitionSystem):
         super().__init__(encodings_file)
         self.attendance_file = Path(attendance_file)
         self.today_attendance: Set[str] = set()
+        self._attendance_fh = None  # Append handle, opened on first write
+        self._attendance_writer = None
+        self._attendance_ino = None
         self._load_today_attendance()
     
     def _load_today_attendance(self) -> None:
-        """Load today's attendance from file."""
+        """Load today's attendance from file.
+        
+        Rows dated today are located with bytes.find, so only those rows
+        are decoded and parsed; the rest of the file is skipped in C.
+        """
         if not self.attendance_file.exists():
             return
         
         today = datetime.now().strftime("%Y-%m-%d")
+        needle = f",{today},".encode()
         
         try:
-            with open(self.attendance_file, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                next(reader, None)  # Skip header
-                
-                for row in reader:
-                    if len(row) >= 2 and row[1] == today:
-                        self.today_attendance.add(row[0])
-        except (IOError, csv.Error) as e:
+            with open(self.attendance_file, 'rb') as f:
+                data = f.read()
+            
+            lines = []
+            pos = data.find(needle)
+            while pos != -1:
+                start = data.rfind(b'\n', 0, pos) + 1
+                end = data.find(b'\n', pos)
+                if end == -1:
+                    end = len(data)
+                lines.append(data[start:end].decode('utf-8'))
+                pos = data.find(needle, end)
+            
+            for row in csv.reader(lines):
+                if len(row) >= 2 and row[1] == today:
+                    self.today_attendance.add(row[0])
+        except (IOError, csv.Error, UnicodeDecodeError) as e:
             logger.error(f"Error loading today's attendance: {e}")
     
     def _initialize_csv(self) -> None:
@@ -74,6 +95,33 @@ class AttendanceSystem(FaceRecognitionSystem):
             except IOError as e:
                 logger.error(f"Error initializing CSV file: {e}")
     
+    def _get_attendance_writer(self):
+        """Return a csv writer appending to the attendance file.
+        
+        The file stays open between calls; it is reopened only when the
+        path no longer refers to the opened file (deleted or replaced).
+        """
+        try:
+            ino = self.attendance_file.stat().st_ino
+        except OSError:
+            ino = None
+        if self._attendance_fh is None or ino != self._attendance_ino:
+            self.close()
+            self._initialize_csv()
+            self._attendance_fh = open(self.attendance_file, 'a', newline='', encoding='utf-8')
+            self._attendance_writer = csv.writer(self._attendance_fh)
+            self._attendance_ino = os.fstat(self._attendance_fh.fileno()).st_ino
+            weakref.finalize(self, self._attendance_fh.close)
+        return self._attendance_writer
+    
+    def close(self) -> None:
+        """Close the attendance file handle (it is reopened on the next write)."""
+        if self._attendance_fh is not None:
+            self._attendance_fh.close()
+            self._attendance_fh = None
+            self._attendance_writer = None
+            self._attendance_ino = None
+    
     def mark_attendance(self, name: str, status: str = "Present") -> bool:
         """
         Mark attendance for a person.
@@ -85,29 +133,43 @@ class AttendanceSystem(FaceRecognitionSystem):
         Returns:
             bool: True if attendance was marked, False if already marked today
         """
-        if name == "Unknown":
-            return False
-        
-        if name in self.today_attendance:
-            return False
+        return bool(self.mark_attendance_many([name], status))
+    
+    def mark_attendance_many(self, names: List[str], status: str = "Present") -> List[str]:
+        """
+        Mark attendance for everyone recognized in one frame with a single write.
         
-        self._initialize_csv()
+        Args:
+            names: Names of the people; "Unknown" and repeats are ignored
+            status: Attendance status (Present, Late, etc.)
+            
+        Returns:
+            List[str]: The names newly marked, in order
+        """
+        new_names = []
+        for name in names:
+            if name != "Unknown" and name not in self.today_attendance and name not in new_names:
+                new_names.append(name)
+        if not new_names:
+            return []
         
         now = datetime.now()
         date = now.strftime("%Y-%m-%d")
         time_str = now.strftime("%H:%M:%S")
         
         try:
-            with open(self.attendance_file, 'a', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow([name, date, time_str, status])
-            
-            self.today_attendance.add(name)
-            logger.info(f"Attendance marked for {name} at {time_str} - {status}")
-            return True
-        except IOError as e:
+            self._get_attendance_writer().writerows([name, date, time_str, status] for name in new_names)
+            # Flushed per call so readers of the file see the rows right away
+            self._attendance_fh.flush()
+        except (IOError, OSError) as e:
             logger.error(f"Error marking attendance: {e}")
-            return False
+            self.close()
+            return []
+        
+        self.today_attendance.update(new_names)
+        for name in new_names:
+            logger.info(f"Attendance marked for {name} at {time_str} - {status}")
+        return new_names
     
     def run_attendance_camera(self, tolerance=0.6, scale=0.25, 
                                late_time=None, end_time=None):
@@ -129,12 +191,17 @@ class AttendanceSystem(FaceRecognitionSystem):
         print("Starting attendance system. Press 'q' to quit.")
         print("Faces will be automatically recognized and attendance marked.")
         
-        process_this_frame = True
+        # Seconds between recognition passes; frames in between reuse the last result
+        RECOGNITION_INTERVAL = 0.2
+        
+        reader = LatestFrameReader(cap)
+        last_recognition = 0.0
         face_locations = []
         face_names = []
+        rgb_small_frame = None  # Preallocated on the first frame, then reused
         
         while True:
-            ret, frame = cap.read()
+            ret, frame = reader.read()
             if not ret:
                 break
             
@@ -145,32 +212,32 @@ class AttendanceSystem(FaceRecognitionSystem):
                     print(f"\nEnd time reached ({end_time}). Stopping attendance.")
                     break
             
-            if process_this_frame:
+            # Recognize on a fixed wall-clock cadence, whatever the camera's frame rate
+            tick = time.monotonic()
+            if tick - last_recognition >= RECOGNITION_INTERVAL:
+                last_recognition = tick
+                
                 # Resize and convert
-                small_frame = cv2.resize(frame, (0, 0), fx=scale, fy=scale)
-                rgb_small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
+                if rgb_small_frame is None:
+                    h, w = frame.shape[:2]
+                    rgb_small_frame = np.empty((int(h * scale), int(w * scale), 3), dtype=np.uint8)
+                fast_ops.resize_to_rgb(frame, rgb_small_frame)
                 
                 # Detect faces
                 face_locations = face_recognition.face_locations(rgb_small_frame)
                 face_encodings = face_recognition.face_encodings(rgb_small_frame, face_locations)
                 
-                face_names = []
-                for encoding in face_encodings:
-                    name = self._match_face(encoding, tolerance)
-                    face_names.append(name)
-                    
-                    # Mark attendance
-                    if name != "Unknown":
-                        # Determine status
-                        status = "Present"
-                        if late_time:
-                            current_time = datetime.now().strftime("%H:%M")
-                            if current_time > late_time:
-                                status = "Late"
-                        
-                        self.mark_attendance(name, status)
-            
-            process_this_frame = not process_this_frame
+                face_names = self.match_faces(face_encodings, tolerance)
+                
+                # Determine status
+                status = "Present"
+                if late_time:
+                    current_time = datetime.now().strftime("%H:%M")
+                    if current_time > late_time:
+                        status = "Late"
+                
+                # Mark attendance for the whole frame at once
+                self.mark_attendance_many(face_names, status)
             
             # Draw results
             for (top, right, bottom, left), name in zip(face_locations, face_names):
@@ -211,6 +278,7 @@ class AttendanceSystem(FaceRecognitionSystem):
             if cv2.waitKey(1) & 0xFF == ord('q'):
                 break
         
+        reader.stop()
         cap.release()
         cv2.destroyAllWindows()
         
@@ -6,9 +6,14 @@ Centralized configuration for all advanced features.
 
 # ==================== FACE DETECTION ====================
 FACE_DETECTION = {
-    # Detection backend: 'mediapipe', 'mtcnn', 'retinaface', 'opencv'
+    # Detection backend: 'mediapipe', 'mtcnn', 'retinaface', 'retinaface_trt',
+    # 'retinaface_jit', 'retinaface_dnn', 'opencv', 'opencv_dnn' (ResNet-10 SSD,
+    # on OpenVINO when OpenCV is built with it)
     'backend': 'mediapipe',
     
+    # Inference device: 'auto', 'cpu', 'cuda', 'tensorrt'
+    'device': 'auto',
+    
     # Minimum detection confidence (0.0 - 1.0)
     'min_confidence': 0.5,
     
@@ -186,6 +191,10 @@ PERFORMANCE = {
     
     # Enable face tracking (faster but less accurate)
     'face_tracking': True,
+    
+    # Match faces against a float16 copy of the encodings (half the memory
+    # traffic; distances change by ~1e-3, well below the 0.6 tolerance)
+    'half_precision_encodings': True,
 }
 
 # ==================== SECURITY ====================
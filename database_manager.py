@@ -9,6 +9,7 @@ import json
 import sqlite3
 import pickle
 import shutil
+import hashlib
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
@@ -17,6 +18,55 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def file_stamp(path) -> Optional[List[int]]:
+    """[mtime_ns, size] of a file, or None if it cannot be stat'ed."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def names_sidecar_path(encodings_file) -> Path:
+    """JSON sidecar listing the registered names, readable without loading encodings."""
+    return Path(encodings_file).with_suffix('.names.json')
+
+
+def write_names_sidecar(encodings_file, names: List[str]) -> None:
+    """
+    Write the names sidecar, stamped with the encodings file it describes.
+    
+    Args:
+        encodings_file: Pickle the names were saved in (already written)
+        names: Registered names, in the pickle's order
+    """
+    try:
+        with open(names_sidecar_path(encodings_file), 'w', encoding='utf-8') as f:
+            json.dump({'source': file_stamp(encodings_file), 'names': list(names)}, f)
+    except IOError as e:
+        logger.warning(f"Could not write names sidecar: {e}")
+
+
+def read_names_sidecar(encodings_file) -> Optional[List[str]]:
+    """
+    Read the names sidecar.
+    
+    Returns:
+        The names, or None if the sidecar is missing, unreadable or was
+        written for a different version of the encodings file
+    """
+    try:
+        with open(names_sidecar_path(encodings_file), encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('source') is None:
+        return None
+    if data['source'] != file_stamp(encodings_file):
+        return None
+    return data.get('names')
+
+
 class DatabaseManager:
     """Manage face recognition database with advanced backup and export features."""
     
@@ -30,6 +80,7 @@ class DatabaseManager:
         self.encodings_file = Path(encodings_file)
         self.backup_dir = Path("backups")
         self.backup_dir.mkdir(exist_ok=True)
+        self._stats_cache = (None, None)
     
     def create_backup(self, include_timestamp: bool = True) -> Optional[str]:
         """
@@ -45,6 +96,12 @@ class DatabaseManager:
             logger.warning("No database file to backup")
             return None
         
+        # A copy of an unchanged database would only push older backups out
+        latest = self.latest_backup()
+        if include_timestamp and latest is not None and self._same_content(latest, self.encodings_file):
+            logger.info(f"Database unchanged since {latest.name}, no new backup needed")
+            return str(latest)
+        
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_name = f"face_encodings_backup_{timestamp}.pkl" if include_timestamp else "face_encodings_backup.pkl"
@@ -57,6 +114,36 @@ class DatabaseManager:
             logger.error(f"Backup creation failed: {e}")
             return None
     
+    def latest_backup(self) -> Optional[Path]:
+        """Newest timestamped backup (names sort by time), or None."""
+        return max(self.backup_dir.glob("face_encodings_backup_*.pkl"), default=None)
+    
+    @staticmethod
+    def _file_digest(path: Path) -> bytes:
+        """BLAKE2b digest of a file's contents."""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.digest()
+    
+    @classmethod
+    def _same_content(cls, a: Path, b: Path) -> bool:
+        """Whether two files hold the same bytes (sizes are compared first)."""
+        try:
+            if a.stat().st_size != b.stat().st_size:
+                return False
+            return cls._file_digest(a) == cls._file_digest(b)
+        except OSError:
+            return False
+    
+    @staticmethod
+    def _encoding_key(name: str, encoding) -> bytes:
+        """Content hash identifying one (name, encoding) record."""
+        import numpy as np
+        data = name.encode('utf-8') + b'\0' + np.asarray(encoding, dtype=np.float64).tobytes()
+        return hashlib.blake2b(data, digest_size=8).digest()
+    
     def auto_backup(self, max_backups: int = 10):
         """
         Automatically manage backups, keeping only the most recent ones.
@@ -100,6 +187,8 @@ class DatabaseManager:
             
             # Restore from backup
             shutil.copy2(backup_file, self.encodings_file)
+            with open(self.encodings_file, 'rb') as f:
+                write_names_sidecar(self.encodings_file, pickle.load(f).get('names', []))
             logger.info(f"Database restored from: {backup_path}")
             return True
         except Exception as e:
@@ -174,9 +263,28 @@ class DatabaseManager:
                 with open(self.encodings_file, 'rb') as f:
                     existing_data = pickle.load(f)
                 
-                # Merge
-                encodings = existing_data.get('encodings', []) + encodings
-                names = existing_data.get('names', []) + names
+                existing_encodings = existing_data.get('encodings', [])
+                existing_names = existing_data.get('names', [])
+                
+                # Merge, skipping records the database already holds
+                known = {self._encoding_key(name, encoding)
+                         for name, encoding in zip(existing_names, existing_encodings)}
+                new_records = []
+                for name, encoding in zip(names, encodings):
+                    key = self._encoding_key(name, encoding)
+                    if key not in known:
+                        known.add(key)
+                        new_records.append((name, encoding))
+                
+                skipped = len(names) - len(new_records)
+                if skipped:
+                    logger.info(f"Skipped {skipped} record(s) already in the database")
+                if not new_records:
+                    logger.info(f"Nothing new to import from {json_file}")
+                    return True
+                
+                encodings = existing_encodings + [encoding for _, encoding in new_records]
+                names = existing_names + [name for name, _ in new_records]
             
             # Save merged/new data
             data = {
@@ -191,6 +299,7 @@ class DatabaseManager:
             
             with open(self.encodings_file, 'wb') as f:
                 pickle.dump(data, f)
+            write_names_sidecar(self.encodings_file, names)
             
             logger.info(f"Database imported from JSON: {json_file}")
             logger.info(f"Total faces: {len(names)}, Merge mode: {merge}")
@@ -217,9 +326,12 @@ class DatabaseManager:
             with open(self.encodings_file, 'rb') as f:
                 data = pickle.load(f)
             
-            # Create SQLite connection
-            conn = sqlite3.connect(db_file)
+            # Autocommit connection; the inserts run in one explicit transaction below.
+            # WAL with synchronous=NORMAL avoids an fsync per commit.
+            conn = sqlite3.connect(db_file, isolation_level=None)
             cursor = conn.cursor()
+            cursor.execute('PRAGMA journal_mode=WAL')
+            cursor.execute('PRAGMA synchronous=NORMAL')
             
             # Create tables
             cursor.execute('''
@@ -243,26 +355,31 @@ class DatabaseManager:
             # Insert data
             names = data.get('names', [])
             encodings = data.get('encodings', [])
+            created_at = datetime.now().isoformat()
             
-            person_ids = {}
-            for i, (name, encoding) in enumerate(zip(names, encodings)):
-                # Get or create person
-                if name not in person_ids:
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                # One row per person (ids are needed for the encodings)
+                person_ids = {}
+                for name in dict.fromkeys(names):
                     cursor.execute(
                         'INSERT INTO persons (name, created_at) VALUES (?, ?)',
-                        (name, datetime.now().isoformat())
+                        (name, created_at)
                     )
                     person_ids[name] = cursor.lastrowid
                 
-                # Insert encoding
-                encoding_blob = pickle.dumps(encoding)
-                cursor.execute(
+                # All encodings in one prepared statement
+                cursor.executemany(
                     'INSERT INTO face_encodings (person_id, encoding, created_at) VALUES (?, ?, ?)',
-                    (person_ids[name], encoding_blob, datetime.now().isoformat())
+                    ((person_ids[name], pickle.dumps(encoding), created_at)
+                     for name, encoding in zip(names, encodings))
                 )
-            
-            conn.commit()
-            conn.close()
+                cursor.execute('COMMIT')
+            except Exception:
+                cursor.execute('ROLLBACK')
+                raise
+            finally:
+                conn.close()
             
             logger.info(f"Database exported to SQLite: {db_file}")
             return True
@@ -270,26 +387,57 @@ class DatabaseManager:
             logger.error(f"SQLite export failed: {e}")
             return False
     
-    def list_backups(self) -> List[Dict]:
+    def list_backups(self, after: Optional[str] = None) -> List[Dict]:
         """
-        List all available backups.
+        List available backups, newest first.
         
+        Args:
+            after: Only list backups whose filename sorts after this one
+                   (backup names embed their timestamp), to pick up new
+                   backups without stat-ing the old ones
+            
         Returns:
             List of dictionaries with backup information
         """
-        backups = []
+        backup_files = self.backup_dir.glob("face_encodings_backup_*.pkl")
+        if after is not None:
+            backup_files = (f for f in backup_files if f.name > after)
         
-        for backup_file in sorted(self.backup_dir.glob("face_encodings_backup_*.pkl"), reverse=True):
-            stat = backup_file.stat()
-            backups.append({
-                'filename': backup_file.name,
-                'path': str(backup_file),
-                'size': stat.st_size,
-                'created': datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                'size_mb': stat.st_size / (1024 * 1024)
-            })
+        return [self.backup_info(f) for f in sorted(backup_files, reverse=True)]
+    
+    def backup_dir_stamp(self) -> Optional[int]:
+        """
+        Modification time of the backup folder, which changes whenever a
+        backup is added or removed.
+        
+        Returns:
+            mtime in nanoseconds, or None if the folder is missing
+        """
+        try:
+            return self.backup_dir.stat().st_mtime_ns
+        except OSError:
+            return None
+    
+    @staticmethod
+    def backup_info(backup_path) -> Dict:
+        """
+        Describe one backup file.
         
-        return backups
+        Args:
+            backup_path: Path to the backup file
+            
+        Returns:
+            Dictionary with backup information
+        """
+        backup_file = Path(backup_path)
+        stat = backup_file.stat()
+        return {
+            'filename': backup_file.name,
+            'path': str(backup_file),
+            'size': stat.st_size,
+            'created': datetime.fromtimestamp(stat.st_mtime).isoformat(),
+            'size_mb': stat.st_size / (1024 * 1024)
+        }
     
     def get_database_stats(self) -> Dict:
         """
@@ -298,7 +446,9 @@ class DatabaseManager:
         Returns:
             Dictionary with database statistics
         """
-        if not self.encodings_file.exists():
+        try:
+            stat = self.encodings_file.stat()
+        except OSError:
             return {
                 'exists': False,
                 'size': 0,
@@ -306,14 +456,23 @@ class DatabaseManager:
                 'unique_persons': 0
             }
         
+        # Unpickling the whole database is the slow part; reuse it until the file changes
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached_key, cached_stats = self._stats_cache
+        if key == cached_key:
+            return cached_stats
+        
+        stats = self._read_database_stats(stat)
+        self._stats_cache = (key, stats)
+        return stats
+    
+    def _read_database_stats(self, stat) -> Dict:
+        """Load the encodings file and describe it (see get_database_stats)."""
         try:
             with open(self.encodings_file, 'rb') as f:
                 data = pickle.load(f)
             
             names = data.get('names', [])
-            encodings = data.get('encodings', [])
-            
-            stat = self.encodings_file.stat()
             
             return {
                 'exists': True,
@@ -5,29 +5,134 @@ Detects facial emotions using deep learning models.
 Supports multiple emotions: happy, sad, angry, neutral, surprised, fearful, disgusted.
 """
 
+import os
 import cv2
 import numpy as np
+from contextlib import nullcontext
 from typing import Dict, Tuple, Optional, List
 from collections import deque
 import logging
 
 logger = logging.getLogger(__name__)
 
+# FER's emotion classifier quantized to INT8 (see quantize_models.py)
+EMOTION_ONNX_INT8_PATH = os.path.join("models", "emotion_fer_int8.onnx")
+
+# Input side of FER's classifier (64x64 grayscale)
+FER_INPUT_SIZE = 64
+
+
+def fer_input(face_img: np.ndarray) -> np.ndarray:
+    """
+    Convert a face crop to the (1, 64, 64, 1) float32 input of FER's classifier.
+    
+    Args:
+        face_img: Face image (BGR or grayscale)
+        
+    Returns:
+        Input tensor scaled to [-1, 1], as FER feeds its Keras model
+    """
+    gray = cv2.cvtColor(face_img, cv2.COLOR_BGR2GRAY) if face_img.ndim == 3 else face_img
+    gray = cv2.resize(gray, (FER_INPUT_SIZE, FER_INPUT_SIZE), interpolation=cv2.INTER_AREA)
+    tensor = gray.astype(np.float32) * (2.0 / 255.0) - 1.0
+    return tensor[None, :, :, None]
+
+
+def pad_face_box(face_location: Tuple[int, int, int, int], frame_shape: Tuple[int, ...],
+                 padding: float = 0.2) -> Tuple[int, int, int, int]:
+    """
+    Grow a face box by a fraction of its size on every side, clipped to the frame.
+    
+    The classifier gets some context around the face this way; every path
+    that crops faces for it should pad them the same.
+    
+    Args:
+        face_location: (top, right, bottom, left) of the face
+        frame_shape: Shape of the frame the box is in
+        padding: Fraction of the box height/width added on each side
+        
+    Returns:
+        Padded (top, right, bottom, left)
+    """
+    top, right, bottom, left = face_location
+    pad_h = int((bottom - top) * padding)
+    pad_w = int((right - left) * padding)
+    return (max(0, top - pad_h), min(frame_shape[1], right + pad_w),
+            min(frame_shape[0], bottom + pad_h), max(0, left - pad_w))
+
+
+def preprocess_face(face_img: np.ndarray) -> np.ndarray:
+    """
+    Preprocess face image for better emotion detection.
+    
+    Args:
+        face_img: Face image (BGR or RGB)
+        
+    Returns:
+        Preprocessed face image
+    """
+    # Resize to standard size (48x48 is common for emotion models)
+    target_size = (96, 96)  # Larger for better FER performance
+    face_resized = cv2.resize(face_img, target_size, interpolation=cv2.INTER_CUBIC)
+    
+    # Convert to grayscale for preprocessing
+    if len(face_resized.shape) == 3:
+        gray = cv2.cvtColor(face_resized, cv2.COLOR_BGR2GRAY)
+    else:
+        gray = face_resized
+    
+    # Apply CLAHE (Contrast Limited Adaptive Histogram Equalization)
+    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(4, 4))
+    enhanced = clahe.apply(gray)
+    
+    # Convert back to color if needed
+    if len(face_img.shape) == 3:
+        enhanced_color = cv2.cvtColor(enhanced, cv2.COLOR_GRAY2BGR)
+        return enhanced_color
+    
+    return enhanced
+
+
+def fer_face_input(face_img: np.ndarray) -> np.ndarray:
+    """
+    Classifier input of a (padded) BGR face crop, exactly as EmotionRecognizer builds it.
+    
+    Used at runtime and for INT8 calibration (quantize_models.py), so both
+    see the same intensity distribution.
+    
+    Args:
+        face_img: Face crop (BGR), padded with pad_face_box
+        
+    Returns:
+        (1, 64, 64, 1) input tensor, see fer_input
+    """
+    return fer_input(preprocess_face(cv2.cvtColor(face_img, cv2.COLOR_BGR2RGB)))
+
 
 class EmotionRecognizer:
     """Recognize facial emotions using deep learning."""
     
     EMOTIONS = ['angry', 'disgust', 'fear', 'happy', 'sad', 'surprise', 'neutral']
     
-    def __init__(self, model_type: str = "opencv", smoothing_window: int = 10):
+    def __init__(self, model_type: str = "opencv", smoothing_window: int = 10,
+                 device: str = "auto", use_int8: bool = True):
         """
         Initialize emotion recognizer.
         
         Args:
             model_type: Type of model ('opencv', 'keras', 'fer')
             smoothing_window: Number of frames to average for stable predictions
+            device: Where the TensorFlow model runs ('auto', 'cpu', 'cuda');
+                    'auto' leaves placement to TensorFlow
+            use_int8: For 'fer', run the INT8 ONNX classifier when it has
+                      been generated with quantize_models.py
         """
         self.model_type = model_type.lower()
+        self.device = device.lower()
+        self.use_int8 = use_int8
+        self._device_scope = nullcontext
+        self._onnx = False
+        self._classifier = None  # FER's bare Keras classifier, loaded on first batch
         self.model = None
         self.smoothing_window = smoothing_window
         self.emotion_buffer = deque(maxlen=smoothing_window)
@@ -48,15 +153,61 @@ class EmotionRecognizer:
     
     def _init_fer(self):
         """Initialize FER (Facial Expression Recognition) library."""
+        if self.use_int8 and os.path.exists(EMOTION_ONNX_INT8_PATH):
+            try:
+                self._init_onnx_int8(EMOTION_ONNX_INT8_PATH)
+                return
+            except ImportError:
+                logger.warning("ONNX Runtime not installed, using the FER Keras model")
+        
         try:
             from fer import FER
             # Enable MTCNN for better face detection
             self.model = FER(mtcnn=True)
+            self._pin_device()
             logger.info("FER emotion detector initialized with MTCNN")
         except ImportError:
             logger.error("FER not installed. Install with: pip install fer")
             raise
     
+    def _init_onnx_int8(self, model_path: str):
+        """Initialize FER's classifier quantized to INT8 on ONNX Runtime.
+        
+        The face crop comes from the caller, so FER's own MTCNN pass is
+        skipped. Half the cores are left to the camera and UI threads.
+        """
+        import onnxruntime as ort
+        
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = max(1, (os.cpu_count() or 2) // 2)
+        self.model = ort.InferenceSession(model_path, options, providers=['CPUExecutionProvider'])
+        self._onnx_input = self.model.get_inputs()[0].name
+        self._onnx = True
+        logger.info("FER INT8 ONNX emotion classifier initialized")
+    
+    def _fer_classifier(self):
+        """FER's Keras emotion classifier on its own, without FER's MTCNN face detector."""
+        if self._classifier is None:
+            import fer
+            import tensorflow as tf
+            
+            path = os.path.join(os.path.dirname(fer.__file__), "data", "emotion_model.hdf5")
+            self._classifier = tf.keras.models.load_model(path, compile=False)
+        return self._classifier
+    
+    def _pin_device(self):
+        """Place TensorFlow inference on the configured device."""
+        if self.device == "auto":
+            return
+        
+        import tensorflow as tf
+        use_gpu = self.device != "cpu" and bool(tf.config.list_physical_devices('GPU'))
+        if self.device != "cpu" and not use_gpu:
+            logger.warning("No GPU visible to TensorFlow, emotion recognition stays on CPU")
+        name = '/GPU:0' if use_gpu else '/CPU:0'
+        self._device_scope = lambda: tf.device(name)
+    
     def _init_keras(self):
         """Initialize Keras-based emotion model."""
         try:
@@ -76,35 +227,8 @@ class EmotionRecognizer:
         self.model = "opencv_basic"
     
     def _preprocess_face(self, face_img: np.ndarray) -> np.ndarray:
-        """
-        Preprocess face image for better emotion detection.
-        
-        Args:
-            face_img: Face image (BGR or RGB)
-            
-        Returns:
-            Preprocessed face image
-        """
-        # Resize to standard size (48x48 is common for emotion models)
-        target_size = (96, 96)  # Larger for better FER performance
-        face_resized = cv2.resize(face_img, target_size, interpolation=cv2.INTER_CUBIC)
-        
-        # Convert to grayscale for preprocessing
-        if len(face_resized.shape) == 3:
-            gray = cv2.cvtColor(face_resized, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = face_resized
-        
-        # Apply CLAHE (Contrast Limited Adaptive Histogram Equalization)
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(4, 4))
-        enhanced = clahe.apply(gray)
-        
-        # Convert back to color if needed
-        if len(face_img.shape) == 3:
-            enhanced_color = cv2.cvtColor(enhanced, cv2.COLOR_GRAY2BGR)
-            return enhanced_color
-        
-        return enhanced
+        """Preprocess face image for better emotion detection (see preprocess_face)."""
+        return preprocess_face(face_img)
     
     def _smooth_emotions(self, current_emotions: Dict[str, float]) -> Dict[str, float]:
         """
@@ -163,52 +287,84 @@ class EmotionRecognizer:
     def _recognize_fer(self, frame: np.ndarray, 
                        face_location: Optional[Tuple[int, int, int, int]] = None) -> Dict:
         """Recognize emotion using FER library."""
-        # Convert BGR to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        # The ONNX classifier alone cannot find a face; classifying the whole
+        # frame would report an emotion for whatever is in view
+        if self._onnx and not face_location:
+            return self._default_emotion_result()
         
         # If face location provided, crop to that region with padding
         if face_location:
-            top, right, bottom, left = face_location
-            # Add 20% padding around face for better context
-            height = bottom - top
-            width = right - left
-            pad_h = int(height * 0.2)
-            pad_w = int(width * 0.2)
-            
-            top = max(0, top - pad_h)
-            bottom = min(frame.shape[0], bottom + pad_h)
-            left = max(0, left - pad_w)
-            right = min(frame.shape[1], right + pad_w)
-            
-            rgb_frame = rgb_frame[top:bottom, left:right]
-        
-        # Preprocess the face for better accuracy
-        processed_frame = self._preprocess_face(rgb_frame)
+            top, right, bottom, left = pad_face_box(face_location, frame.shape)
+            frame = frame[top:bottom, left:right]
         
-        # Detect emotions on preprocessed frame
-        result = self.model.detect_emotions(processed_frame)
+        if self._onnx:
+            scores = self.model.run(None, {self._onnx_input: fer_face_input(frame)})[0][0]
+            result = [{'emotions': dict(zip(self.EMOTIONS, scores.astype(float).tolist()))}]
+        else:
+            # Convert BGR to RGB, then preprocess the face for better accuracy
+            processed_frame = self._preprocess_face(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            # Detect emotions on preprocessed frame
+            with self._device_scope():
+                result = self.model.detect_emotions(processed_frame)
         
         if result and len(result) > 0:
-            # Get raw emotions
-            raw_emotions = result[0]['emotions']
-            
-            # Apply temporal smoothing
-            smoothed_emotions = self._smooth_emotions(raw_emotions)
-            
-            # Find dominant emotion from smoothed results
-            dominant_emotion = max(smoothed_emotions, key=smoothed_emotions.get)
-            confidence = smoothed_emotions[dominant_emotion]
-            
-            return {
-                'emotions': smoothed_emotions,
-                'dominant': dominant_emotion,
-                'confidence': confidence,
-                'detected': True,
-                'raw_emotions': raw_emotions  # Keep raw for debugging
-            }
+            return self._emotion_result(result[0]['emotions'])
         
         return self._default_emotion_result()
     
+    def _emotion_result(self, raw_emotions: Dict[str, float]) -> Dict:
+        """Smooth raw emotion scores and build the result dictionary."""
+        # Apply temporal smoothing
+        smoothed_emotions = self._smooth_emotions(raw_emotions)
+        
+        # Find dominant emotion from smoothed results
+        dominant_emotion = max(smoothed_emotions, key=smoothed_emotions.get)
+        confidence = smoothed_emotions[dominant_emotion]
+        
+        return {
+            'emotions': smoothed_emotions,
+            'dominant': dominant_emotion,
+            'confidence': confidence,
+            'detected': True,
+            'raw_emotions': raw_emotions  # Keep raw for debugging
+        }
+    
+    def recognize_emotions_batch(self, faces: List[np.ndarray]) -> List[Dict]:
+        """
+        Recognize emotions in several face crops with one model call.
+        
+        The crops are already faces, so with FER only the emotion classifier
+        runs (INT8 ONNX or Keras); FER's own MTCNN detection pass is skipped.
+        Other models fall back to one recognize_emotion call per face.
+        
+        Args:
+            faces: Face crops (BGR), padded with pad_face_box like the
+                   single-face path pads them
+            
+        Returns:
+            One result dictionary per face, as recognize_emotion returns
+        """
+        if self.model is None or self.model_type != "fer":
+            return [self.recognize_emotion(face) for face in faces]
+        if len(faces) == 0:
+            return []
+        
+        try:
+            batch = np.concatenate([fer_face_input(face) for face in faces])
+            if self._onnx:
+                scores = self.model.run(None, {self._onnx_input: batch})[0]
+            else:
+                with self._device_scope():
+                    scores = np.asarray(self._fer_classifier().predict_on_batch(batch))
+        except Exception as e:
+            logger.error(f"Emotion recognition error: {e}")
+            return [self._default_emotion_result() for _ in faces]
+        
+        return [
+            self._emotion_result(dict(zip(self.EMOTIONS, row.astype(float).tolist())))
+            for row in scores
+        ]
+    
     def _recognize_basic(self, frame: np.ndarray, 
                         face_location: Optional[Tuple[int, int, int, int]] = None) -> Dict:
         """Basic emotion recognition (placeholder)."""
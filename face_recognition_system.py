@@ -9,8 +9,14 @@ A complete face recognition system with the following features:
 """
 
 import os
+import io
+import json
 import pickle
+import shelve
+import hashlib
 import logging
+import threading
+import time
 from pathlib import Path
 from typing import Optional, List, Tuple, Dict, Any
 
@@ -20,6 +26,9 @@ import numpy.typing as npt
 import face_recognition
 from datetime import datetime
 
+import fast_ops
+from database_manager import file_stamp, names_sidecar_path, read_names_sidecar, write_names_sidecar
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -28,6 +37,62 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class LatestFrameReader:
+    """
+    Read a cv2.VideoCapture on a background thread, keeping only the newest frame.
+    
+    The camera is drained continuously, so a consumer that falls behind
+    gets the current frame rather than one that queued up while it was busy.
+    """
+    
+    def __init__(self, cap) -> None:
+        """
+        Start reading.
+        
+        Args:
+            cap: An opened cv2.VideoCapture; the caller still releases it
+        """
+        self._cap = cap
+        self._cond = threading.Condition()
+        self._frame = None
+        self._count = 0  # Frames read so far
+        self._returned = 0  # Value of _count at the last read()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def _run(self) -> None:
+        while self._running:
+            ret, frame = self._cap.read()
+            with self._cond:
+                if not ret:
+                    self._running = False
+                else:
+                    self._frame = frame
+                    self._count += 1
+                self._cond.notify_all()
+    
+    def read(self, timeout: float = 2.0):
+        """
+        Wait for a frame newer than the last one returned.
+        
+        Returns:
+            (ret, frame) like cv2.VideoCapture.read; ret is False once the
+            camera stops delivering frames
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._count != self._returned or not self._running, timeout)
+            if self._count == self._returned:
+                return False, None
+            self._returned = self._count
+            return True, self._frame
+    
+    def stop(self) -> None:
+        """Stop the reader thread (call before releasing the capture)."""
+        self._running = False
+        self._thread.join(timeout=2.0)
+
+
 class FaceRecognitionSystem:
     """Main class for face recognition operations.
     
@@ -44,30 +109,56 @@ class FaceRecognitionSystem:
     
     SUPPORTED_IMAGE_FORMATS = ('.jpg', '.jpeg', '.png', '.bmp', '.gif', '.webp')
     
-    def __init__(self, encodings_file: str = "face_encodings.pkl") -> None:
+    # Part of every encoding cache key; change it when the detector or
+    # encoder settings change so stale cached encodings are not reused
+    ENCODER_VERSION = "dlib-resnet-v1/hog-upsample-1"
+    # Same, for faces found with dlib's CNN detector (batch registration on a GPU)
+    CNN_ENCODER_VERSION = "dlib-resnet-v1/cnn-upsample-1"
+    
+    def __init__(self, encodings_file: str = "face_encodings.pkl",
+                 half_precision: bool = False) -> None:
         """
         Initialize the face recognition system.
         
         Args:
             encodings_file: Path to save/load face encodings
+            half_precision: Keep the matching matrix in float16. Halves the
+                            memory scanned per match; distances move by about
+                            1e-3, far below the 0.6 tolerance. The pickle
+                            keeps full precision either way.
         """
         self.encodings_file = Path(encodings_file)
+        self.matrix_dtype = np.dtype(np.float16 if half_precision else np.float32)
         self.known_face_encodings: List[npt.NDArray[np.float64]] = []
         self.known_face_names: List[str] = []
+        self._matrix: Optional[Tuple[list, int, np.ndarray, np.ndarray]] = None
+        self._encoding_cache = None  # Opened on first use (see _encode_image_file)
+        self._encoding_cache_lock = threading.Lock()
+        self._loaded_state = None  # See _remember_loaded_state
         self.load_encodings()
     
     def load_encodings(self) -> bool:
         """Load saved face encodings from file.
         
+        Reloading a file that has not changed since it was last loaded or
+        saved, while the in-memory lists are untouched, is a no-op.
+        
         Returns:
             bool: True if encodings were loaded successfully, False otherwise
         """
         if self.encodings_file.exists():
+            if self._is_loaded_state_current():
+                logger.info("Face database unchanged since last load.")
+                return True
             try:
                 with open(self.encodings_file, 'rb') as f:
                     data = pickle.load(f)
                     self.known_face_encodings = data.get('encodings', [])
                     self.known_face_names = data.get('names', [])
+                self._load_matrix()
+                if read_names_sidecar(self.encodings_file) != self.known_face_names:
+                    self._save_names_sidecar()
+                self._remember_loaded_state()
                 logger.info(f"Loaded {len(self.known_face_names)} face(s) from database.")
                 return True
             except (pickle.PickleError, EOFError, KeyError) as e:
@@ -96,12 +187,181 @@ class FaceRecognitionSystem:
             self.encodings_file.parent.mkdir(parents=True, exist_ok=True)
             with open(self.encodings_file, 'wb') as f:
                 pickle.dump(data, f)
+            self._save_names_sidecar()
+            self._save_matrix()
+            self._remember_loaded_state()
             logger.info(f"Saved {len(self.known_face_names)} face(s) to database.")
             return True
         except (IOError, pickle.PickleError) as e:
             logger.error(f"Error saving encodings: {e}")
             return False
     
+    def _file_stamp(self) -> Optional[Tuple[int, int, int]]:
+        """Modification/change times and size of the encodings file."""
+        try:
+            stat = self.encodings_file.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_ctime_ns, stat.st_size
+    
+    def _remember_loaded_state(self) -> None:
+        """Record that the in-memory lists now match the encodings file."""
+        self._loaded_state = (self._file_stamp(),
+                              self.known_face_encodings, len(self.known_face_encodings),
+                              self.known_face_names, len(self.known_face_names))
+    
+    def _is_loaded_state_current(self) -> bool:
+        """Whether neither the file nor the in-memory lists changed since the last load/save."""
+        if self._loaded_state is None:
+            return False
+        stamp, encodings, encodings_len, names, names_len = self._loaded_state
+        return (encodings is self.known_face_encodings and len(encodings) == encodings_len
+                and names is self.known_face_names and len(names) == names_len
+                and stamp is not None and stamp == self._file_stamp())
+    
+    @property
+    def names_file(self) -> Path:
+        """JSON sidecar listing the registered names, readable without loading encodings."""
+        return names_sidecar_path(self.encodings_file)
+    
+    def _save_names_sidecar(self) -> None:
+        """Write the names sidecar next to the encodings file."""
+        write_names_sidecar(self.encodings_file, self.known_face_names)
+    
+    @property
+    def matrix_file(self) -> Path:
+        """(N, 128) copy of the encodings in matrix_dtype, memory-mapped for matching."""
+        if self.matrix_dtype == np.float16:
+            return self.encodings_file.with_suffix('.f16.npy')
+        return self.encodings_file.with_suffix('.npy')
+    
+    @property
+    def encodings_mat(self) -> np.ndarray:
+        """Known encodings as one contiguous (N, 128) matrix of matrix_dtype.
+        
+        Rebuilt from known_face_encodings whenever that list is replaced or
+        changes length, so callers may keep editing the list directly.
+        """
+        return self._matrix_and_norms()[0]
+    
+    def _matrix_and_norms(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the encodings matrix and its squared row norms."""
+        encodings = self.known_face_encodings
+        matrix = self._matrix
+        if matrix is None or matrix[0] is not encodings or matrix[1] != len(encodings):
+            if encodings:
+                mat = np.asarray(encodings, dtype=self.matrix_dtype)
+            else:
+                mat = np.empty((0, 128), dtype=self.matrix_dtype)
+            matrix = self._set_matrix(mat)
+        return matrix[2], matrix[3]
+    
+    def _set_matrix(self, mat: np.ndarray):
+        """Cache mat together with its squared row norms (always float32)."""
+        encodings = self.known_face_encodings
+        sq_norms = np.einsum('ij,ij->i', mat, mat, dtype=np.float32)
+        self._matrix = (encodings, len(encodings), mat, sq_norms)
+        return self._matrix
+    
+    @property
+    def matrix_source_file(self) -> Path:
+        """Stamp of the encodings file the matrix sidecar was built from."""
+        return self.matrix_file.with_suffix('.source.json')
+    
+    def _load_matrix(self) -> None:
+        """Memory-map the matrix sidecar, rebuilding it if missing or stale.
+        
+        The sidecar is only trusted when it was written for exactly the
+        current encodings file (same mtime_ns and size); a restored or
+        hand-copied pickle keeps its own older mtime, so comparing the
+        two files' ages is not enough.
+        """
+        try:
+            with open(self.matrix_source_file, encoding='utf-8') as f:
+                source = json.load(f)
+            if source is not None and source == file_stamp(self.encodings_file):
+                mat = np.load(self.matrix_file, mmap_mode='r')
+                if mat.dtype == self.matrix_dtype and mat.shape == (len(self.known_face_encodings), 128):
+                    self._set_matrix(mat)
+                    return
+        except (OSError, ValueError):
+            pass
+        
+        self._matrix = None
+        self._save_matrix()
+    
+    def _save_matrix(self) -> None:
+        """Write the encodings matrix sidecar and its source stamp."""
+        mat = np.array(self.encodings_mat, dtype=self.matrix_dtype)
+        # Drop any mapping of the old file so it can be replaced
+        self._matrix = None
+        try:
+            # Unstamped while being replaced, so a failed write is never trusted
+            self.matrix_source_file.unlink(missing_ok=True)
+            np.save(self.matrix_file, mat)
+            with open(self.matrix_source_file, 'w', encoding='utf-8') as f:
+                json.dump(file_stamp(self.encodings_file), f)
+        except OSError as e:
+            logger.warning(f"Could not write encodings matrix: {e}")
+        self._set_matrix(mat)
+    
+    @property
+    def cache_file(self) -> Path:
+        """Shelf of face locations and encodings keyed by image content hash."""
+        return self.encodings_file.with_suffix('.enc_cache')
+    
+    def _encode_image_file(self, image_path) -> Tuple[List[Tuple[int, int, int, int]], List[np.ndarray]]:
+        """
+        Find and encode the faces in an image file.
+        
+        Results are cached by the SHA-256 of the file's bytes, so
+        re-registering or re-recognizing the same image skips the models.
+        
+        Args:
+            image_path: Path to the image file
+            
+        Returns:
+            tuple: (face locations, face encodings)
+        """
+        with open(image_path, 'rb') as f:
+            data = f.read()
+        key = self._encoding_cache_key(data)
+        cached = self._cached_encoding(key)
+        if cached is not None:
+            return cached
+        
+        image = face_recognition.load_image_file(io.BytesIO(data))
+        face_locations = face_recognition.face_locations(image)
+        face_encodings = face_recognition.face_encodings(image, face_locations)
+        
+        self._store_encoding(key, (face_locations, face_encodings))
+        return face_locations, face_encodings
+    
+    def _encoding_cache_key(self, data: bytes, model: str = "hog") -> str:
+        """Encoding cache key of an image file's bytes for a face detector model."""
+        version = self.ENCODER_VERSION if model == "hog" else self.CNN_ENCODER_VERSION
+        return f"{version}:{hashlib.sha256(data).hexdigest()}"
+    
+    def _cached_encoding(self, key: str):
+        """Cached (face locations, face encodings) for a key, or None."""
+        with self._encoding_cache_lock:
+            if self._encoding_cache is None:
+                try:
+                    self._encoding_cache = shelve.open(str(self.cache_file))
+                except Exception as e:
+                    logger.warning(f"Could not open encoding cache, using memory only: {e}")
+                    self._encoding_cache = {}
+            return self._encoding_cache.get(key)
+    
+    def _store_encoding(self, key: str, value) -> None:
+        """Cache (face locations, face encodings) under a key from _encoding_cache_key."""
+        with self._encoding_cache_lock:
+            if self._encoding_cache is None:
+                return
+            self._encoding_cache[key] = value
+            if hasattr(self._encoding_cache, 'sync'):
+                self._encoding_cache.sync()
+    
     def register_face_from_image(self, image_path: str, name: str) -> bool:
         """
         Register a new face from an image file.
@@ -130,9 +390,8 @@ class FaceRecognitionSystem:
             logger.warning(f"File may not be a supported image format: {image_path}")
         
         try:
-            # Load and process the image
-            image = face_recognition.load_image_file(str(image_path))
-            face_encodings = face_recognition.face_encodings(image)
+            # Load and process the image (cached by content hash)
+            _, face_encodings = self._encode_image_file(image_path)
             
             if len(face_encodings) == 0:
                 logger.error(f"No face detected in {image_path}")
@@ -242,18 +501,45 @@ class FaceRecognitionSystem:
             print(f"Error: Image file not found: {image_path}")
             return []
         
-        image = face_recognition.load_image_file(image_path)
-        face_locations = face_recognition.face_locations(image)
-        face_encodings = face_recognition.face_encodings(image, face_locations)
+        face_locations, face_encodings = self._encode_image_file(image_path)
         
         results = []
         
-        for encoding, location in zip(face_encodings, face_locations):
-            name = self._match_face(encoding, tolerance)
+        for name, location in zip(self.match_faces(face_encodings, tolerance), face_locations):
             results.append((name, location))
         
         return results
     
+    def match_faces(self, face_encodings, tolerance=0.6) -> List[str]:
+        """
+        Match several face encodings against known faces at once.
+        
+        Args:
+            face_encodings: Face encodings to match (e.g. all faces in a frame)
+            tolerance: How strict the comparison is
+            
+        Returns:
+            list: Name of the matched person or "Unknown" for each encoding
+        """
+        if len(face_encodings) == 0:
+            return []
+        
+        mat, sq_norms = self._matrix_and_norms()
+        if len(mat) == 0:
+            return ["Unknown"] * len(face_encodings)
+        
+        # Squared L2 distance from every query to every known face in one call
+        queries = np.asarray(face_encodings, dtype=np.float32).reshape(len(face_encodings), -1)
+        sq_distances = fast_ops.squared_distances(mat, queries, sq_norms)
+        best_match_indices = np.argmin(sq_distances, axis=1)
+        
+        names = self.known_face_names
+        limit = tolerance * tolerance
+        return [
+            names[best] if sq_distances[q, best] <= limit and best < len(names) else "Unknown"
+            for q, best in enumerate(best_match_indices.tolist())
+        ]
+    
     def _match_face(self, face_encoding, tolerance=0.6):
         """
         Match a face encoding against known faces.
@@ -265,23 +551,7 @@ class FaceRecognitionSystem:
         Returns:
             str: Name of the matched person or "Unknown"
         """
-        if len(self.known_face_encodings) == 0:
-            return "Unknown"
-        
-        # Compare with known faces
-        matches = face_recognition.compare_faces(
-            self.known_face_encodings, face_encoding, tolerance=tolerance
-        )
-        face_distances = face_recognition.face_distance(
-            self.known_face_encodings, face_encoding
-        )
-        
-        if True in matches:
-            best_match_index = np.argmin(face_distances)
-            if matches[best_match_index]:
-                return self.known_face_names[best_match_index]
-        
-        return "Unknown"
+        return self.match_faces([face_encoding], tolerance)[0]
     
     def run_webcam_recognition(self, tolerance=0.6, scale=0.25):
         """
@@ -299,33 +569,36 @@ class FaceRecognitionSystem:
         
         print("Starting webcam recognition. Press 'q' to quit.")
         
-        # Variables for frame skip (process every nth frame)
-        process_this_frame = True
+        # Seconds between recognition passes; frames in between reuse the last result
+        RECOGNITION_INTERVAL = 0.2
+        
+        reader = LatestFrameReader(cap)
+        last_recognition = 0.0
         face_locations = []
         face_names = []
+        rgb_small_frame = None  # Preallocated on the first frame, then reused
         
         while True:
-            ret, frame = cap.read()
+            ret, frame = reader.read()
             if not ret:
                 print("Error: Could not read frame")
                 break
             
-            # Only process every other frame for better performance
-            if process_this_frame:
+            # Recognize on a fixed wall-clock cadence, whatever the camera's frame rate
+            tick = time.monotonic()
+            if tick - last_recognition >= RECOGNITION_INTERVAL:
+                last_recognition = tick
                 # Resize frame for faster processing
-                small_frame = cv2.resize(frame, (0, 0), fx=scale, fy=scale)
-                rgb_small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
+                if rgb_small_frame is None:
+                    h, w = frame.shape[:2]
+                    rgb_small_frame = np.empty((int(h * scale), int(w * scale), 3), dtype=np.uint8)
+                fast_ops.resize_to_rgb(frame, rgb_small_frame)
                 
                 # Detect faces
                 face_locations = face_recognition.face_locations(rgb_small_frame)
                 face_encodings = face_recognition.face_encodings(rgb_small_frame, face_locations)
                 
-                face_names = []
-                for encoding in face_encodings:
-                    name = self._match_face(encoding, tolerance)
-                    face_names.append(name)
-            
-            process_this_frame = not process_this_frame
+                face_names = self.match_faces(face_encodings, tolerance)
             
             # Draw results
             for (top, right, bottom, left), name in zip(face_locations, face_names):
@@ -359,6 +632,7 @@ class FaceRecognitionSystem:
             if cv2.waitKey(1) & 0xFF == ord('q'):
                 break
         
+        reader.stop()
         cap.release()
         cv2.destroyAllWindows()
     
@@ -418,20 +692,21 @@ class FaceRecognitionSystem:
         Returns:
             int: Number of encodings removed
         """
-        indices_to_remove = [i for i, n in enumerate(self.known_face_names) if n == name]
+        keep = [n != name for n in self.known_face_names]
+        removed = len(keep) - sum(keep)
         
-        if not indices_to_remove:
+        if not removed:
             print(f"No face found with name: {name}")
             return 0
         
-        # Remove in reverse order to maintain correct indices
-        for i in reversed(indices_to_remove):
-            del self.known_face_encodings[i]
-            del self.known_face_names[i]
+        # One filtering pass instead of a del (and list shift) per removed entry;
+        # the lists are updated in place so references to them stay valid
+        self.known_face_encodings[:] = [e for e, k in zip(self.known_face_encodings, keep) if k]
+        self.known_face_names[:] = [n for n, k in zip(self.known_face_names, keep) if k]
         
         self.save_encodings()
-        print(f"Removed {len(indices_to_remove)} encoding(s) for: {name}")
-        return len(indices_to_remove)
+        print(f"Removed {removed} encoding(s) for: {name}")
+        return removed
 
 
 def main():
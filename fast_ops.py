@@ -0,0 +1,400 @@
+"""
+Fast Frame Operations
+=====================
+Per-pixel and small numeric kernels for the camera loop, compiled to
+parallel machine code with Numba when it is installed. Without Numba the
+same functions fall back to their OpenCV/NumPy equivalents, so callers
+never need to check. GpuResizer moves the per-frame resize to the GPU
+when OpenCV was built with CUDA.
+"""
+
+import cv2
+import numpy as np
+from typing import Tuple
+import logging
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    CUDA_AVAILABLE = cv2.cuda.getCudaEnabledDeviceCount() > 0
+except (AttributeError, cv2.error):
+    CUDA_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True, parallel=True)
+    def _crop_and_resize_kernel(frame, top, left, height, width, out, swap_rb):
+        """Bilinear resize of frame[top:top+height, left:left+width] into out.
+        
+        With swap_rb the channel order is reversed on the way (BGR -> RGB).
+        """
+        out_h, out_w, channels = out.shape[0], out.shape[1], out.shape[2]
+        scale_y = height / out_h
+        scale_x = width / out_w
+        for oy in prange(out_h):
+            sy = min(max((oy + 0.5) * scale_y - 0.5, 0.0), height - 1.0)
+            y0 = int(sy)
+            y1 = min(y0 + 1, height - 1)
+            wy = sy - y0
+            for ox in range(out_w):
+                sx = min(max((ox + 0.5) * scale_x - 0.5, 0.0), width - 1.0)
+                x0 = int(sx)
+                x1 = min(x0 + 1, width - 1)
+                wx = sx - x0
+                for c in range(channels):
+                    sc = channels - 1 - c if swap_rb else c
+                    p00 = frame[top + y0, left + x0, sc]
+                    p01 = frame[top + y0, left + x1, sc]
+                    p10 = frame[top + y1, left + x0, sc]
+                    p11 = frame[top + y1, left + x1, sc]
+                    value = ((p00 * (1.0 - wx) + p01 * wx) * (1.0 - wy) +
+                             (p10 * (1.0 - wx) + p11 * wx) * wy)
+                    out[oy, ox, c] = np.uint8(min(value + 0.5, 255.0))
+    
+    @njit(cache=True, fastmath=True, parallel=True)
+    def _crop_and_area_kernel(frame, top, left, height, width, out, swap_rb):
+        """Area-averaging shrink of frame[top:top+height, left:left+width] into out.
+        
+        Each output pixel is the mean of its source footprint, partly
+        covered edge pixels weighted by coverage, as cv2.INTER_AREA does.
+        Only for shrinking (height >= out rows, width >= out columns).
+        """
+        out_h, out_w, channels = out.shape[0], out.shape[1], out.shape[2]
+        scale_y = height / out_h
+        scale_x = width / out_w
+        inv_area = 1.0 / (scale_y * scale_x)
+        for oy in prange(out_h):
+            fy0 = oy * scale_y
+            fy1 = min(fy0 + scale_y, float(height))
+            sums = np.zeros((out_w, channels))
+            for sy in range(int(fy0), min(int(np.ceil(fy1)), height)):
+                wy = min(sy + 1.0, fy1) - max(float(sy), fy0)
+                for ox in range(out_w):
+                    fx0 = ox * scale_x
+                    fx1 = min(fx0 + scale_x, float(width))
+                    for sx in range(int(fx0), min(int(np.ceil(fx1)), width)):
+                        w = wy * (min(sx + 1.0, fx1) - max(float(sx), fx0))
+                        for c in range(channels):
+                            sc = channels - 1 - c if swap_rb else c
+                            sums[ox, c] += w * frame[top + sy, left + sx, sc]
+            for ox in range(out_w):
+                for c in range(channels):
+                    out[oy, ox, c] = np.uint8(min(sums[ox, c] * inv_area + 0.5, 255.0))
+    
+    @njit(cache=True, fastmath=True, parallel=True)
+    def _laplacian_var_kernel(gray):
+        """4-neighbour Laplacian variance with OpenCV's reflect-101 border."""
+        h, w = gray.shape
+        lap_sum = 0.0
+        lap_sq = 0.0
+        for y in prange(h):
+            up = y - 1 if y > 0 else 1
+            down = y + 1 if y < h - 1 else h - 2
+            for x in range(w):
+                left = x - 1 if x > 0 else 1
+                right = x + 1 if x < w - 1 else w - 2
+                lap = (np.float64(gray[up, x]) + np.float64(gray[down, x]) +
+                       np.float64(gray[y, left]) + np.float64(gray[y, right]) -
+                       4.0 * np.float64(gray[y, x]))
+                lap_sum += lap
+                lap_sq += lap * lap
+        n = h * w
+        lap_mean = lap_sum / n
+        return lap_sq / n - lap_mean * lap_mean
+    
+    @njit(cache=True, fastmath=True, parallel=True)
+    def _squared_distances_kernel(known, queries, out):
+        """out[q, i] = squared L2 distance between queries[q] and known[i]."""
+        n, d = known.shape
+        for i in prange(n):
+            for q in range(queries.shape[0]):
+                acc = np.float32(0.0)
+                for k in range(d):
+                    diff = known[i, k] - queries[q, k]
+                    acc += diff * diff
+                out[q, i] = acc
+
+
+def _match_centroids_kernel(points, centroids, max_distance):
+    """Greedy closest-first pairing of points with centroids (see match_centroids)."""
+    n, m = points.shape[0], centroids.shape[0]
+    matches = np.full(n, -1, dtype=np.int32)
+    point_used = np.zeros(n, dtype=np.bool_)
+    centroid_used = np.zeros(m, dtype=np.bool_)
+    limit = max_distance * max_distance
+    for _ in range(min(n, m)):
+        best = limit
+        best_i = -1
+        best_j = -1
+        for i in range(n):
+            if point_used[i]:
+                continue
+            for j in range(m):
+                if centroid_used[j]:
+                    continue
+                dy = points[i, 0] - centroids[j, 0]
+                dx = points[i, 1] - centroids[j, 1]
+                distance = dy * dy + dx * dx
+                if distance <= best:
+                    best = distance
+                    best_i = i
+                    best_j = j
+        if best_i < 0:
+            break
+        matches[best_i] = best_j
+        point_used[best_i] = True
+        centroid_used[best_j] = True
+    return matches
+
+
+if NUMBA_AVAILABLE:
+    _match_centroids = njit(cache=True)(_match_centroids_kernel)
+else:
+    _match_centroids = _match_centroids_kernel
+
+
+def _resize_region(frame, top, left, height, width, out, swap_rb):
+    """Run the Numba resize kernel that suits the scale of the region.
+    
+    Bilinear sampling reads only 2x2 source pixels per output pixel, so a
+    shrink by 2x or more skips most of the image and aliases; those go
+    through the area-averaging kernel instead.
+    """
+    out_h, out_w = out.shape[0], out.shape[1]
+    if (height >= out_h and width >= out_w and
+            (height >= 2 * out_h or width >= 2 * out_w)):
+        _crop_and_area_kernel(frame, top, left, height, width, out, swap_rb)
+    else:
+        _crop_and_resize_kernel(frame, top, left, height, width, out, swap_rb)
+
+
+def crop_and_resize(frame: np.ndarray, bbox: Tuple[int, int, int, int],
+                    out: np.ndarray) -> np.ndarray:
+    """
+    Crop a face from a frame and resize it into a preallocated buffer.
+    
+    Args:
+        frame: Full BGR image
+        bbox: (top, right, bottom, left) of the region, clipped to the frame
+        out: (H, W, 3) uint8 buffer receiving the resized crop
+    
+    Returns:
+        out, or None if the clipped region is empty
+    """
+    top, right, bottom, left = bbox
+    top, left = max(0, top), max(0, left)
+    bottom, right = min(frame.shape[0], bottom), min(frame.shape[1], right)
+    if bottom <= top or right <= left:
+        return None
+    
+    if NUMBA_AVAILABLE:
+        _resize_region(frame, top, left, bottom - top, right - left, out, False)
+    else:
+        cv2.resize(frame[top:bottom, left:right], (out.shape[1], out.shape[0]),
+                   dst=out, interpolation=cv2.INTER_AREA)
+    return out
+
+
+def resize_to_rgb(frame: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """
+    Resize a BGR frame into a preallocated buffer and convert it to RGB.
+    
+    With Numba both steps happen in one pass over the frame instead of a
+    cv2.resize pass followed by a cv2.cvtColor pass.
+    
+    Args:
+        frame: Full BGR image
+        out: (H, W, 3) uint8 buffer receiving the resized RGB image
+    
+    Returns:
+        out
+    """
+    if NUMBA_AVAILABLE:
+        _resize_region(frame, 0, 0, frame.shape[0], frame.shape[1], out, True)
+    else:
+        cv2.resize(frame, (out.shape[1], out.shape[0]), dst=out, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(out, cv2.COLOR_BGR2RGB, dst=out)
+    return out
+
+
+class GpuResizer:
+    """
+    resize_to_rgb on the GPU through OpenCV's CUDA module.
+    
+    The device buffers are allocated for the first frame of each size and
+    reused after that, so steady-state frames cost one upload, two kernels
+    and one download with no device allocations. Not thread-safe; give each
+    thread its own instance.
+    """
+    
+    def __init__(self):
+        self._mats = {}
+    
+    def _mat(self, role: str, height: int, width: int) -> 'cv2.cuda_GpuMat':
+        """Device buffer for one step of the pipeline, allocated once per size."""
+        key = (role, height, width)
+        mat = self._mats.get(key)
+        if mat is None:
+            mat = self._mats[key] = cv2.cuda_GpuMat(height, width, cv2.CV_8UC3)
+        return mat
+    
+    def resize_to_rgb(self, frame: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """
+        Resize a BGR frame into a preallocated buffer and convert it to RGB.
+        
+        Args:
+            frame: Full BGR image
+            out: (H, W, 3) uint8 buffer receiving the resized RGB image
+        
+        Returns:
+            out
+        """
+        out_h, out_w = out.shape[:2]
+        src = self._mat('src', frame.shape[0], frame.shape[1])
+        small = self._mat('small', out_h, out_w)
+        rgb = self._mat('rgb', out_h, out_w)
+        
+        # Area averaging like the CPU path, so detectors see the same input
+        # either way; cv2.cuda.resize only supports it for shrinking
+        shrinking = frame.shape[0] >= out_h and frame.shape[1] >= out_w
+        interpolation = cv2.INTER_AREA if shrinking else cv2.INTER_LINEAR
+        
+        src.upload(frame)
+        cv2.cuda.resize(src, (out_w, out_h), dst=small, interpolation=interpolation)
+        cv2.cuda.cvtColor(small, cv2.COLOR_BGR2RGB, dst=rgb)
+        rgb.download(dst=out)
+        return out
+
+
+def quality_laplacian_var(gray: np.ndarray) -> float:
+    """
+    Variance of the Laplacian of a grayscale image, a measure of sharpness.
+    
+    Args:
+        gray: Grayscale image with at least 2 rows and 2 columns
+    
+    Returns:
+        Laplacian variance, as cv2.Laplacian(gray).var() would give
+    """
+    if NUMBA_AVAILABLE:
+        return float(_laplacian_var_kernel(gray))
+    
+    _, stddev = cv2.meanStdDev(cv2.Laplacian(gray, cv2.CV_16S))
+    return float(stddev[0, 0]) ** 2
+
+
+def squared_distances(known: np.ndarray, queries: np.ndarray,
+                      known_sq_norms: np.ndarray = None) -> np.ndarray:
+    """
+    Squared L2 distances between query vectors and known vectors.
+    
+    Args:
+        known: (N, D) known vectors, e.g. face encodings; float16 matrices
+               are read in half precision and widened block by block
+        queries: (Q, D) vectors to compare against them
+        known_sq_norms: Squared row norms of known, if already computed
+                        (only used without Numba)
+    
+    Returns:
+        (Q, N) float32 distances
+    """
+    queries = np.ascontiguousarray(queries, dtype=np.float32)
+    if known.dtype == np.float16:
+        return _squared_distances_half(known, queries, known_sq_norms)
+    known = np.ascontiguousarray(known, dtype=np.float32)
+    
+    if NUMBA_AVAILABLE:
+        out = np.empty((queries.shape[0], known.shape[0]), dtype=np.float32)
+        _squared_distances_kernel(known, queries, out)
+        return out
+    
+    # |a - q|^2 = |a|^2 - 2 a.q + |q|^2, one matrix product for all pairs
+    if known_sq_norms is None:
+        known_sq_norms = np.einsum('ij,ij->i', known, known)
+    query_sq_norms = np.einsum('ij,ij->i', queries, queries)
+    return known_sq_norms[None, :] - 2.0 * (queries @ known.T) + query_sq_norms[:, None]
+
+
+# Rows of a float16 matrix widened to float32 at a time; small enough to stay in cache
+_HALF_BLOCK_ROWS = 4096
+
+
+def _squared_distances_half(known: np.ndarray, queries: np.ndarray,
+                            known_sq_norms: np.ndarray = None) -> np.ndarray:
+    """squared_distances for a float16 known matrix, streamed in cache-sized float32 blocks."""
+    query_sq_norms = np.einsum('ij,ij->i', queries, queries)
+    out = np.empty((queries.shape[0], known.shape[0]), dtype=np.float32)
+    for start in range(0, known.shape[0], _HALF_BLOCK_ROWS):
+        block = known[start:start + _HALF_BLOCK_ROWS].astype(np.float32)
+        if known_sq_norms is None:
+            block_sq_norms = np.einsum('ij,ij->i', block, block)
+        else:
+            block_sq_norms = known_sq_norms[start:start + _HALF_BLOCK_ROWS]
+        out[:, start:start + len(block)] = (
+            block_sq_norms[None, :] - 2.0 * (queries @ block.T) + query_sq_norms[:, None]
+        )
+    return out
+
+
+def match_centroids(points: np.ndarray, centroids: np.ndarray, max_distance: float) -> np.ndarray:
+    """
+    Pair points with centroids, closest pairs first.
+    
+    Args:
+        points: (N, 2) new positions
+        centroids: (M, 2) known positions
+        max_distance: Pairs farther apart than this are never matched
+    
+    Returns:
+        (N,) int32 index of each point's centroid, or -1 if unmatched
+    """
+    points = np.ascontiguousarray(points, dtype=np.float64).reshape(-1, 2)
+    centroids = np.ascontiguousarray(centroids, dtype=np.float64).reshape(-1, 2)
+    return _match_centroids(points, centroids, float(max_distance))
+
+
+def perceptual_hash(image: np.ndarray) -> int:
+    """
+    64-bit DCT perceptual hash of an image.
+    
+    Near-identical images (e.g. the same face in consecutive frames) give
+    hashes that differ in only a few bits.
+    
+    Args:
+        image: BGR or grayscale image
+        
+    Returns:
+        Hash as a Python int; compare hashes with hamming_distance
+    """
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    small = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low = cv2.dct(small)[:8, :8].ravel()
+    bits = low > np.median(low[1:])
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two perceptual hashes."""
+    return bin(a ^ b).count('1')
+
+
+def warmup():
+    """Compile the kernels now so the first camera frame does not pay for it."""
+    if not NUMBA_AVAILABLE:
+        return
+    
+    frame = np.zeros((4, 4, 3), dtype=np.uint8)
+    crop_and_resize(frame, (0, 4, 4, 0), np.empty((3, 3, 3), dtype=np.uint8))
+    crop_and_resize(frame, (0, 4, 4, 0), np.empty((2, 2, 3), dtype=np.uint8))
+    resize_to_rgb(frame, np.empty((3, 3, 3), dtype=np.uint8))
+    resize_to_rgb(frame, np.empty((2, 2, 3), dtype=np.uint8))
+    quality_laplacian_var(np.zeros((4, 4), dtype=np.uint8))
+    squared_distances(np.zeros((2, 4), dtype=np.float32), np.zeros((1, 4), dtype=np.float32))
+    match_centroids(np.zeros((1, 2)), np.zeros((1, 2)), 1.0)
+    logger.info("Numba frame kernels compiled")
@@ -0,0 +1,136 @@
+"""
+Emotion Model Quantization
+==========================
+Export FER's emotion classifier to ONNX and quantize it to INT8.
+
+The calibration set is made of face crops from the registered face
+folders (same layout as register_faces_from_folder.py):
+    known_faces/
+        person1/
+            image1.jpg
+        ...
+
+Usage:
+    python quantize_models.py [known_faces] [num_samples]
+
+Requires: pip install onnxruntime tf2onnx
+"""
+
+import os
+import sys
+import cv2
+
+from emotion_recognition import EMOTION_ONNX_INT8_PATH, fer_face_input, pad_face_box
+
+
+def collect_face_crops(folder_path, max_samples=200):
+    """
+    Collect face crops for calibration.
+    
+    Crops are padded and preprocessed exactly as EmotionRecognizer does at
+    runtime, so the INT8 activation ranges fit what the model will see.
+    
+    Args:
+        folder_path: Path to the folder containing person subfolders
+        max_samples: Maximum number of crops to collect
+    
+    Returns:
+        list: (1, 64, 64, 1) classifier inputs
+    """
+    cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+    samples = []
+    
+    for root, _, files in os.walk(folder_path):
+        for image_file in sorted(files):
+            if not image_file.lower().endswith(('.jpg', '.jpeg', '.png', '.bmp')):
+                continue
+            
+            image = cv2.imread(os.path.join(root, image_file))
+            if image is None:
+                continue
+            
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            faces = cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(48, 48))
+            for (x, y, w, h) in faces:
+                top, right, bottom, left = pad_face_box((y, x + w, y + h, x), image.shape)
+                samples.append(fer_face_input(image[top:bottom, left:right]))
+                if len(samples) >= max_samples:
+                    return samples
+    
+    return samples
+
+
+def export_fer_model(output_path):
+    """
+    Export FER's Keras emotion classifier to ONNX.
+    
+    Args:
+        output_path: Path of the FP32 ONNX model to write
+    """
+    import fer
+    import tf2onnx
+    import tensorflow as tf
+    
+    keras_path = os.path.join(os.path.dirname(fer.__file__), "data", "emotion_model.hdf5")
+    model = tf.keras.models.load_model(keras_path, compile=False)
+    spec = (tf.TensorSpec((None, 64, 64, 1), tf.float32, name="input"),)
+    tf2onnx.convert.from_keras(model, input_signature=spec, output_path=output_path)
+
+
+def quantize_emotion_model(folder_path, max_samples=200):
+    """
+    Build the INT8 emotion model used by EmotionRecognizer.
+    
+    Args:
+        folder_path: Path to the folder containing person subfolders
+        max_samples: Number of face crops used for calibration
+    
+    Returns:
+        bool: True if the model was written
+    """
+    from onnxruntime.quantization import (CalibrationDataReader, QuantFormat,
+                                          QuantType, quantize_static)
+    
+    samples = collect_face_crops(folder_path, max_samples)
+    if not samples:
+        print(f"Error: No faces found in {folder_path}")
+        return False
+    print(f"Collected {len(samples)} face crop(s) for calibration")
+    
+    class FaceCropReader(CalibrationDataReader):
+        def __init__(self, input_name):
+            self._inputs = iter({input_name: sample} for sample in samples)
+        
+        def get_next(self):
+            return next(self._inputs, None)
+    
+    os.makedirs(os.path.dirname(EMOTION_ONNX_INT8_PATH), exist_ok=True)
+    fp32_path = EMOTION_ONNX_INT8_PATH.replace("_int8", "_fp32")
+    export_fer_model(fp32_path)
+    
+    # VNNI-friendly scheme: unsigned activations, signed per-channel weights
+    quantize_static(
+        fp32_path, EMOTION_ONNX_INT8_PATH, FaceCropReader("input"),
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True,
+    )
+    print(f"Wrote {EMOTION_ONNX_INT8_PATH}")
+    return True
+
+
+def main():
+    """Main function."""
+    folder_path = sys.argv[1] if len(sys.argv) > 1 else "known_faces"
+    max_samples = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    
+    if not os.path.exists(folder_path):
+        print(f"Error: Folder not found: {folder_path}")
+        return
+    
+    quantize_emotion_model(folder_path, max_samples)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,26 +17,130 @@ The folder name becomes the person's name.
 
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, List, Optional
+
+import numpy as np
+
 from face_recognition_system import FaceRecognitionSystem
 
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.gif')
+
+# Images per CNN detector call on the GPU
+GPU_BATCH_SIZE = 32
+
+
+def dlib_uses_cuda() -> bool:
+    """Whether dlib was built with CUDA and can see a GPU."""
+    try:
+        import dlib
+        return bool(dlib.DLIB_USE_CUDA) and dlib.cuda.get_num_devices() > 0
+    except (ImportError, AttributeError):
+        return False
 
-def register_faces_from_folder(folder_path, system=None):
+
+def _batch_face_locations(images: List[np.ndarray]) -> List[list]:
     """
-    Register faces from a folder structure.
+    Find faces with dlib's CNN detector, several images per GPU call.
+    
+    batch_face_locations needs equally sized images, so images are grouped
+    by shape first.
+    
+    Args:
+        images: RGB images
+        
+    Returns:
+        list: Face locations of each image, in input order
+    """
+    import face_recognition
+    
+    by_shape = {}
+    for index, image in enumerate(images):
+        by_shape.setdefault(image.shape, []).append(index)
+    
+    locations = [None] * len(images)
+    for indices in by_shape.values():
+        for start in range(0, len(indices), GPU_BATCH_SIZE):
+            chunk = indices[start:start + GPU_BATCH_SIZE]
+            batch = face_recognition.batch_face_locations(
+                [images[i] for i in chunk], batch_size=len(chunk)
+            )
+            for i, locs in zip(chunk, batch):
+                locations[i] = locs
+    return locations
+
+
+def encode_images(image_paths: List[str], use_cuda: bool = False) -> List[Optional[tuple]]:
+    """
+    Find and encode the faces in image files.
+    
+    Runs in a worker process, so it only returns the results; the caller
+    caches them and adds them to the database.
+    
+    Args:
+        image_paths: Paths of the images to encode
+        use_cuda: Detect faces with dlib's CNN model in GPU batches
+                  instead of HOG one image at a time
+        
+    Returns:
+        list: (face locations, face encodings) per image, as
+        FaceRecognitionSystem caches them, or None for images that could
+        not be processed
+    """
+    import face_recognition
+    
+    results = [None] * len(image_paths)
+    images = []
+    for index, image_path in enumerate(image_paths):
+        try:
+            images.append((index, face_recognition.load_image_file(image_path)))
+        except Exception as e:
+            print(f"  Error processing {os.path.basename(image_path)}: {e}")
+    
+    if use_cuda and images:
+        locations = _batch_face_locations([image for _, image in images])
+    else:
+        locations = [None] * len(images)
+    
+    for (index, image), face_locations in zip(images, locations):
+        try:
+            if face_locations is None:
+                face_locations = face_recognition.face_locations(image)
+            results[index] = (face_locations, face_recognition.face_encodings(image, face_locations))
+        except Exception as e:
+            print(f"  Error processing {os.path.basename(image_paths[index])}: {e}")
+    return results
+
+
+def encode_faces_from_folder(folder_path, system=None, max_workers: Optional[int] = None,
+                             progress: Optional[Callable[[int, int, str], None]] = None):
+    """
+    Encode the faces in a folder structure without changing the database.
+    
+    Images already in the system's encoding cache (keyed by the SHA-256 of
+    their bytes) are not decoded again; the rest of each person's folder is
+    encoded in a separate process, so encoding scales with the number of
+    cores instead of being held to one by the GIL. A person whose worker
+    fails is counted as failed and the batch carries on.
     
     Args:
         folder_path: Path to the folder containing person subfolders
-        system: FaceRecognitionSystem instance (creates new one if None)
+        system: FaceRecognitionSystem whose encoding cache is used
+                (creates new one if None)
+        max_workers: Number of worker processes (default: CPU count, at most 4;
+                     1 when dlib runs on the GPU)
+        progress: Called as progress(done, total, person_name) after each person
         
     Returns:
-        dict: Statistics about registration
+        tuple: ([(person_name, encodings), ...], statistics), or ([], None)
+        if the folder does not exist
     """
     if system is None:
         system = FaceRecognitionSystem()
     
     if not os.path.exists(folder_path):
         print(f"Error: Folder not found: {folder_path}")
-        return None
+        return [], None
     
     stats = {
         'total_images': 0,
@@ -44,36 +148,138 @@ def register_faces_from_folder(folder_path, system=None):
         'failed': 0,
         'persons': []
     }
+    results = []
     
-    # Iterate through person folders
-    for person_name in os.listdir(folder_path):
-        person_path = os.path.join(folder_path, person_name)
-        
-        if not os.path.isdir(person_path):
-            continue
-        
-        print(f"\nProcessing: {person_name}")
-        person_success = 0
-        
-        # Process each image in the person's folder
+    # Person folders
+    persons = [
+        (os.path.join(folder_path, person_name), person_name)
+        for person_name in os.listdir(folder_path)
+        if os.path.isdir(os.path.join(folder_path, person_name))
+    ]
+    if not persons:
+        return results, stats
+    
+    # On the GPU one process batching images beats several competing for it
+    use_cuda = dlib_uses_cuda()
+    model = "cnn" if use_cuda else "hog"
+    if max_workers is None:
+        max_workers = 1 if use_cuda else min(os.cpu_count() or 1, 4)
+    
+    done = 0
+    
+    def finish(person_name, encodings):
+        """Record one person's encodings and report progress."""
+        nonlocal done
+        done += 1
+        stats['successful'] += len(encodings)
+        if encodings:
+            results.append((person_name, encodings))
+            stats['persons'].append(person_name)
+            print(f"  Registered {len(encodings)} image(s) for {person_name}")
+        if progress is not None:
+            progress(done, len(persons), person_name)
+    
+    # Cached images are used as they are; only the misses go to the workers
+    jobs = []
+    for person_path, person_name in persons:
+        encodings = []
+        misses = []
         for image_file in os.listdir(person_path):
-            image_path = os.path.join(person_path, image_file)
-            
             # Check if it's an image file
-            if not image_file.lower().endswith(('.jpg', '.jpeg', '.png', '.bmp', '.gif')):
+            if not image_file.lower().endswith(IMAGE_EXTENSIONS):
                 continue
             
             stats['total_images'] += 1
-            
-            if system.register_face_from_image(image_path, person_name):
-                stats['successful'] += 1
-                person_success += 1
-            else:
-                stats['failed'] += 1
+            image_path = os.path.join(person_path, image_file)
+            try:
+                with open(image_path, 'rb') as f:
+                    key = system._encoding_cache_key(f.read(), model)
+            except OSError as e:
+                print(f"  Error processing {image_file}: {e}")
+                continue
+            cached = system._cached_encoding(key)
+            if cached is None:
+                misses.append((image_path, key))
+            elif cached[1]:
+                # Use the first face, as register_face_from_image does
+                encodings.append(cached[1][0])
         
-        if person_success > 0:
-            stats['persons'].append(person_name)
-            print(f"  Registered {person_success} image(s) for {person_name}")
+        if misses:
+            jobs.append((person_name, encodings, misses))
+        else:
+            finish(person_name, encodings)
+    
+    if jobs:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+            futures = {
+                executor.submit(encode_images, [path for path, _ in misses], use_cuda): (person_name, encodings, misses)
+                for person_name, encodings, misses in jobs
+            }
+            for future in as_completed(futures):
+                person_name, encodings, misses = futures[future]
+                try:
+                    encoded = future.result()
+                except Exception as e:
+                    print(f"  Error encoding {person_name}: {e}")
+                    encoded = [None] * len(misses)
+                
+                for (image_path, key), result in zip(misses, encoded):
+                    if result is None:
+                        continue
+                    system._store_encoding(key, result)
+                    if result[1]:
+                        encodings.append(result[1][0])
+                    else:
+                        print(f"  No face detected in {os.path.basename(image_path)}")
+                finish(person_name, encodings)
+    
+    stats['failed'] = stats['total_images'] - stats['successful']
+    return results, stats
+
+
+def add_encoded_faces(system, results) -> int:
+    """
+    Add the results of encode_faces_from_folder to a system and save once.
+    
+    Names are extended before encodings, so a thread matching meanwhile
+    never sees an encoding without its name.
+    
+    Returns:
+        int: Number of encodings added
+    """
+    added = 0
+    for person_name, encodings in results:
+        system.known_face_names.extend([person_name] * len(encodings))
+        system.known_face_encodings.extend(encodings)
+        added += len(encodings)
+    
+    # One save for the whole batch instead of one per image
+    if added:
+        system.save_encodings()
+    return added
+
+
+def register_faces_from_folder(folder_path, system=None, max_workers: Optional[int] = None,
+                               progress: Optional[Callable[[int, int, str], None]] = None):
+    """
+    Register faces from a folder structure.
+    
+    Args:
+        folder_path: Path to the folder containing person subfolders
+        system: FaceRecognitionSystem instance (creates new one if None)
+        max_workers: Number of worker processes (see encode_faces_from_folder)
+        progress: Called as progress(done, total, person_name) after each person
+        
+    Returns:
+        dict: Statistics about registration
+    """
+    if system is None:
+        system = FaceRecognitionSystem()
+    
+    results, stats = encode_faces_from_folder(folder_path, system, max_workers, progress)
+    if stats is None:
+        return None
+    add_encoded_faces(system, results)
     
     print("\n" + "="*50)
     print("REGISTRATION SUMMARY")
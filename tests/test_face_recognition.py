@@ -20,8 +20,11 @@ import numpy as np
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import fast_ops
 from face_recognition_system import FaceRecognitionSystem
 from attendance_system import AttendanceSystem
+from analytics import AnalyticsDashboard
+from database_manager import DatabaseManager
 
 
 class TestFaceRecognitionSystem(unittest.TestCase):
@@ -122,6 +125,171 @@ class TestFaceRecognitionSystem(unittest.TestCase):
         self.assertIn('.jpg', self.system.SUPPORTED_IMAGE_FORMATS)
         self.assertIn('.png', self.system.SUPPORTED_IMAGE_FORMATS)
         self.assertIn('.jpeg', self.system.SUPPORTED_IMAGE_FORMATS)
+    
+    def test_matrix_sidecar_written_and_memory_mapped(self):
+        """Test that saving writes a matrix sidecar that the next load memory-maps."""
+        encodings = [np.random.rand(128) for _ in range(3)]
+        self.system.known_face_encodings = list(encodings)
+        self.system.known_face_names = ["Alice", "Bob", "Carol"]
+        self.assertTrue(self.system.save_encodings())
+        self.assertTrue(self.system.matrix_file.exists())
+        self.assertTrue(self.system.matrix_source_file.exists())
+        
+        new_system = FaceRecognitionSystem(encodings_file=self.encodings_file)
+        mat = new_system.encodings_mat
+        self.assertIsInstance(mat, np.memmap)
+        np.testing.assert_array_almost_equal(mat, np.asarray(encodings, dtype=np.float32))
+        
+        # Saving again from the reloaded system keeps the two in step
+        self.assertTrue(new_system.save_encodings())
+        reloaded = FaceRecognitionSystem(encodings_file=self.encodings_file)
+        self.assertIsInstance(reloaded.encodings_mat, np.memmap)
+        np.testing.assert_array_almost_equal(reloaded.encodings_mat, mat)
+    
+    def test_restored_pickle_does_not_reuse_stale_matrix(self):
+        """Test that an older pickle with the same face count rebuilds the matrix."""
+        old_encoding = np.zeros(128)
+        self.system.known_face_encodings = [old_encoding]
+        self.system.known_face_names = ["Alice"]
+        self.system.save_encodings()
+        backup = os.path.join(self.temp_dir, "backup.pkl")
+        shutil.copy2(self.encodings_file, backup)
+        
+        self.system.known_face_encodings = [np.ones(128)]
+        self.system.save_encodings()
+        
+        # Restore the way DatabaseManager.restore_backup does: the older
+        # mtime comes along, and the face count is the same
+        shutil.copy2(backup, self.encodings_file)
+        
+        new_system = FaceRecognitionSystem(encodings_file=self.encodings_file)
+        np.testing.assert_array_equal(new_system.encodings_mat, [old_encoding])
+        self.assertEqual(new_system._match_face(old_encoding), "Alice")
+    
+    def _check_match_faces_tolerance_boundary(self, half_precision):
+        """A face exactly at the tolerance matches; one just inside it does not."""
+        system = FaceRecognitionSystem(encodings_file=self.encodings_file,
+                                       half_precision=half_precision)
+        far = np.zeros(128)
+        far[1] = 1.0
+        system.known_face_encodings = [np.zeros(128), far]
+        system.known_face_names = ["Alice", "Bob"]
+        
+        # 0.5 from Alice, about 1.12 from Bob; exact in float16 and float32
+        query = np.zeros(128)
+        query[0] = 0.5
+        
+        self.assertEqual(system.encodings_mat.dtype, np.float16 if half_precision else np.float32)
+        self.assertEqual(system.match_faces([query], tolerance=0.5), ["Alice"])
+        self.assertEqual(system.match_faces([query], tolerance=0.499), ["Unknown"])
+        self.assertEqual(system.match_faces([query, far], tolerance=0.5), ["Alice", "Bob"])
+    
+    def test_match_faces_tolerance_boundary_float32(self):
+        """Test matching at the tolerance boundary with a float32 matrix."""
+        self._check_match_faces_tolerance_boundary(half_precision=False)
+    
+    def test_match_faces_tolerance_boundary_float16(self):
+        """Test matching at the tolerance boundary with a float16 matrix."""
+        self._check_match_faces_tolerance_boundary(half_precision=True)
+
+
+def _greedy_match_reference(points, centroids, max_distance):
+    """NumPy reference for fast_ops.match_centroids: repeatedly take the closest free pair."""
+    distances = np.sqrt(((points[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2))
+    matches = np.full(len(points), -1, dtype=np.int32)
+    for _ in range(min(len(points), len(centroids))):
+        i, j = np.unravel_index(np.argmin(distances), distances.shape)
+        if distances[i, j] > max_distance:
+            break
+        matches[i] = j
+        distances[i, :] = np.inf
+        distances[:, j] = np.inf
+    return matches
+
+
+class TestFastOps(unittest.TestCase):
+    """Test the fast_ops kernels against plain NumPy on both code paths."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        rng = np.random.default_rng(0)
+        self.known = rng.random((50, 128), dtype=np.float32)
+        self.queries = rng.random((7, 128), dtype=np.float32)
+        self.points = rng.random((12, 2)) * 100
+        self.centroids = rng.random((9, 2)) * 100
+    
+    def _check_squared_distances(self):
+        """squared_distances agrees with broadcasting for float32 and float16 matrices."""
+        expected = ((self.queries[:, None, :] - self.known[None, :, :]) ** 2).sum(axis=2)
+        
+        result = fast_ops.squared_distances(self.known, self.queries)
+        self.assertEqual(result.shape, (7, 50))
+        self.assertEqual(result.dtype, np.float32)
+        np.testing.assert_allclose(result, expected, rtol=1e-4, atol=1e-3)
+        
+        # Precomputed norms and float16 matrices give the same distances
+        sq_norms = np.einsum('ij,ij->i', self.known, self.known)
+        np.testing.assert_allclose(
+            fast_ops.squared_distances(self.known, self.queries, sq_norms), expected,
+            rtol=1e-4, atol=1e-3
+        )
+        half = self.known.astype(np.float16)
+        half_expected = ((self.queries[:, None, :] - half.astype(np.float32)[None, :, :]) ** 2).sum(axis=2)
+        np.testing.assert_allclose(
+            fast_ops.squared_distances(half, self.queries), half_expected, rtol=1e-3, atol=1e-2
+        )
+    
+    def _check_match_centroids(self):
+        """match_centroids agrees with the greedy reference at several distances."""
+        for max_distance in (5.0, 30.0, 1000.0):
+            np.testing.assert_array_equal(
+                fast_ops.match_centroids(self.points, self.centroids, max_distance),
+                _greedy_match_reference(self.points, self.centroids, max_distance)
+            )
+        
+        # Empty inputs match nothing
+        self.assertEqual(len(fast_ops.match_centroids(np.zeros((0, 2)), self.centroids, 10.0)), 0)
+        np.testing.assert_array_equal(
+            fast_ops.match_centroids(self.points, np.zeros((0, 2)), 10.0),
+            np.full(len(self.points), -1)
+        )
+    
+    def test_squared_distances_fallback(self):
+        """Test squared_distances without Numba."""
+        with patch.object(fast_ops, 'NUMBA_AVAILABLE', False):
+            self._check_squared_distances()
+    
+    @unittest.skipUnless(fast_ops.NUMBA_AVAILABLE, "Numba is not installed")
+    def test_squared_distances_numba(self):
+        """Test squared_distances with the Numba kernel."""
+        self._check_squared_distances()
+    
+    def test_match_centroids_fallback(self):
+        """Test match_centroids with the plain Python kernel."""
+        with patch.object(fast_ops, '_match_centroids', fast_ops._match_centroids_kernel):
+            self._check_match_centroids()
+    
+    @unittest.skipUnless(fast_ops.NUMBA_AVAILABLE, "Numba is not installed")
+    def test_match_centroids_numba(self):
+        """Test match_centroids with the Numba kernel."""
+        self._check_match_centroids()
+    
+    @unittest.skipUnless(fast_ops.NUMBA_AVAILABLE, "Numba is not installed")
+    def test_resize_numba_downscale_averages_like_inter_area(self):
+        """Test that large downscales average the source like cv2.INTER_AREA."""
+        import cv2
+        frame = np.random.default_rng(0).integers(0, 256, (480, 640, 3), dtype=np.uint8)
+        
+        for out_h, out_w in ((120, 160), (100, 150)):
+            expected = cv2.cvtColor(
+                cv2.resize(frame, (out_w, out_h), interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2RGB
+            )
+            out = fast_ops.resize_to_rgb(frame, np.empty((out_h, out_w, 3), dtype=np.uint8))
+            np.testing.assert_allclose(out.astype(int), expected.astype(int), atol=1)
+        
+        expected = cv2.resize(frame[40:360, 80:400], (80, 80), interpolation=cv2.INTER_AREA)
+        out = fast_ops.crop_and_resize(frame, (40, 400, 360, 80), np.empty((80, 80, 3), dtype=np.uint8))
+        np.testing.assert_allclose(out.astype(int), expected.astype(int), atol=1)
 
 
 class TestAttendanceSystem(unittest.TestCase):
@@ -139,8 +307,14 @@ class TestAttendanceSystem(unittest.TestCase):
     
     def tearDown(self):
         """Clean up test fixtures."""
+        self.system.close()
         shutil.rmtree(self.temp_dir, ignore_errors=True)
     
+    def _read_rows(self):
+        """Rows of the attendance file, header included."""
+        with open(self.attendance_file, 'r', newline='', encoding='utf-8') as f:
+            return list(csv.reader(f))
+    
     def test_init_creates_empty_attendance(self):
         """Test that initialization creates empty attendance set."""
         self.assertEqual(len(self.system.today_attendance), 0)
@@ -215,6 +389,166 @@ class TestAttendanceSystem(unittest.TestCase):
         )
         
         self.assertIn("Pre-existing", new_system.today_attendance)
+    
+    def test_mark_attendance_many(self):
+        """Test marking several people at once, skipping repeats and 'Unknown'."""
+        self.system.mark_attendance("Alice", "Present")
+        
+        marked = self.system.mark_attendance_many(
+            ["Bob", "Unknown", "Alice", "Carol", "Bob"], "Late"
+        )
+        self.assertEqual(marked, ["Bob", "Carol"])
+        self.assertEqual(self.system.today_attendance, {"Alice", "Bob", "Carol"})
+        
+        rows = self._read_rows()
+        self.assertEqual(rows[0], ['Name', 'Date', 'Time', 'Status'])
+        self.assertEqual([row[0] for row in rows[1:]], ["Alice", "Bob", "Carol"])
+        self.assertEqual([row[3] for row in rows[2:]], ["Late", "Late"])
+        
+        # Nothing new to mark writes nothing
+        self.assertEqual(self.system.mark_attendance_many(["Alice", "Unknown"]), [])
+        self.assertEqual(len(self._read_rows()), 4)
+    
+    def test_mark_attendance_many_reopens_deleted_file(self):
+        """Test that a deleted attendance file is recreated on the next write."""
+        self.system.mark_attendance("Alice", "Present")
+        os.remove(self.attendance_file)
+        
+        self.assertEqual(self.system.mark_attendance_many(["Bob"]), ["Bob"])
+        rows = self._read_rows()
+        self.assertEqual(rows[0], ['Name', 'Date', 'Time', 'Status'])
+        self.assertEqual([row[0] for row in rows[1:]], ["Bob"])
+    
+    def test_load_today_attendance_only_today(self):
+        """Test that only today's rows are loaded, including an unterminated last line."""
+        today = datetime.now().strftime("%Y-%m-%d")
+        with open(self.attendance_file, 'w', newline='', encoding='utf-8') as f:
+            f.write("Name,Date,Time,Status\r\n")
+            f.write("Yesterday,2000-01-01,09:00:00,Present\r\n")
+            f.write(f"Alice,{today},09:00:00,Present\r\n")
+            f.write(f"Bob,2000-01-02,{today},Present\r\n")
+            f.write(f"Carol,{today},09:05:00,Late")
+        
+        new_system = AttendanceSystem(
+            encodings_file=self.encodings_file,
+            attendance_file=self.attendance_file
+        )
+        self.assertEqual(new_system.today_attendance, {"Alice", "Carol"})
+
+
+class TestAnalyticsDashboard(unittest.TestCase):
+    """Test cases for incremental loading in AnalyticsDashboard."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.attendance_file = os.path.join(self.temp_dir, "test_attendance.csv")
+        self.today = datetime.now().strftime("%Y-%m-%d")
+        self._write("w", "Name,Date,Time,Status\n"
+                         f"Alice,{self.today},09:00:00,Present\n")
+        self.dashboard = AnalyticsDashboard(self.attendance_file)
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _write(self, mode, text):
+        """Write or append raw text to the attendance file."""
+        with open(self.attendance_file, mode, newline='', encoding='utf-8') as f:
+            f.write(text)
+    
+    def test_appended_rows_update_statistics(self):
+        """Test that rows appended after loading show up in the statistics."""
+        self.assertEqual(self.dashboard.get_daily_statistics()['total_records'], 1)
+        self.assertEqual(self.dashboard.get_weekly_statistics()['total_records'], 1)
+        
+        self._write("a", f"Bob,{self.today},10:15:00,Late\n")
+        
+        daily = self.dashboard.get_daily_statistics()
+        self.assertEqual(daily['total_records'], 2)
+        self.assertEqual(daily['people_list'], ["Alice", "Bob"])
+        self.assertEqual(daily['status_distribution'], {"Late": 1, "Present": 1})
+        self.assertEqual(daily['time_distribution'], {"09": 1, "10": 1})
+        
+        weekly = self.dashboard.get_weekly_statistics()
+        self.assertEqual(weekly['total_records'], 2)
+        self.assertEqual(weekly['unique_people'], 2)
+        self.assertEqual(weekly['daily_breakdown'][self.today],
+                         {'total_records': 2, 'unique_people': 2})
+        self.assertEqual(len(self.dashboard.attendance_data), 2)
+    
+    def test_partial_trailing_line_is_deferred(self):
+        """Test that a row still being written is read once it is complete."""
+        self._write("a", f"Bob,{self.today},10:")
+        self.assertEqual(self.dashboard.get_daily_statistics()['people_list'], ["Alice"])
+        
+        self._write("a", "15:00,Late\n")
+        daily = self.dashboard.get_daily_statistics()
+        self.assertEqual(daily['people_list'], ["Alice", "Bob"])
+        self.assertEqual(daily['status_distribution'], {"Late": 1, "Present": 1})
+    
+    def test_truncated_file_is_reloaded(self):
+        """Test that a file that shrank is read again from the start."""
+        self._write("a", f"Bob,{self.today},10:15:00,Late\n")
+        self.assertEqual(self.dashboard.get_daily_statistics()['total_records'], 2)
+        
+        self._write("w", "Name,Date,Time,Status\n"
+                         f"Carol,{self.today},11:00:00,Present\n")
+        
+        daily = self.dashboard.get_daily_statistics()
+        self.assertEqual(daily['people_list'], ["Carol"])
+        self.assertEqual(daily['total_records'], 1)
+        self.assertEqual(self.dashboard.get_weekly_statistics()['unique_people'], 1)
+        self.assertEqual(len(self.dashboard.attendance_data), 1)
+
+
+class TestDatabaseManager(unittest.TestCase):
+    """Test cases for DatabaseManager backups and imports."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        # Backups go to ./backups, so work inside the temporary directory
+        self.old_cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+        self.encodings_file = os.path.join(self.temp_dir, "test_encodings.pkl")
+        system = FaceRecognitionSystem(encodings_file=self.encodings_file)
+        system.known_face_encodings = [np.random.rand(128) for _ in range(3)]
+        system.known_face_names = ["Alice", "Bob", "Alice"]
+        system.save_encodings()
+        self.manager = DatabaseManager(self.encodings_file)
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _load_database(self):
+        """The pickled database as a dict."""
+        with open(self.encodings_file, 'rb') as f:
+            return pickle.load(f)
+    
+    def test_reimport_same_json_adds_nothing(self):
+        """Test that merging a JSON export back into its database adds no records."""
+        json_file = os.path.join(self.temp_dir, "export.json")
+        self.assertTrue(self.manager.export_to_json(json_file))
+        with open(self.encodings_file, 'rb') as f:
+            before = f.read()
+        
+        self.assertTrue(self.manager.import_from_json(json_file, merge=True))
+        self.assertTrue(self.manager.import_from_json(json_file, merge=True))
+        
+        with open(self.encodings_file, 'rb') as f:
+            self.assertEqual(f.read(), before)
+        self.assertEqual(self._load_database()['names'], ["Alice", "Bob", "Alice"])
+    
+    def test_create_backup_of_unchanged_database(self):
+        """Test that backing up an unchanged database returns the latest backup."""
+        first = self.manager.create_backup()
+        self.assertIsNotNone(first)
+        
+        self.assertEqual(self.manager.create_backup(), first)
+        self.assertEqual(len(list(self.manager.backup_dir.glob("face_encodings_backup_*.pkl"))), 1)
 
 
 class TestIntegration(unittest.TestCase):
@@ -49,6 +49,8 @@ class FaceRecognitionApp(ctk.CTk):
         # Frame queue for thread-safe communication
         self.frame_queue = queue.Queue(maxsize=2)
         self.result_queue = queue.Queue(maxsize=10)
+        # Set while an _update_ui call is queued on the Tk thread
+        self._ui_update_pending = threading.Event()
         # Current preview label reference
         self.current_preview_label = None
         # Create UI
@@ -57,8 +59,6 @@ class FaceRecognitionApp(ctk.CTk):
         self._create_status_bar()
         # Show home page by default
         self._show_home()
-        # Start UI update loop
-        self._schedule_ui_update()
         # Bind close event
         self.protocol("WM_DELETE_WINDOW", self._on_closing)
     
@@ -150,13 +150,21 @@ class FaceRecognitionApp(ctk.CTk):
             text=f"Registered Faces: {len(self.face_system.known_face_names)}"
         )
     
-    def _schedule_ui_update(self):
-        """Schedule the UI update loop."""
-        self._update_ui()
-        self.after(33, self._schedule_ui_update)  # ~30 FPS
+    def _request_ui_update(self):
+        """Wake the Tk thread to run _update_ui once (called by the camera thread)."""
+        if self._ui_update_pending.is_set():
+            return
+        self._ui_update_pending.set()
+        try:
+            self.after_idle(self._update_ui)
+        except RuntimeError:
+            # Main loop is not running (window closing)
+            self._ui_update_pending.clear()
     
     def _update_ui(self):
-        """Periodically update UI with frames from camera thread."""
+        """Update UI with frames and results from the camera thread."""
+        # Cleared first so anything queued from here on schedules another pass
+        self._ui_update_pending.clear()
         try:
             # Process frame queue
             while not self.frame_queue.empty():
@@ -655,6 +663,8 @@ class FaceRecognitionApp(ctk.CTk):
         frame_count = 0
         face_locations = []
         face_names = []
+        # Downscaled sizes, fixed once the first frame shows the capture size
+        quarter_size = half_size = None
         
         while self.is_camera_running and self.cap and self.cap.isOpened():
             try:
@@ -665,29 +675,28 @@ class FaceRecognitionApp(ctk.CTk):
                 
                 display_frame = frame.copy()
                 frame_count += 1
+                if quarter_size is None:
+                    h, w = frame.shape[:2]
+                    quarter_size, half_size = (w // 4, h // 4), (w // 2, h // 2)
                 
                 if self.current_mode in ['recognize', 'attendance']:
                     # Process every 4th frame
                     if frame_count % 4 == 0:
-                        small_frame = cv2.resize(frame, (0, 0), fx=0.25, fy=0.25)
+                        small_frame = cv2.resize(frame, quarter_size, interpolation=cv2.INTER_AREA)
                         rgb_small = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
                         
                         face_locations = face_recognition.face_locations(rgb_small, model="hog")
                         
                         if face_locations:
                             face_encodings = face_recognition.face_encodings(rgb_small, face_locations)
-                            face_names = []
+                            face_names = self.face_system.match_faces(face_encodings, 0.6)
                             
-                            for encoding in face_encodings:
-                                name = self.face_system._match_face(encoding, 0.6)
-                                face_names.append(name)
-                                
-                                if self.current_mode == 'attendance' and name != "Unknown":
-                                    if self.attendance_system.mark_attendance(name):
-                                        try:
-                                            self.result_queue.put_nowait(("attendance_marked", name))
-                                        except queue.Full:
-                                            pass
+                            if self.current_mode == 'attendance':
+                                for name in self.attendance_system.mark_attendance_many(face_names):
+                                    try:
+                                        self.result_queue.put_nowait(("attendance_marked", name))
+                                    except queue.Full:
+                                        pass
                         else:
                             face_names = []
                     
@@ -701,7 +710,7 @@ class FaceRecognitionApp(ctk.CTk):
                 
                 elif self.current_mode == 'register':
                     if frame_count % 5 == 0:
-                        small = cv2.resize(frame, (0, 0), fx=0.5, fy=0.5)
+                        small = cv2.resize(frame, half_size, interpolation=cv2.INTER_AREA)
                         rgb_small = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
                         face_locs = face_recognition.face_locations(rgb_small, model="hog")
                         face_locations = [(t*2, r*2, b*2, l*2) for t, r, b, l in face_locs]
@@ -750,6 +759,7 @@ class FaceRecognitionApp(ctk.CTk):
                     self.frame_queue.put_nowait(display_frame)
                 except queue.Full:
                     pass
+                self._request_ui_update()
                 
                 time.sleep(0.01)
                 